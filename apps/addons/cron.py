@@ -223,7 +223,15 @@ def unhide_disabled_files():
 
 
 @cronjobs.register
-def recs():
+def recs(shard=0, shards=1):
+    """
+    Calculate add-on recommendations from collection co-occurrence.
+
+    The work can be split across processes by running `recs 0 N` through
+    `recs N-1 N`; each shard writes the recommendations for the add-ons
+    whose id modulo N equals its shard number.
+    """
+    shard, shards = int(shard), int(shards)
     start = time.time()
     cursor = connections[multidb.get_slave()].cursor()
     cursor.execute("""
@@ -251,7 +259,10 @@ def recs():
     except Exception:
         log.error('Could not call ps', exc_info=True)
 
-    sim = recommend.similarity  # Locals are faster.
+    index = recommend.SimilarityIndex(addons)
+    recs_log.info('%.2fs (index) : %s collections' %
+                  ((time.time() - start), len(index.groups)))
+
     sims, start, timers = {}, [time.time()], {'calc': [], 'sql': []}
 
     def write_recs():
@@ -266,12 +277,9 @@ def recs():
         timers['sql'].append(time.time() - calc)
         start[0] = time.time()
 
-    for idx, (addon, collections) in enumerate(addons.iteritems(), 1):
-        xs = [(other, sim(collections, cs))
-              for other, cs in addons.iteritems()]
-        # Sort by similarity and keep the top N.
-        others = sorted(xs, key=operator.itemgetter(1), reverse=True)
-        sims[addon] = [(k, v) for k, v in others[:11] if k != addon]
+    mine = (addon for addon in sorted(addons) if addon % shards == shard)
+    for idx, addon in enumerate(mine, 1):
+        sims[addon] = index.similar(addon)
 
         if idx % 50 == 0:
             write_recs()
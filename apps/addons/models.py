@@ -793,12 +793,7 @@ class Addon(amo.models.OnChangeMixin, amo.models.ModelBase):
         if self.icon_type:
             icon_type_split = self.icon_type.split('/')
 
-        # Get the closest allowed size without going over
-        if (size not in amo.ADDON_ICON_SIZES
-                and size >= amo.ADDON_ICON_SIZES[0]):
-            size = [s for s in amo.ADDON_ICON_SIZES if s < size][-1]
-        elif size < amo.ADDON_ICON_SIZES[0]:
-            size = amo.ADDON_ICON_SIZES[0]
+        size = self.get_icon_size(size)
 
         # Figure out what to return for an image URL
         if not self.icon_type:
@@ -810,8 +805,6 @@ class Addon(amo.models.OnChangeMixin, amo.models.ModelBase):
             return '%s/%s-%s.png' % (settings.ADDON_ICONS_DEFAULT_URL,
                                      icon_type_split[1], size)
         else:
-            # [1] is the whole ID, [2] is the directory
-            split_id = re.match(r'((\d*?)\d{1,3})$', str(self.id))
             # If we don't have the icon_hash, and we are dealing with a Webapp,
             # it's fine, set to a dummy string ("never"), when the icon is
             # eventually changed, icon_hash will be updated. For regular Addons
@@ -820,8 +813,29 @@ class Addon(amo.models.OnChangeMixin, amo.models.ModelBase):
                 suffix = getattr(self, 'icon_hash', None) or 'never'
             else:
                 suffix = int(time.mktime(self.modified.timetuple()))
-            return settings.ADDON_ICON_URL % (
-                split_id.group(2) or 0, self.id, size, suffix)
+            return self.get_uploaded_icon_url(self.id, size, suffix)
+
+    @staticmethod
+    def get_icon_size(size):
+        """Returns the closest allowed icon size without going over."""
+        if (size not in amo.ADDON_ICON_SIZES
+                and size >= amo.ADDON_ICON_SIZES[0]):
+            size = [s for s in amo.ADDON_ICON_SIZES if s < size][-1]
+        elif size < amo.ADDON_ICON_SIZES[0]:
+            size = amo.ADDON_ICON_SIZES[0]
+        return size
+
+    @staticmethod
+    def get_uploaded_icon_url(addon_id, size, suffix):
+        """
+        Returns the url of the uploaded icon of the add-on `addon_id`, without
+        needing the add-on itself.
+        """
+        # [1] is the whole ID, [2] is the directory
+        split_id = re.match(r'((\d*?)\d{1,3})$', str(addon_id))
+        return settings.ADDON_ICON_URL % (
+            split_id.group(2) or 0, addon_id, Addon.get_icon_size(size),
+            suffix)
 
     @write
     def update_status(self):
@@ -1390,6 +1404,9 @@ class Addon(amo.models.OnChangeMixin, amo.models.ModelBase):
     def sign_if_packaged(self, version_pk, reviewer=False):
         raise NotImplementedError('Not available for add-ons.')
 
+    def presign_if_packaged(self, version_pk):
+        raise NotImplementedError('Not available for add-ons.')
+
     def update_names(self, new_names):
         """
         Adds, edits, or removes names to match the passed in new_names dict.
@@ -1778,6 +1795,13 @@ class Feature(amo.models.ModelBase):
         return '%s (%s: %s)' % (self.addon.name, app, self.locale)
 
 
+def _file_extension(filetype):
+    # Assume that blank is an image.
+    if not filetype:
+        return 'png'
+    return filetype.split('/')[1]
+
+
 class Preview(amo.models.ModelBase):
     addon = models.ForeignKey(Addon, related_name='previews')
     filetype = models.CharField(max_length=25)
@@ -1798,13 +1822,22 @@ class Preview(amo.models.ModelBase):
         return urls
 
     def _image_url(self, url_template):
-        if self.modified is not None:
-            modified = int(time.mktime(self.modified.timetuple()))
+        return self.get_image_url(url_template, self.id, self.modified,
+                                  self.filetype)
+
+    @staticmethod
+    def get_image_url(url_template, preview_id, modified, filetype):
+        """
+        Returns the url of the image of the preview `preview_id`, without
+        needing the preview itself.
+        """
+        if modified is not None:
+            modified = int(time.mktime(modified.timetuple()))
         else:
             modified = 0
-        args = [self.id / 1000, self.id, modified]
+        args = [preview_id / 1000, preview_id, modified]
         if '.png' not in url_template:
-            args.insert(2, self.file_extension)
+            args.insert(2, _file_extension(filetype))
         return url_template % tuple(args)
 
     def _image_path(self, url_template):
@@ -1828,10 +1861,7 @@ class Preview(amo.models.ModelBase):
 
     @property
     def file_extension(self):
-        # Assume that blank is an image.
-        if not self.filetype:
-            return 'png'
-        return self.filetype.split('/')[1]
+        return _file_extension(self.filetype)
 
     @property
     def thumbnail_url(self):
@@ -184,3 +184,4 @@ class TestHideDisabledFiles(amo.tests.TestCase):
         # It should have been removed from mirror stagins.
         m_storage.delete.assert_called_with(f1.mirror_file_path)
         eq_(m_storage.delete.call_count, 1)
+
@@ -553,6 +553,14 @@ class TestAddonModels(amo.tests.TestCase):
         a.icon_hash = 'fakehash'  # a is now a Webapp, with an icon_hash.
         assert a.icon_url.endswith('?modified=fakehash')
 
+    def test_uploaded_icon_url(self):
+        a = Addon.objects.get(pk=3615)
+        a.update(type=amo.ADDON_WEBAPP, icon_type='image/png',
+                 icon_hash='fakehash')
+        for size in (16, 32, 48, 64, 100, 128):
+            eq_(Addon.get_uploaded_icon_url(3615, size, 'fakehash'),
+                a.get_icon_url(size))
+
     def test_icon_url_default(self):
         a = Addon.objects.get(pk=3615)
         a.update(icon_type='')
@@ -1539,6 +1547,16 @@ class TestPreviewModel(amo.tests.TestCase):
         assert 'png' in preview.thumbnail_path
         assert 'webm' in preview.image_path
 
+    def test_get_image_url(self):
+        preview = Preview.objects.get(pk=24)
+        preview.update(filetype='video/webm')
+        eq_(Preview.get_image_url(settings.PREVIEW_FULL_URL, preview.id,
+                                  preview.modified, preview.filetype),
+            preview.image_url)
+        eq_(Preview.get_image_url(settings.PREVIEW_THUMBNAIL_URL, preview.id,
+                                  preview.modified, preview.filetype),
+            preview.thumbnail_url)
+
 
 class TestAddonRecommendations(amo.tests.TestCase):
     fixtures = ['base/addon-recs']
@@ -55,7 +55,7 @@ import mkt
 from mkt.constants import regions
 from mkt.site.fixtures import fixture
 from mkt.webapps.models import update_search_index as app_update_search_index
-from mkt.webapps.models import Webapp, WebappIndexer
+from mkt.webapps.models import parsed_manifests, Webapp, WebappIndexer
 from mkt.webapps.tasks import unindex_webapps
 
 
@@ -284,6 +284,9 @@ class TestCase(MockEsMixin, RedisTest, test_utils.TestCase):
     def _pre_setup(self):
         super(TestCase, self)._pre_setup()
         cache.clear()
+        # Versions ids are reused between tests, which the in-process cache of
+        # manifests can't know about.
+        parsed_manifests.clear()
         # Override django-cache-machine caching.base.TIMEOUT because it's
         # computed too early, before settings_test.py is imported.
         caching.base.TIMEOUT = settings.CACHE_COUNT_TIMEOUT
@@ -6,13 +6,16 @@ import unittest
 from django.conf import settings
 from django.core.cache import cache
 from django.core.validators import ValidationError
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from django.utils import translation
 
 import mock
 from nose.tools import eq_, assert_raises, raises
 
-from amo.utils import (cache_ns_key, escape_all, find_language,
-                       LocalFileStorage, no_translation, resize_image,
+from amo.utils import (cache_ns_key, escape_all, file_etag, find_language,
+                       HttpResponseSendFile, LocalFileStorage, LRUCache,
+                       no_translation, parse_byte_range, resize_image,
                        rm_local_tmp_dir, slugify, slug_validator, to_language)
 from product_details import product_details
 from translations.models import Translation
@@ -265,3 +268,100 @@ class TestEscapeAll(unittest.TestCase):
         eq_(res['dict'], {'x': expected})
         eq_(res['list'], [expected])
         eq_(res['bool'], True)
+
+
+def test_parse_byte_range():
+    eq_(parse_byte_range('bytes=0-9', 100), (0, 9))
+    eq_(parse_byte_range('bytes=90-', 100), (90, 99))
+    eq_(parse_byte_range('bytes=-10', 100), (90, 99))
+    eq_(parse_byte_range('bytes=90-200', 100), (90, 99))
+    eq_(parse_byte_range('bytes=100-', 100), False)
+    eq_(parse_byte_range('bytes=0-1,5-6', 100), None)
+    eq_(parse_byte_range('bytes=9-0', 100), None)
+    eq_(parse_byte_range('bytes=a-b', 100), None)
+    eq_(parse_byte_range('lines=0-9', 100), None)
+
+
+def test_lru_cache():
+    lru = LRUCache(2)
+    lru.set('a', 1)
+    lru.set('b', 2)
+    eq_(lru.get('a'), 1)
+    # 'b' is now the least recently used key, and gets evicted.
+    lru.set('c', 3)
+    eq_(lru.get('b'), None)
+    eq_(lru.get('a'), 1)
+    eq_(lru.get('c'), 3)
+    eq_(len(lru), 2)
+    lru.delete('a')
+    eq_(lru.get('a', 'default'), 'default')
+    lru.clear()
+    eq_(len(lru), 0)
+
+
+@override_settings(XSENDFILE=False, SENDFILE_CHUNK_SIZE=4)
+class TestHttpResponseSendFile(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, '0123456789')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def send(self, etag='abc', **headers):
+        request = RequestFactory().get('/', **headers)
+        return HttpResponseSendFile(request, self.path, etag=etag)
+
+    def test_file_etag(self):
+        etag = file_etag(self.path)
+        eq_(file_etag(self.path), etag)
+        # Rewriting the file in place changes it.
+        stat = os.stat(self.path)
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + 1))
+        assert file_etag(self.path) != etag
+
+    def test_full(self):
+        res = self.send()
+        eq_(res.status_code, 200)
+        eq_(res['Accept-Ranges'], 'bytes')
+        eq_(''.join(res), '0123456789')
+
+    def test_not_modified(self):
+        res = self.send(HTTP_IF_NONE_MATCH='"abc"')
+        eq_(res.status_code, 304)
+        eq_(''.join(res), '')
+
+    def test_modified(self):
+        res = self.send(HTTP_IF_NONE_MATCH='"def"')
+        eq_(res.status_code, 200)
+
+    def test_range(self):
+        res = self.send(HTTP_RANGE='bytes=3-8')
+        eq_(res.status_code, 206)
+        eq_(res['Content-Range'], 'bytes 3-8/10')
+        eq_(res['Content-Length'], '6')
+        eq_(''.join(res), '345678')
+
+    def test_range_if_range(self):
+        res = self.send(HTTP_RANGE='bytes=3-', HTTP_IF_RANGE='"abc"')
+        eq_(res.status_code, 206)
+        eq_(''.join(res), '3456789')
+
+    def test_range_if_range_changed(self):
+        res = self.send(HTTP_RANGE='bytes=3-', HTTP_IF_RANGE='"def"')
+        eq_(res.status_code, 200)
+        eq_(''.join(res), '0123456789')
+
+    def test_range_not_satisfiable(self):
+        res = self.send(HTTP_RANGE='bytes=20-')
+        eq_(res.status_code, 416)
+        eq_(res['Content-Range'], 'bytes */10')
+        eq_(''.join(res), '')
+
+    @override_settings(XSENDFILE=True)
+    def test_xsendfile_not_modified(self):
+        res = self.send(HTTP_IF_NONE_MATCH='"abc"')
+        eq_(res.status_code, 304)
+        assert settings.XSENDFILE_HEADER not in res
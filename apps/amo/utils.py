@@ -10,6 +10,7 @@ import os
 import random
 import re
 import shutil
+import threading
 import time
 import unicodedata
 import urllib
@@ -49,7 +50,8 @@ from PIL import Image, ImageFile, PngImagePlugin
 
 from amo import ADDON_ICON_SIZES
 from amo.urlresolvers import linkify_with_outgoing, reverse
-from translations.models import Translation
+from translations.models import (get_translation_rows, Translation,
+                                 TRANSLATION_STRING)
 from users.models import UserNotification
 from users.utils import UnsubscribeCode
 
@@ -337,6 +339,54 @@ def chunked(seq, n):
         yield rv
 
 
+class LRUCache(object):
+    """
+    A small thread-safe in-process cache which forgets the least recently
+    used keys once it holds more than `size` of them.
+
+    >>> lru = LRUCache(2)
+    >>> lru.set('a', 1)
+    >>> lru.set('b', 2)
+    >>> lru.get('a')
+    1
+    >>> lru.set('c', 3)
+    >>> lru.get('b') is None
+    True
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
 def urlencode(items):
     """A Unicode-safe URLencoder."""
     try:
@@ -515,20 +565,33 @@ def resize_image(src, dst, size=None, remove_src=True, locally=False):
     if src == dst:
         raise Exception("src and dst can't be the same: %s" % src)
 
-    open_ = open if locally else storage.open
-    delete = os.unlink if locally else storage.delete
-
-    with open_(src, 'rb') as fp:
-        im = Image.open(fp)
-        im = im.convert('RGBA')
-        if size:
-            im = processors.scale_and_crop(im, size)
-    with open_(dst, 'wb') as fp:
-        im.save(fp, 'png')
+    size = save_resized_image(open_image(src, locally=locally), dst, size,
+                              locally=locally)
 
     if remove_src:
+        delete = os.unlink if locally else storage.delete
         delete(src)
 
+    return size
+
+
+def open_image(src, locally=False):
+    """
+    Opens and decodes the image at src, so that it can be resized several
+    times with `save_resized_image` without decoding it again.
+    """
+    open_ = open if locally else storage.open
+    with open_(src, 'rb') as fp:
+        return Image.open(fp).convert('RGBA')
+
+
+def save_resized_image(im, dst, size=None, locally=False):
+    """Saves the decoded image im to dst as a PNG. Returns width and height."""
+    open_ = open if locally else storage.open
+    if size:
+        im = processors.scale_and_crop(im, size)
+    with open_(dst, 'wb') as fp:
+        im.save(fp, 'png')
     return im.size
 
 
@@ -611,25 +674,75 @@ def get_locale_from_lang(lang):
 
 
 class HttpResponseSendFile(http.HttpResponse):
+    """
+    Sends the file at `path`, either through the front server (XSENDFILE) or
+    by streaming it ourselves.
+
+    If `etag` is given and matches If-None-Match, a 304 is returned without
+    touching the file. When we stream the file ourselves, single byte ranges
+    are supported so that interrupted downloads can be resumed; the front
+    server takes care of that when XSENDFILE is used.
+    """
 
     def __init__(self, request, path, content=None, status=None,
                  content_type='application/octet-stream', etag=None):
         self.request = request
         self.path = path
+        self.range = None
         super(HttpResponseSendFile, self).__init__('', status=status,
                                                    content_type=content_type)
-        if settings.XSENDFILE:
-            self[settings.XSENDFILE_HEADER] = path
         if etag:
             self['ETag'] = '"%s"' % etag
+            if etag_matches(request.META.get('HTTP_IF_NONE_MATCH'), etag):
+                self.status_code = 304
+                return
+        if settings.XSENDFILE:
+            self[settings.XSENDFILE_HEADER] = path
+            return
+
+        self['Accept-Ranges'] = 'bytes'
+        if request.META.get('HTTP_RANGE'):
+            self._set_range(etag)
+
+    def _set_range(self, etag):
+        """Honour a single byte range from the Range header, if valid."""
+        if_range = self.request.META.get('HTTP_IF_RANGE')
+        if if_range and not etag_matches(if_range, etag):
+            # The file changed since the client got its first part.
+            return
+        size = os.path.getsize(self.path)
+        byte_range = parse_byte_range(self.request.META['HTTP_RANGE'], size)
+        if byte_range is None:
+            return
+        if byte_range is False:
+            self.status_code = 416
+            self['Content-Range'] = 'bytes */%s' % size
+            return
+        self.range = byte_range
+        self.status_code = 206
+        self['Content-Range'] = 'bytes %s-%s/%s' % (byte_range + (size,))
+        self['Content-Length'] = byte_range[1] - byte_range[0] + 1
 
     def __iter__(self):
-        if settings.XSENDFILE:
+        if settings.XSENDFILE or self.status_code in (304, 416):
             return iter([])
 
-        chunk = 4096
+        chunk = settings.SENDFILE_CHUNK_SIZE
         fp = open(self.path, 'rb')
-        if 'wsgi.file_wrapper' in self.request.META:
+        if self.range:
+            start, end = self.range
+            fp.seek(start)
+
+            def partial(remaining=end - start + 1):
+                while remaining > 0:
+                    data = fp.read(min(chunk, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    yield data
+                fp.close()
+            return partial()
+        elif 'wsgi.file_wrapper' in self.request.META:
             return self.request.META['wsgi.file_wrapper'](fp, chunk)
         else:
             self['Content-Length'] = os.path.getsize(self.path)
@@ -640,9 +753,57 @@ class HttpResponseSendFile(http.HttpResponse):
                     if not data:
                         break
                     yield data
+                fp.close()
             return wrapper()
 
 
+def file_etag(path):
+    """
+    An ETag for the file at `path` made of its size and modification time,
+    for files rewritten in place whose content hash isn't known, like signed
+    packages.
+    """
+    stat = os.stat(path)
+    return '%x-%x' % (stat.st_size, int(stat.st_mtime * 1000000))
+
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match or If-Range header matches `etag`."""
+    if not header or not etag:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [e.strip().strip('"') for e in header.split(',')]
+
+
+def parse_byte_range(header, size):
+    """
+    Parses a Range header for a file of `size` bytes.
+
+    Returns a `(start, end)` tuple of inclusive offsets, `None` if the header
+    should be ignored (malformed or several ranges) and `False` if the range
+    can't be satisfied.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return None
+    start, _, end = spec.strip().partition('-')
+    try:
+        if start:
+            start = int(start)
+            end = int(end) if end else size - 1
+        else:
+            # Suffix range: the last `end` bytes.
+            start, end = max(size - int(end), 0), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return False
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
 def redirect_for_login(request):
     # We can't use urlparams here, because it escapes slashes,
     # which a large number of tests don't expect
@@ -871,11 +1032,14 @@ def attach_trans_dict(model, objs):
     ids = [getattr(obj, f.attname) for f in fields
            for obj in objs if getattr(obj, f.attname, None) is not None]
 
-    # Get translations in a dict, ids will be the keys. It's important to
-    # consume the result of sorted_groupby, which is an iterator.
-    qs = Translation.objects.filter(id__in=ids, localized_string__isnull=False)
-    all_translations = dict((k, list(v)) for k, v in
-                            sorted_groupby(qs, lambda trans: trans.id))
+    # Get translations in a dict, ids will be the keys. They come from the
+    # translations cache, see `get_translation_rows`.
+    all_translations = {}
+    for t_id, rows in get_translation_rows(ids).iteritems():
+        rows = sorted(r for r in rows.values()
+                      if r[TRANSLATION_STRING] is not None)
+        if rows:
+            all_translations[t_id] = [Translation(*r) for r in rows]
 
     def get_locale_and_string(translation, new_class):
         """Convert the translation to new_class (making PurifiedTranslations
@@ -1,6 +1,5 @@
 import functools
 
-from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.views.decorators.cache import never_cache
@@ -10,7 +9,8 @@ from access import acl
 from amo.decorators import json_view, login_required
 from users.models import UserProfile
 
-from mkt.reviewers.utils import AppsReviewing
+from mkt.reviewers.utils import (AppsReviewing, get_reviewers_viewing,
+                                 review_viewing_key)
 
 
 def _view_on_get(request):
@@ -66,7 +66,7 @@ def review_viewing(request):
     user_id = request.amo_user.id
     current_name = ''
     is_user = 0
-    key = '%s:review_viewing:%s' % (settings.CACHE_PREFIX, addon_id)
+    key = review_viewing_key(addon_id)
     interval = amo.EDITOR_VIEWING_INTERVAL
 
     # Check who is viewing.
@@ -96,16 +96,14 @@ def queue_viewing(request):
     if 'addon_ids' not in request.POST:
         return {}
 
-    viewing = {}
     user_id = request.amo_user.id
-
-    for addon_id in request.POST['addon_ids'].split(','):
-        addon_id = addon_id.strip()
-        key = '%s:review_viewing:%s' % (settings.CACHE_PREFIX, addon_id)
-        currently_viewing = cache.get(key)
-        if currently_viewing and currently_viewing != user_id:
-            viewing[addon_id] = (UserProfile.objects
-                                            .get(id=currently_viewing)
-                                            .display_name)
-
-    return viewing
+    addon_ids = [addon_id.strip()
+                 for addon_id in request.POST['addon_ids'].split(',')]
+    viewing = dict((addon_id, viewer) for addon_id, viewer
+                   in get_reviewers_viewing(addon_ids).items()
+                   if viewer != user_id)
+    names = dict((user.id, user.display_name) for user in
+                 UserProfile.objects.filter(id__in=set(viewing.values())))
+
+    return dict((addon_id, names[viewer])
+                for addon_id, viewer in viewing.items() if viewer in names)
@@ -161,7 +161,8 @@ class File(amo.models.OnChangeMixin, amo.models.ModelBase):
         elif (version.addon.status in amo.LITE_STATUSES
               and version.addon.trusted):
             f.status = version.addon.status
-        f.hash = f.generate_hash(upload.path)
+        # The upload was hashed while it was written to disk.
+        f.hash = upload.hash or f.generate_hash(upload.path)
         if upload.validation:
             validation = json.loads(upload.validation)
             if validation['metadata'].get('requires_chrome'):
@@ -18,6 +18,7 @@ from zipfile import BadZipfile, ZipFile
 
 from django import forms
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import trans_real as translation
 from django.core.files.storage import default_storage as storage
 
@@ -201,14 +202,17 @@ class WebAppParser(object):
             ex[loc] = data.get(key, default)
         return ex
 
-    def get_json_data(self, fileorpath):
+    def get_json_data(self, fileorpath, hash=None):
+        """
+        Returns the manifest of a hosted or packaged app. Pass the `hash` of
+        a package if known, see `inspect_package`.
+        """
         path = get_filepath(fileorpath)
         if zipfile.is_zipfile(path):
-            zf = SafeUnzip(path)
-            zf.is_valid()  # Raises forms.ValidationError if problems.
-            try:
-                data = zf.extract_path('manifest.webapp')
-            except KeyError:
+            # Raises forms.ValidationError if problems.
+            data = inspect_package(
+                path, hash or getattr(fileorpath, 'hash', None))['manifest']
+            if data is None:
                 raise forms.ValidationError(
                     _('The file "manifest.webapp" was not found at the root '
                       'of the packaged app archive.'))
@@ -384,6 +388,43 @@ class SafeUnzip(object):
         self.zip.close()
 
 
+def _package_key(hash):
+    return 'files:package:%s' % hash
+
+
+def inspect_package(path, hash=None):
+    """
+    Inspects the packaged app at `path` in a single pass: computes its hash,
+    checks the archive like `SafeUnzip.is_valid` and reads `manifest.webapp`,
+    without extracting anything to disk.
+
+    Returns a dict with the `hash` and the `manifest` (None if missing).
+    Results are cached by hash: when `hash` is given and known, the package
+    isn't read at all.
+    """
+    if hash:
+        info = cache.get(_package_key(hash))
+        if info is not None:
+            return info
+
+    with open(path, 'rb') as fp:
+        sha = hashlib.sha256()
+        for chunk in iter(lambda: fp.read(2 ** 16), ''):
+            sha.update(chunk)
+        fp.seek(0)
+
+        zf = SafeUnzip(fp)
+        zf.is_valid()  # Raises forms.ValidationError if problems.
+        try:
+            manifest = zf.extract_path('manifest.webapp')
+        except KeyError:
+            manifest = None
+
+    info = {'hash': 'sha256:%s' % sha.hexdigest(), 'manifest': manifest}
+    cache.set(_package_key(info['hash']), info)
+    return info
+
+
 def extract_zip(source, remove=False, fatal=True):
     """Extracts the zip file. If remove is given, removes the source file."""
     tempdir = tempfile.mkdtemp()
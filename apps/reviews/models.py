@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 import logging
 
@@ -83,6 +84,8 @@ class Review(amo.models.ModelBase):
             return
         instance.refresh(update_denorm=created)
         if created:
+            if instance.reply_to_id is None:
+                ReviewCount.adjust(instance, 1)
             # Avoid slave lag with the delay.
             check_spam.apply_async(args=[instance.id], countdown=600)
 
@@ -90,6 +93,8 @@ class Review(amo.models.ModelBase):
     def post_delete(sender, instance, **kwargs):
         if kwargs.get('raw'):
             return
+        if instance.reply_to_id is None:
+            ReviewCount.adjust(instance, -1)
         instance.refresh(update_denorm=True)
 
     def refresh(self, update_denorm=False):
@@ -102,7 +107,12 @@ class Review(amo.models.ModelBase):
             tasks.update_denorm(pair, using='default')
 
         # Review counts have changed, so run the task and trigger a reindex.
-        tasks.addon_review_aggregates.delay(self.addon_id, using='default')
+        # A wave of reviews on the same add-on shares one pending task.
+        if cache.add(tasks.aggregates_pending_key(self.addon_id), 1,
+                     tasks.AGGREGATES_PENDING_TIMEOUT):
+            tasks.addon_review_aggregates.apply_async(
+                args=[self.addon_id], kwargs={'using': 'default'},
+                countdown=tasks.AGGREGATES_COUNTDOWN)
 
     @staticmethod
     def transformer(reviews):
@@ -183,6 +193,71 @@ class GroupedRating(object):
         cache.set(cls.key(addon), ratings)
         return ratings
 
+    @classmethod
+    def set_many(cls, addons, using=None):
+        """Like `set` for a list of add-ons, with a single query."""
+        q = (Review.objects.valid().using(using)
+             .filter(addon__in=addons, is_latest=True)
+             .values_list('addon', 'rating')
+             .annotate(models.Count('rating')))
+        counts = defaultdict(dict)
+        for addon, rating, count in q:
+            counts[addon][rating] = count
+        grouped = dict(
+            (cls.key(addon),
+             [(rating, counts[addon].get(rating, 0))
+              for rating in range(1, 6)])
+            for addon in addons)
+        cache.set_many(grouped)
+
+
+class ReviewCount(object):
+    """
+    Number of reviews (not replies) of an add-on, by a user, or overall, kept
+    in memcache so that paginating reviews doesn't need COUNT(*) queries.
+
+    The counts are adjusted as reviews are added or deleted, and counted again
+    from the database when they expire. The overall count is an estimate: it
+    is used for the listings of app reviews but includes every review.
+    """
+    prefix = 'reviews:count'
+
+    @classmethod
+    def key(cls, addon=None, user=None):
+        if addon is not None:
+            return '%s:addon:%s' % (cls.prefix, addon)
+        if user is not None:
+            return '%s:user:%s' % (cls.prefix, user)
+        return '%s:all' % cls.prefix
+
+    @classmethod
+    def get(cls, qs, addon=None, user=None):
+        """
+        Returns the count for `addon`, `user` or overall, counting the reviews
+        in `qs` when it's not in the cache.
+        """
+        key = cls.key(addon=addon, user=user)
+        count = cache.get(key)
+        if count is None:
+            # Cached COUNT() queries can't be invalidated, skip them.
+            count = qs.no_cache().count()
+            cache.add(key, count, settings.REVIEW_COUNT_TIMEOUT)
+        return count
+
+    @classmethod
+    def adjust(cls, review, delta):
+        """Adds `delta` to the counts `review` is part of that are cached."""
+        for key in (cls.key(addon=review.addon_id),
+                    cls.key(user=review.user_id), cls.key()):
+            try:
+                if delta > 0:
+                    cache.incr(key, delta)
+                else:
+                    cache.decr(key, -delta)
+            except ValueError:
+                # Not cached, it will be counted when needed.
+                pass
+
 
 class Spam(object):
 
@@ -1,15 +1,29 @@
 import logging
 
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Count, Avg, F
 
 import caching.base as caching
 from celeryutils import task
 
+import amo
 from addons.models import Addon
+from amo.utils import chunked
 from .models import Review, GroupedRating
 
 log = logging.getLogger('z.task')
 
+# Seconds to wait before recalculating aggregates after a review, so that a
+# burst of reviews on the same add-on is handled by a single task.
+AGGREGATES_COUNTDOWN = 5
+# How long a pending recalculation blocks new ones, in case it's lost.
+AGGREGATES_PENDING_TIMEOUT = 60
+
+
+def aggregates_pending_key(addon_id):
+    return 'reviews:aggregates:pending:%s' % addon_id
+
 
 @task(rate_limit='50/m')
 def update_denorm(*pairs, **kw):
@@ -26,42 +40,106 @@ def update_denorm(*pairs, **kw):
         if not reviews:
             continue
 
+        # Only write the reviews that changed, without sending signals: the
+        # caller is already taking care of the add-on aggregates.
+        changed = []
         for idx, review in enumerate(reviews):
-            review.previous_count = idx
-            review.is_latest = False
-        reviews[-1].is_latest = True
-
-        for review in reviews:
-            review.save()
+            is_latest = idx == len(reviews) - 1
+            if (review.previous_count, review.is_latest) != (idx, is_latest):
+                Review.objects.filter(pk=review.pk).update(
+                    previous_count=idx, is_latest=is_latest)
+                changed.append(review)
+        if changed:
+            Review.objects.invalidate(*changed)
 
 
 @task
 def addon_review_aggregates(*addons, **kw):
+    """
+    Recalculate the total reviews, average, bayesian and grouped ratings of
+    a batch of add-ons.
+
+    Everything is read with a few GROUP BY queries and written with one
+    UPDATE per chunk of add-ons, then the apps are reindexed once.
+    """
     log.info('[%s@%s] Updating total reviews and average ratings.' %
              (len(addons), addon_review_aggregates.rate_limit))
     using = kw.get('using')
-    addon_objs = list(Addon.objects.filter(pk__in=addons))
+    cache.delete_many([aggregates_pending_key(addon) for addon in addons])
+
+    addon_objs = list(Addon.objects.no_cache().filter(pk__in=addons))
+    if not addon_objs:
+        return
     stats = dict((x[0], x[1:]) for x in
                  Review.objects.valid().no_cache().using(using)
                  .filter(addon__in=addons, is_latest=True)
                  .values_list('addon')
                  .annotate(Avg('rating'), Count('addon')))
+
+    avg = _bayesian_averages()
+    values = {}
     for addon in addon_objs:
         rating, reviews = stats.get(addon.id, [0, 0])
-        addon.update(total_reviews=reviews, average_rating=rating)
+        values[addon.id] = {'total_reviews': reviews,
+                            'average_rating': rating}
+        # Rating can be NULL in the DB, so don't update it if it's not there.
+        if avg['rating'] is not None and rating is not None:
+            values[addon.id]['bayesian_rating'] = _bayesian_rating(
+                avg, rating, reviews)
+    _update_addons(values)
+    GroupedRating.set_many([addon.id for addon in addon_objs], using=using)
+
+    # All our updates were sql, so invalidate manually.
+    Addon.objects.invalidate(*addon_objs)
+    webapps = [addon.id for addon in addon_objs
+               if addon.type == amo.ADDON_WEBAPP]
+    if webapps:
+        from mkt.webapps.tasks import index_webapps
+        index_webapps.delay(webapps)
+
+
+def _bayesian_averages():
+    f = lambda: Addon.objects.aggregate(rating=Avg('average_rating'),
+                                        reviews=Avg('total_reviews'))
+    return caching.cached(f, 'task.bayes.avg', 60 * 60 * 60)
+
+
+def _bayesian_rating(avg, rating, reviews):
+    if not reviews:
+        return 0
+    mc = float(avg['reviews']) * float(avg['rating'])
+    return ((mc + reviews * float(rating)) /
+            (float(avg['reviews']) + reviews))
+
 
-    # Delay bayesian calculations to avoid slave lag.
-    addon_bayesian_rating.apply_async(args=addons, countdown=5)
-    addon_grouped_rating.apply_async(args=addons, kwargs={'using': using})
+def _update_addons(values):
+    """
+    Takes a dict of {addon_id: {field: value}} and writes it with one
+    UPDATE ... SET field = CASE id ... END per chunk of add-ons. Fields
+    missing for an add-on are left alone.
+    """
+    cursor = connection.cursor()
+    for ids in chunked(sorted(values), 100):
+        fields = sorted(set(f for id_ in ids for f in values[id_]))
+        sets, params = [], []
+        for field in fields:
+            whens = [id_ for id_ in ids if field in values[id_]]
+            sets.append('%s = CASE id %s ELSE %s END' %
+                        (field, ' '.join(['WHEN %s THEN %s'] * len(whens)),
+                         field))
+            for id_ in whens:
+                params.extend([id_, values[id_][field]])
+        params.extend(ids)
+        cursor.execute('UPDATE addons SET %s WHERE id IN (%s)' %
+                       (', '.join(sets), ', '.join(['%s'] * len(ids))),
+                       params)
 
 
 @task
 def addon_bayesian_rating(*addons, **kw):
     log.info('[%s@%s] Updating bayesian ratings.' %
              (len(addons), addon_bayesian_rating.rate_limit))
-    f = lambda: Addon.objects.aggregate(rating=Avg('average_rating'),
-                                        reviews=Avg('total_reviews'))
-    avg = caching.cached(f, 'task.bayes.avg', 60 * 60 * 60)
+    avg = _bayesian_averages()
     # Rating can be NULL in the DB, so don't update it if it's not there.
     if avg['rating'] is None:
         return
@@ -86,6 +164,4 @@ def addon_grouped_rating(*addons, **kw):
     # We stick this all in memcached since it's not critical.
     log.info('[%s@%s] Updating addon grouped ratings.' %
              (len(addons), addon_grouped_rating.rate_limit))
-    using = kw.get('using')
-    for addon in addons:
-        GroupedRating.set(addon, using=using)
+    GroupedRating.set_many(addons, using=kw.get('using'))
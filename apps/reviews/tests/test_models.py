@@ -1,11 +1,15 @@
+from django.core.cache import cache
 from django.utils import translation
 
+import mock
 from nose.tools import eq_
 import test_utils
 
 import amo.tests
+from addons.models import Addon
 from reviews import tasks
-from reviews.models import check_spam, Review, GroupedRating, Spam
+from reviews.models import (check_spam, Review, GroupedRating, ReviewCount,
+                            Spam)
 
 
 class TestReviewModel(amo.tests.TestCase):
@@ -54,6 +58,77 @@ class TestGroupedRating(amo.tests.TestCase):
         eq_(GroupedRating.get(1865, update_none=False), None)
         eq_(GroupedRating.get(1865, update_none=True), self.grouped_ratings)
 
+    def test_set_many(self):
+        GroupedRating.set_many([1865, 3])
+        eq_(GroupedRating.get(1865, update_none=False), self.grouped_ratings)
+        eq_(GroupedRating.get(3, update_none=False),
+            [(r, 0) for r in range(1, 6)])
+
+
+class TestReviewAggregates(amo.tests.TestCase):
+    fixtures = ['base/apps', 'reviews/dev-reply']
+
+    def test_aggregates(self):
+        tasks.addon_review_aggregates(1865)
+        addon = Addon.objects.no_cache().get(pk=1865)
+        eq_(addon.total_reviews, 1)
+        eq_(addon.average_rating, 4)
+        assert addon.bayesian_rating > 0
+        eq_(GroupedRating.get(1865, update_none=False),
+            [(1, 0), (2, 0), (3, 0), (4, 1), (5, 0)])
+
+    def test_aggregates_no_reviews(self):
+        Review.objects.all().delete()
+        tasks.addon_review_aggregates(1865)
+        addon = Addon.objects.no_cache().get(pk=1865)
+        eq_(addon.total_reviews, 0)
+        eq_(addon.bayesian_rating, 0)
+
+    def test_update_denorm(self):
+        review = Review.objects.get(pk=218207)
+        Review.objects.filter(pk=review.pk).update(is_latest=False,
+                                                   previous_count=3)
+        tasks.update_denorm((1865, review.user_id))
+        review = Review.objects.no_cache().get(pk=218207)
+        eq_(review.is_latest, True)
+        eq_(review.previous_count, 0)
+
+    @mock.patch('reviews.tasks.addon_review_aggregates')
+    def test_refresh_pending(self, aggregates):
+        review = Review.objects.get(pk=218207)
+        review.refresh()
+        review.refresh()
+        eq_(aggregates.apply_async.call_count, 1)
+        cache.delete(tasks.aggregates_pending_key(1865))
+        review.refresh()
+        eq_(aggregates.apply_async.call_count, 2)
+
+
+class TestReviewCount(amo.tests.TestCase):
+    fixtures = ['base/apps', 'reviews/dev-reply']
+
+    def test_get(self):
+        qs = Review.objects.valid().filter(addon=1865)
+        count = qs.count()
+        eq_(ReviewCount.get(qs, addon=1865), count)
+        with self.assertNumQueries(0):
+            eq_(ReviewCount.get(qs, addon=1865), count)
+
+    def test_adjust(self):
+        review = Review.objects.valid().get(pk=218207)
+        cache.set(ReviewCount.key(addon=1865), 5)
+        cache.set(ReviewCount.key(user=review.user_id), 2)
+        review.delete()
+        eq_(cache.get(ReviewCount.key(addon=1865)), 4)
+        eq_(cache.get(ReviewCount.key(user=review.user_id)), 1)
+        # Counts that aren't cached are left alone.
+        eq_(cache.get(ReviewCount.key()), None)
+
+        Review.objects.create(addon_id=1865, user_id=review.user_id,
+                              rating=3)
+        eq_(cache.get(ReviewCount.key(addon=1865)), 5)
+        eq_(cache.get(ReviewCount.key(user=review.user_id)), 2)
+
 
 class TestSpamTest(amo.tests.TestCase):
     fixtures = ['base/apps', 'base/platforms', 'reviews/test_models']
@@ -1,3 +1,7 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connections, models, router
 from django.db.models.deletion import Collector
 from django.utils import encoding
@@ -19,9 +23,10 @@ class TranslationManager(amo.models.ManagerBase):
     def remove_for(self, obj, locale):
         """Remove a locale for the given object."""
         ids = [getattr(obj, f.attname) for f in obj._meta.translated_fields]
-        qs = Translation.objects.filter(id__in=filter(None, ids),
-                                        locale=locale)
+        ids = filter(None, ids)
+        qs = Translation.objects.filter(id__in=ids, locale=locale)
         qs.update(localized_string=None, localized_string_clean=None)
+        invalidate_translation_rows(ids)
 
 
 class Translation(amo.models.ModelBase):
@@ -125,21 +130,14 @@ class Translation(amo.models.ModelBase):
 
         To increment IDs we use a setting on MySQL. This is to support multiple
         database masters -- it's just crazy enough to work! See bug 756242.
+
+        Ids are reserved in blocks of ``TRANSLATION_ID_BLOCK_SIZE``, see
+        :class:`TranslationIdBlock`.
         """
         if id is None:
             # Get a sequence key for the new translation.
-            cursor = connections['default'].cursor()
-            cursor.execute("""UPDATE translations_seq
-                              SET id=LAST_INSERT_ID(id + @@global.auto_increment_increment)""")
-
-            # The sequence table should never be empty. But alas, if it is,
-            # let's fix it.
-            if not cursor.rowcount > 0:
-                cursor.execute("""INSERT INTO translations_seq (id)
-                                  VALUES(LAST_INSERT_ID(id + @@global.auto_increment_increment))""")
-
-            cursor.execute('SELECT LAST_INSERT_ID()')
-            id = cursor.fetchone()[0]
+            id = translation_ids.allocate(
+                settings.TRANSLATION_ID_BLOCK_SIZE)
 
         # Update if one exists, otherwise create a new one.
         q = {'id': id, 'locale': locale}
@@ -252,6 +250,128 @@ class TranslationSequence(models.Model):
         db_table = 'translations_seq'
 
 
+def _reserve_translation_ids(cursor, count):
+    """
+    Moves ``translations_seq`` forward by ``count`` ids. Returns the last id
+    reserved and the step between ids.
+    """
+    cursor.execute("""UPDATE translations_seq
+                      SET id=LAST_INSERT_ID(
+                          id + @@global.auto_increment_increment * %s)""",
+                   [count])
+
+    # The sequence table should never be empty. But alas, if it is,
+    # let's fix it.
+    if not cursor.rowcount > 0:
+        cursor.execute("""INSERT INTO translations_seq (id)
+                          VALUES(LAST_INSERT_ID(
+                              id + @@global.auto_increment_increment * %s))""",
+                       [count])
+
+    cursor.execute(
+        'SELECT LAST_INSERT_ID(), @@global.auto_increment_increment')
+    return cursor.fetchone()
+
+
+class TranslationIdBlock(object):
+    """
+    Hands out translation ids from blocks reserved in ``translations_seq``, so
+    that the sequence row is only locked once per block instead of once per
+    translation.
+
+    The ids of a block keep the step of ``auto_increment_increment`` for
+    multiple masters. Blocks are reserved on a connection of their own that
+    commits straight away: if the block was reserved in the transaction of a
+    request that's rolled back, the ids we kept would be handed out again.
+    Ids left in a block when the process exits are never used.
+
+    With a size of 1 every id is taken from the sequence in the current
+    transaction, which is what the tests use.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_id = self.last_id = self.step = None
+
+    def allocate(self, size=1):
+        if size <= 1:
+            return _reserve_translation_ids(connections['default'].cursor(),
+                                            1)[0]
+        with self.lock:
+            if self.next_id is None or self.next_id > self.last_id:
+                self.last_id, self.step = self.reserve(size)
+                self.next_id = self.last_id - (size - 1) * self.step
+            id, self.next_id = self.next_id, self.next_id + self.step
+            return id
+
+    def reserve(self, size):
+        default = connections['default']
+        connection = default.__class__(default.settings_dict,
+                                       alias='translations_seq')
+        try:
+            return _reserve_translation_ids(connection.cursor(), size)
+        finally:
+            connection.close()
+
+
+translation_ids = TranslationIdBlock()
+
+
+def _translation_rows_key(id):
+    return 'translations:rows:%s' % id
+
+
+def get_translation_rows(ids):
+    """
+    Returns a dict mapping each of the translation `ids` to a dict of its rows
+    keyed by lowercased locale. A row is a tuple of the values of the fields of
+    `Translation`, in order, so `Translation(*row)` builds the object back.
+
+    Every locale of a translation is cached together, the ids missing from the
+    cache are fetched with a single query.
+    """
+    ids = set(ids)
+    if not ids:
+        return {}
+    keys = dict((_translation_rows_key(id), id) for id in ids)
+    rows = dict((keys[k], v) for k, v in cache.get_many(keys.keys()).items())
+
+    missing = ids.difference(rows)
+    if missing:
+        fetched = dict((id, {}) for id in missing)
+        qs = (Translation.objects.no_cache().filter(id__in=missing)
+              .values_list(*TRANSLATION_COLUMNS))
+        for row in qs:
+            fetched[row[TRANSLATION_ID]][row[TRANSLATION_LOCALE].lower()] = row
+        cache.set_many(dict((_translation_rows_key(id), v)
+                            for id, v in fetched.items()))
+        rows.update(fetched)
+    return rows
+
+
+def invalidate_translation_rows(ids):
+    cache.delete_many([_translation_rows_key(id) for id in set(ids)])
+
+
+def invalidate_translation_rows_signal(sender, instance, **kw):
+    if isinstance(instance, Translation) and instance.id is not None:
+        invalidate_translation_rows([instance.id])
+
+
+TRANSLATION_COLUMNS = [f.attname for f in Translation._meta.fields]
+TRANSLATION_ID = TRANSLATION_COLUMNS.index('id')
+TRANSLATION_LOCALE = TRANSLATION_COLUMNS.index('locale')
+TRANSLATION_STRING = TRANSLATION_COLUMNS.index('localized_string')
+
+# Proxies send signals with their own class, so listen to all of them.
+models.signals.post_save.connect(
+    invalidate_translation_rows_signal,
+    dispatch_uid='translations.invalidate_rows.save')
+models.signals.post_delete.connect(
+    invalidate_translation_rows_signal,
+    dispatch_uid='translations.invalidate_rows.delete')
+
+
 def delete_translation(obj, fieldname):
     field = obj._meta.get_field(fieldname)
     trans_id = getattr(obj, field.attname)
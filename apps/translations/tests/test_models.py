@@ -21,7 +21,7 @@ from translations.query import order_by_translation
 from translations.models import (LinkifiedTranslation, NoLinksTranslation,
                                  NoLinksNoMarkupTranslation,
                                  PurifiedTranslation, Translation,
-                                 TranslationSequence)
+                                 TranslationIdBlock, TranslationSequence)
 
 
 def ids(qs):
@@ -70,6 +70,39 @@ class TranslationSequenceTestCase(TestCase):
             'Translation sequence needs to keep increasing.')
 
 
+class TranslationIdBlockTestCase(TestCase):
+
+    def setUp(self):
+        self.block = TranslationIdBlock()
+
+    @patch.object(TranslationIdBlock, 'reserve')
+    def test_block(self, reserve):
+        # The sequence moved to 30 by steps of 3, so we own 24, 27 and 30.
+        reserve.return_value = (30, 3)
+        eq_([self.block.allocate(3) for i in range(3)], [24, 27, 30])
+        eq_(reserve.call_count, 1)
+
+        reserve.return_value = (60, 3)
+        eq_(self.block.allocate(3), 54)
+        eq_(reserve.call_count, 2)
+
+    @patch.object(TranslationIdBlock, 'reserve')
+    def test_no_block(self, reserve):
+        id1 = self.block.allocate(1)
+        id2 = self.block.allocate(1)
+        assert id2 > id1
+        assert not reserve.called
+
+    @override_settings(TRANSLATION_ID_BLOCK_SIZE=10)
+    @patch.object(TranslationIdBlock, 'reserve')
+    @patch('translations.models.translation_ids', TranslationIdBlock())
+    def test_new(self, reserve):
+        reserve.return_value = (100, 1)
+        eq_(Translation.new('abc', 'en-us').id, 91)
+        eq_(Translation.new('def', 'en-us').id, 92)
+        eq_(reserve.call_count, 1)
+
+
 class TranslationTestCase(TestCase):
     fixtures = ['testapp/test_models.json']
 
@@ -438,6 +471,26 @@ class TranslationMultiDbTests(TestCase):
         TranslatedModel.objects.get(pk=1)
         eq_(len(connections['default'].queries), 3)
 
+    @override_settings(DEBUG=True)
+    def test_translations_cached(self):
+        reset_queries()
+        TranslatedModel.objects.no_cache().get(pk=1)
+        first = len(connections['default'].queries)
+
+        # All locales of the translations are cached, only the object is
+        # fetched again, whatever the locale.
+        translation.activate('de')
+        reset_queries()
+        TranslatedModel.objects.no_cache().get(pk=1)
+        eq_(len(connections['default'].queries), first - 1)
+
+    def test_translations_cache_invalidated(self):
+        obj = TranslatedModel.objects.no_cache().get(pk=1)
+        obj.name = 'new name'
+        obj.save()
+        obj = TranslatedModel.objects.no_cache().get(pk=1)
+        trans_eq(obj.name, 'new name', 'en-US')
+
     @override_settings(DEBUG=True)
     def test_translations_reading_from_multiple_db(self):
         with patch.object(django.db.connections, 'databases', self.mocked_dbs):
@@ -1,9 +1,13 @@
+import hashlib
 import json
 import os
 import shutil
 import tempfile
+import time
+import uuid
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage as storage
 
 from base64 import b64decode
@@ -23,6 +27,13 @@ class SigningError(Exception):
     pass
 
 
+class SigningInProgress(Exception):
+    """
+    Another process is still signing the same package. Not a `SigningError`:
+    the signing didn't fail and callers should try again later.
+    """
+
+
 def sign_app(src, dest, ids, reviewer=False):
     tempname = tempfile.mktemp()
     try:
@@ -152,17 +163,104 @@ def sign(version_id, reviewer=False, resign=False, **kw):
         log.info('[Webapp:%s] Already signed app exists.' % app.id)
         return path
 
-    ids = json.dumps({
-        'id': app.guid,
-        'version': version_id
-    })
-    with statsd.timer('services.sign.app'):
+    # Only one process signs a given file at a time. The others wait a little
+    # for it to finish and reuse its result.
+    lock, token = _lock_key(path), uuid.uuid4().hex
+    if not _acquire_lock(lock, token):
+        log.info('[Webapp:%s] Waiting for signing in progress.' % app.id)
+        _wait_for_signing(lock)
+        if not _acquire_lock(lock, token):
+            log.info('[Webapp:%s] Signing still in progress.' % app.id)
+            raise SigningInProgress('Signing still in progress')
+
+    try:
+        # Whoever held the lock may have signed it in the meantime.
+        if storage.exists(path) and not resign:
+            log.info('[Webapp:%s] Already signed app exists.' % app.id)
+            return path
+
+        ids = json.dumps({
+            'id': app.guid,
+            'version': version_id
+        })
+        _count_in_progress(1)
         try:
-            sign_app(file_obj.file_path, path, ids, reviewer)
-        except SigningError:
-            log.info('[Webapp:%s] Signing failed' % app.id)
-            if storage.exists(path):
-                storage.delete(path)
-            raise
+            with statsd.timer('services.sign.app'):
+                try:
+                    sign_app(file_obj.file_path, path, ids, reviewer)
+                except SigningError:
+                    log.info('[Webapp:%s] Signing failed' % app.id)
+                    if storage.exists(path):
+                        storage.delete(path)
+                    raise
+        finally:
+            _count_in_progress(-1)
+    finally:
+        _release_lock(lock, token)
     log.info('[Webapp:%s] Signing complete.' % app.id)
     return path
+
+
+def _lock_key(path):
+    return 'crypto:sign:lock:%s' % hashlib.md5(path).hexdigest()
+
+
+def _acquire_lock(lock, token):
+    return cache.add(lock, token, settings.SIGNED_APPS_LOCK_TIMEOUT)
+
+
+def _release_lock(lock, token):
+    # The lock may have expired and been taken by someone else, leave theirs.
+    if cache.get(lock) == token:
+        cache.delete(lock)
+
+
+def _wait_for_signing(lock):
+    """
+    Wait, at most `SIGNED_APPS_LOCK_WAIT` seconds, for another process to
+    release `lock`. Returns True if it was released.
+    """
+    statsd.incr('services.sign.app.wait')
+    deadline = time.time() + settings.SIGNED_APPS_LOCK_WAIT
+    with statsd.timer('services.sign.app.wait'):
+        while cache.get(lock) is not None:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
+    return True
+
+
+def _count_in_progress(delta):
+    """Keep a gauge of the signings in progress across all processes."""
+    key = 'crypto:sign:in-progress'
+    try:
+        cache.add(key, 0)
+        value = (cache.incr(key, delta) if delta > 0 else
+                 cache.decr(key, -delta))
+    except ValueError:
+        # The key was evicted, the gauge will recover on the next signing.
+        return
+    statsd.gauge('services.sign.app.in_progress', value)
+
+
+@task
+def presign(version_id, **kw):
+    """
+    Sign a version ahead of time, so that it's ready before devices start
+    asking for it. Failures are only logged, the download will try again.
+    """
+    try:
+        sign(version_id)
+    except SigningInProgress:
+        # Someone else is already on it.
+        pass
+    except Exception:
+        statsd.incr('services.sign.app.presign_failed')
+        log.error('Pre-signing version: %s failed' % version_id,
+                  exc_info=True)
+
+
+def sign_eagerly(version_id):
+    """Queue the signing of a version, see `presign`."""
+    statsd.incr('services.sign.app.queued')
+    presign.delay(version_id)
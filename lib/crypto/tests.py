@@ -5,6 +5,7 @@ import shutil
 import zipfile
 
 from django.conf import settings  # For mocking.
+from django.core.cache import cache
 from django.core.files.storage import default_storage as storage
 
 import jwt
@@ -142,6 +143,85 @@ class TestPackaged(PackagedApp, amo.tests.TestCase):
         packaged.sign(self.version.pk, resign=True)
         assert sign_app.called
 
+    @mock.patch('lib.crypto.packaged.sign_app')
+    def test_releases_lock(self, sign_app):
+        packaged.sign(self.version.pk)
+        assert sign_app.called
+        lock = packaged._lock_key(self.file.signed_file_path)
+        eq_(cache.get(lock), None)
+
+    @mock.patch('lib.crypto.packaged._wait_for_signing')
+    @mock.patch('lib.crypto.packaged.sign_app')
+    def test_wait_for_other_signer(self, sign_app, wait):
+        lock = packaged._lock_key(self.file.signed_file_path)
+        cache.set(lock, 'other')
+
+        def other_signer(lock):
+            storage.open(self.file.signed_file_path, 'w')
+            cache.delete(lock)
+        wait.side_effect = other_signer
+
+        eq_(packaged.sign(self.version.pk), self.file.signed_file_path)
+        assert wait.called
+        assert not sign_app.called
+        eq_(cache.get(lock), None)
+
+    @mock.patch('lib.crypto.packaged._wait_for_signing')
+    @mock.patch('lib.crypto.packaged.sign_app')
+    def test_other_signer_failed(self, sign_app, wait):
+        lock = packaged._lock_key(self.file.signed_file_path)
+        cache.set(lock, 'other')
+        wait.side_effect = lambda lock: cache.delete(lock)
+        packaged.sign(self.version.pk)
+        assert sign_app.called
+        eq_(cache.get(lock), None)
+
+    @mock.patch('lib.crypto.packaged._wait_for_signing')
+    @mock.patch('lib.crypto.packaged.sign_app')
+    def test_other_signer_in_progress(self, sign_app, wait):
+        lock = packaged._lock_key(self.file.signed_file_path)
+        cache.set(lock, 'other')
+        with self.assertRaises(packaged.SigningInProgress):
+            packaged.sign(self.version.pk)
+        assert not sign_app.called
+        eq_(cache.get(lock), 'other')
+
+    @mock.patch('lib.crypto.packaged.sign_app')
+    def test_keeps_lock_of_others(self, sign_app):
+        # Our lock expired and someone else took it while we were signing.
+        lock = packaged._lock_key(self.file.signed_file_path)
+        sign_app.side_effect = lambda *args: cache.set(lock, 'other')
+        packaged.sign(self.version.pk)
+        eq_(cache.get(lock), 'other')
+
+    def test_wait_for_signing_released(self):
+        assert packaged._wait_for_signing(
+            packaged._lock_key(self.file.signed_file_path))
+
+    @mock.patch.object(settings, 'SIGNED_APPS_LOCK_WAIT', 0)
+    def test_wait_for_signing_timeout(self):
+        lock = packaged._lock_key(self.file.signed_file_path)
+        cache.set(lock, 'other')
+        assert not packaged._wait_for_signing(lock)
+
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_presign(self, sign):
+        packaged.presign(self.version.pk)
+        sign.assert_called_with(self.version.pk)
+
+    @mock.patch('lib.crypto.packaged.log')
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_presign_in_progress(self, sign, log):
+        sign.side_effect = packaged.SigningInProgress
+        packaged.presign(self.version.pk)
+        assert not log.error.called
+
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_presign_failure(self, sign):
+        sign.side_effect = packaged.SigningError
+        # Failures are logged, not raised.
+        packaged.presign(self.version.pk)
+
     @raises(ValueError)
     def test_server_active(self):
         with self.settings(SIGNED_APPS_SERVER_ACTIVE=True):
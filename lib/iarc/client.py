@@ -2,6 +2,7 @@
 import base64
 import functools
 import os
+import threading
 
 from django.conf import settings
 
@@ -21,6 +22,29 @@ wsdl = {
 # Add in the whitelist of supported methods here.
 services = ['Get_App_Info', 'Set_Storefront_Data', 'Get_Rating_Changes']
 
+# Parsed suds clients, shared by every `Client` in this process so the WSDL
+# is only loaded and parsed once.
+_suds_clients = {}
+_suds_lock = threading.Lock()
+
+
+def get_suds_client(wsdl_name):
+    """
+    Returns a suds client for `wsdl_name` that is safe to use from the
+    calling thread.
+
+    The WSDL is parsed once per process; callers get a cheap clone of the
+    shared client since suds clients keep per-request state.
+    """
+    client = _suds_clients.get(wsdl_name)
+    if client is None:
+        with _suds_lock:
+            client = _suds_clients.get(wsdl_name)
+            if client is None:
+                client = sudsclient.Client(wsdl[wsdl_name], cache=None)
+                _suds_clients[wsdl_name] = client
+    return client.clone()
+
 
 class Client(object):
     """
@@ -49,7 +73,7 @@ class Client(object):
         log.info('IARC client call: {0} from wsdl: {1}'.format(name, wsdl))
 
         if self.client is None:
-            self.client = sudsclient.Client(wsdl[self.wsdl_name], cache=None)
+            self.client = get_suds_client(self.wsdl_name)
 
         # IARC requires messages be base64 encoded and base64 requires
         # byte-strings.
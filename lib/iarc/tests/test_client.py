@@ -1,6 +1,9 @@
+import mock
 import test_utils
+from nose.tools import eq_
 
-from ..client import Client, MockClient, get_iarc_client
+from .. import client as iarc_client
+from ..client import Client, MockClient, get_iarc_client, get_suds_client
 
 
 class TestClient(test_utils.TestCase):
@@ -37,3 +40,22 @@ class TestRightClient(test_utils.TestCase):
     def test_mock(self):
         with self.settings(IARC_MOCK=True):
             assert isinstance(get_iarc_client('services'), MockClient)
+
+
+class TestSudsClientCache(test_utils.TestCase):
+
+    def setUp(self):
+        iarc_client._suds_clients.clear()
+
+    def tearDown(self):
+        iarc_client._suds_clients.clear()
+
+    @mock.patch('lib.iarc.client.sudsclient.Client')
+    def test_wsdl_parsed_once(self, suds):
+        get_suds_client('services')
+        get_suds_client('services')
+        eq_(suds.call_count, 1)
+
+    @mock.patch('lib.iarc.client.sudsclient.Client')
+    def test_clone(self, suds):
+        eq_(get_suds_client('services'), suds.return_value.clone.return_value)
@@ -1,11 +1,14 @@
 import threading
 from functools import partial
 
+from django.conf import settings
 from django.core.signals import got_request_exception, request_finished
+from django.db import transaction
 
 import commonware.log
 from celery import task as base_task
 from celery import Task
+from django_statsd.clients import statsd
 
 
 log = commonware.log.getLogger('z.post_request_task')
@@ -19,32 +22,109 @@ def _get_task_queue():
     return _locals.__dict__.setdefault('task_queue', [])
 
 
+def _get_task_index():
+    """
+    Returns the calling thread's index of queued tasks: a dict mapping the
+    key of each task to its position in the queue and, for tasks whose ids
+    get merged, the set of those ids.
+    """
+    return _locals.__dict__.setdefault('task_index', {})
+
+
+def _get_queue_size():
+    """Returns the number of tasks and merged ids queued by this thread."""
+    return _locals.__dict__.get('queue_size', 0)
+
+
+def _set_queue_size(size):
+    _locals.queue_size = size
+
+
+def _reset_queue():
+    _get_task_queue()[:] = []
+    _get_task_index().clear()
+    _set_queue_size(0)
+
+
 def _send_tasks(**kwargs):
     """Sends all delayed Celery tasks."""
     queue = _get_task_queue()
+    # Sending a task can queue others (when running eagerly), loop on them.
     while queue:
-        cls, args, kwargs = queue.pop(0)
-        cls.original_apply_async(*args, **kwargs)
+        statsd.gauge('post_request_task.queue_size', _get_queue_size())
+        tasks = list(queue)
+        _reset_queue()
+        for cls, args, kwargs in tasks:
+            cls.original_apply_async(*args, **kwargs)
 
 
 def _discard_tasks(**kwargs):
     """Discards all delayed Celery tasks."""
-    _get_task_queue()[:] = []
+    _reset_queue()
+
+
+def _freeze(value):
+    """Returns a hashable version of `value`, to use in the task keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 
 def _append_task(t):
     """Append a task to the queue.
 
-    Expected argument is a tuple of the (task class, args, kwargs).
+    Expected argument is a tuple of the (task class, (args, kwargs), options).
 
     This doesn't append to queue if the argument is already in the queue.
-
+    Tasks whose first argument is a list, like `index_webapps(ids)`, are
+    merged with the last queued task if it only differs by that list, so
+    tasks still run in the order they were queued.
+
+    Once the queue holds `settings.POST_REQUEST_TASK_QUEUE_MAX` tasks and
+    merged ids, it is sent right away instead of waiting for the end of the
+    request, unless a transaction is open: the tasks could otherwise run
+    before their changes are committed, or after they got rolled back.
     """
     queue = _get_task_queue()
-    if t not in queue:
-        queue.append(t)
+    index = _get_task_index()
+    cls, (args, kwargs), options = t
+
+    if args and isinstance(args[0], list):
+        key = (cls.name, 'merged', _freeze(args[1:]), _freeze(kwargs),
+               _freeze(options))
+        if key in index and index[key][0] == len(queue) - 1:
+            position, ids = index[key]
+            new_ids = [i for i in args[0] if i not in ids]
+            if not new_ids:
+                log.debug('Removed duplicate task: %s' % (t,))
+                return
+            ids.update(new_ids)
+            merged_args = (queue[position][1][0][0] + new_ids,) + args[1:]
+            queue[position] = (cls, (merged_args, kwargs), options)
+            _set_queue_size(_get_queue_size() + len(new_ids))
+        else:
+            # Copy the list, we're going to extend it.
+            t = (cls, ((list(args[0]),) + args[1:], kwargs), options)
+            index[key] = (len(queue), set(args[0]))
+            queue.append(t)
+            _set_queue_size(_get_queue_size() + 1 + len(args[0]))
     else:
-        log.debug('Removed duplicate task: %s' % (t,))
+        key = (cls.name, _freeze(args), _freeze(kwargs), _freeze(options))
+        if key in index:
+            log.debug('Removed duplicate task: %s' % (t,))
+            return
+        index[key] = (len(queue), None)
+        queue.append(t)
+        _set_queue_size(_get_queue_size() + 1)
+
+    if (_get_queue_size() >= settings.POST_REQUEST_TASK_QUEUE_MAX and
+            transaction.get_autocommit()):
+        log.info('Sending %s queued tasks before the end of the request.'
+                 % len(queue))
+        statsd.incr('post_request_task.early_flush')
+        _send_tasks()
 
 
 class PostRequestTask(Task):
@@ -59,8 +139,8 @@ class PostRequestTask(Task):
     def original_apply_async(self, *args, **kwargs):
         return super(PostRequestTask, self).apply_async(*args, **kwargs)
 
-    def apply_async(self, *args, **kwargs):
-        _append_task((self, args, kwargs))
+    def apply_async(self, args=None, kwargs=None, **options):
+        _append_task((self, (tuple(args or ()), kwargs or {}), options))
 
 
 # Replacement `@task` decorator.
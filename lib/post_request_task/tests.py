@@ -15,6 +15,11 @@ def test_task():
     task_mock()
 
 
+@task
+def ids_task(ids, **kw):
+    task_mock(ids, **kw)
+
+
 class TestTask(TestCase):
 
     def tearDown(self):
@@ -69,3 +74,73 @@ class TestTask(TestCase):
             test_task.delay()
 
         self._verify_task_filled()
+
+    def test_deduplication_args(self):
+        """Test tasks are only de-duped when their arguments match."""
+        ids_task.delay([1], index='a')
+        ids_task.delay([1], index='a')
+        ids_task.delay([1], index='b')
+        eq_([args for cls, args, kwargs in _get_task_queue()],
+            [(([1],), {'index': 'a'}), (([1],), {'index': 'b'})])
+
+    def test_merge_ids(self):
+        ids_task.delay([1, 2])
+        ids_task.delay([2, 3])
+        ids_task.delay([3])
+        queue = _get_task_queue()
+        eq_(len(queue), 1)
+        cls, args, kwargs = queue[0]
+        eq_(args, (([1, 2, 3],), {}))
+
+    def test_merge_ids_keeps_order(self):
+        ids_task.delay([1, 2])
+        test_task.delay()
+        # Merging into the first task would run it before test_task.
+        ids_task.delay([2, 3])
+        eq_([args for cls, args, kwargs in _get_task_queue()],
+            [(([1, 2],), {}), ((), {}), (([2, 3],), {})])
+
+        # It's merged into the last one from then on.
+        ids_task.delay([4])
+        eq_(_get_task_queue()[-1][1], (([2, 3, 4],), {}))
+
+    @patch('lib.post_request_task.task.PostRequestTask.original_apply_async')
+    def test_merged_task_sent_once(self, _mock):
+        ids_task.delay([1, 2])
+        ids_task.delay([3])
+        request_finished.send(sender=self)
+        _mock.assert_called_once_with(([1, 2, 3],), {})
+
+    @patch('lib.post_request_task.task.transaction.get_autocommit',
+           lambda: True)
+    @patch('lib.post_request_task.task.PostRequestTask.original_apply_async')
+    def test_queue_max(self, _mock):
+        with self.settings(POST_REQUEST_TASK_QUEUE_MAX=4):
+            # One task and two ids.
+            ids_task.delay([1, 2])
+            assert not _mock.called
+            test_task.delay()
+            eq_(_mock.call_count, 2)
+            self._verify_task_empty()
+
+            # The queue starts over after an early flush.
+            test_task.delay()
+            self._verify_task_filled()
+
+    @patch('lib.post_request_task.task.transaction.get_autocommit',
+           lambda: False)
+    @patch('lib.post_request_task.task.PostRequestTask.original_apply_async')
+    def test_queue_max_in_transaction(self, _mock):
+        with self.settings(POST_REQUEST_TASK_QUEUE_MAX=2):
+            ids_task.delay([1, 2])
+            assert not _mock.called
+            eq_(len(_get_task_queue()), 1)
+
+    @patch('lib.post_request_task.task.statsd')
+    @patch('lib.post_request_task.task.PostRequestTask.original_apply_async')
+    def test_queue_size_metric(self, _mock, statsd):
+        ids_task.delay([1, 2])
+        test_task.delay()
+        request_finished.send(sender=self)
+        statsd.gauge.assert_called_once_with('post_request_task.queue_size',
+                                             4)
@@ -4,6 +4,9 @@ items.
 
 Check the function docs, they expect specific preconditions.
 """
+import heapq
+import operator
+from collections import defaultdict
 
 # Placeholders for the fast functions implemented in C.
 
@@ -16,6 +19,72 @@ def similarity(xs, ys):
     return 1. / (1. + symmetric_diff_count(xs, ys))
 
 
+def similarity_from_counts(x_len, y_len, common):
+    """
+    Same score as `similarity`, computed from the sizes of two sets of unique
+    items and the size of their intersection.
+    """
+    return 1. / (1. + x_len + y_len - 2 * common)
+
+
+def top_similar(item, common, sizes, by_size, top=11):
+    """
+    Return the top [(other_item, score)] for `item`, without it.
+
+    `common` is a dict of {other_item: number of groups shared with `item`},
+    `sizes` the number of groups of every item and `by_size` all the items
+    sorted by size, to score the ones sharing no group with `item`.
+    """
+    sim = similarity_from_counts  # Locals are faster.
+    size = sizes[item]
+    xs = [(other, sim(size, sizes[other], n))
+          for other, n in common.iteritems()]
+    extra = 0
+    for other in by_size:
+        if extra == top:
+            break
+        if other not in common:
+            xs.append((other, sim(size, sizes[other], 0)))
+            extra += 1
+
+    # Keep the top N, as if every item had been compared.
+    others = heapq.nlargest(top, xs, key=operator.itemgetter(1))
+    return [(k, v) for k, v in others if k != item]
+
+
+class SimilarityIndex(object):
+    """
+    Inverted index of group -> items, used to score an item against all the
+    others in one pass instead of one `similarity` call per pair.
+
+    `items` is a dict of {item: [group, ...]}, e.g. add-ons and the
+    collections they are in. Scores are the same as `similarity`:
+    1 / (1 + |A ^ B|). An item sharing no group with A scores
+    1 / (1 + |A| + |B|), so only the smallest of those can ever make the top
+    N; they are taken from a list of items sorted by size.
+    """
+
+    def __init__(self, items, top=11):
+        self.top = top
+        self.items = {}
+        self.groups = {}
+        for item, groups in items.iteritems():
+            groups = set(groups)
+            self.items[item] = groups
+            for group in groups:
+                self.groups.setdefault(group, []).append(item)
+        self.sizes = dict((k, len(v)) for k, v in self.items.iteritems())
+        self.by_size = sorted(self.sizes, key=self.sizes.get)
+
+    def similar(self, item):
+        """Return the top [(other_item, score)] for `item`, without it."""
+        common = defaultdict(int)
+        for group in self.items[item]:
+            for other in self.groups[group]:
+                common[other] += 1
+        return top_similar(item, common, self.sizes, self.by_size, self.top)
+
+
 try:
     from _recommend import symmetric_diff_count, similarity
 except ImportError:
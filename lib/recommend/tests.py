@@ -31,3 +31,41 @@ def test_symmetric_diff_count():
 # The algorithm is in flux so this is minimal coverage.
 def test_similarity():
     eq_(1/2., recommend.similarity([1], [1, 2]))
+
+
+def test_similarity_from_counts():
+    def check(a, b):
+        eq_(recommend.similarity(a, b),
+            recommend.similarity_from_counts(len(a), len(b),
+                                             len(set(a) & set(b))))
+    vals = [([], []), ([1], [1, 2]), ([1, 3, 5], [2, 4]), ([1, 2], [1, 2])]
+    for a, b in vals:
+        yield check, a, b
+
+
+class TestSimilarityIndex(object):
+
+    def setUp(self):
+        self.items = {
+            1: [1, 2, 3, 4],
+            2: [1, 2, 3, 5],
+            3: [6, 7, 8, 9],
+            4: [1, 6, 7, 8, 9, 10, 18],
+            5: [11, 12, 13, 14, 15, 16, 17],
+        }
+
+    def brute_force(self, item, top=11):
+        xs = [(other, recommend.similarity(self.items[item], gs))
+              for other, gs in self.items.items()]
+        others = sorted(xs, key=lambda x: x[1], reverse=True)[:top]
+        return [(k, v) for k, v in others if k != item]
+
+    def test_same_scores(self):
+        index = recommend.SimilarityIndex(self.items)
+        for item in self.items:
+            eq_(sorted(index.similar(item)), sorted(self.brute_force(item)))
+
+    def test_top_n_includes_unrelated(self):
+        # Items sharing no group still count, the smallest first.
+        index = recommend.SimilarityIndex(self.items, top=3)
+        eq_([k for k, v in index.similar(1)], [2, 3])
@@ -66,6 +66,8 @@ UGLIFY_BIN = 'uglifyjs'  # Set as None to use YUI instead (at your risk).
 
 # Path to pngcrush (for image optimization).
 PNGCRUSH_BIN = 'pngcrush'
+# How many pngcrush processes a task can run at once.
+PNGCRUSH_CONCURRENCY = 4
 
 ADMINS = (
     # ('Your Name', 'your_email@domain.com'),
@@ -106,6 +108,10 @@ SERVICES_DATABASE = {
 
 DATABASE_ROUTERS = ('multidb.PinningMasterSlaveRouter',)
 
+# How many translation ids each process reserves at once from the
+# translations_seq table. Use 1 to take them one at a time.
+TRANSLATION_ID_BLOCK_SIZE = 50
+
 # For use django-mysql-pool backend.
 DATABASE_POOL_ARGS = {
     'max_overflow': 10,
@@ -255,6 +261,11 @@ SIGNED_APPS_REVIEWER_SERVER = ''
 SIGNED_APPS_SERVER_TIMEOUT = 10
 # Send the more terse manifest signatures to the app signing server.
 SIGNED_APPS_OMIT_PER_FILE_SIGS = True
+# How long, in seconds, a process can hold the lock to sign a given package.
+SIGNED_APPS_LOCK_TIMEOUT = 30
+# How long, in seconds, other requests for the same package wait for the
+# result before giving up.
+SIGNED_APPS_LOCK_WAIT = 3
 
 # Absolute path to a writable directory shared by all servers. No trailing
 # slash.
@@ -273,6 +284,8 @@ DUMPED_APPS_DAYS_DELETE = 3600 * 24 * 30
 
 # Where dumped apps will be written too.
 DUMPED_USERS_PATH = NETAPP_STORAGE + '/dumped-users'
+# Number of users dumped between two checkpoints of the user installs dump.
+DUMPED_USERS_BATCH_SIZE = 1000
 
 # Tarballs in DUMPED_USERS_PATH deleted 30 days after they have been written.
 DUMPED_USERS_DAYS_DELETE = 3600 * 24 * 30
@@ -836,6 +849,10 @@ FETCH_BY_ID = True
 # it's not possible to invalidate these queries.
 CACHE_COUNT_TIMEOUT = 60
 
+# Number of seconds the review counts used to paginate reviews are cached. They
+# are adjusted as reviews come and go, this bounds how far they can drift.
+REVIEW_COUNT_TIMEOUT = 60 * 60
+
 # To enable pylibmc compression (in bytes)
 PYLIBMC_MIN_COMPRESS_LEN = 0  # disabled
 
@@ -979,6 +996,7 @@ CELERY_ROUTES = {
     # If your tasks need to be run as soon as possible, add them here so they
     # are routed to the priority queue.
     'lib.crypto.packaged.sign': {'queue': 'priority'},
+    'lib.crypto.packaged.presign': {'queue': 'priority'},
     'mkt.inapp_pay.tasks.fetch_product_image': {'queue': 'priority'},
     'mkt.webapps.tasks.index_webapps': {'queue': 'priority'},
     'mkt.webapps.tasks.unindex_webapps': {'queue': 'priority'},
@@ -1027,6 +1045,10 @@ CELERY_TIME_LIMITS = {
         'soft': 60 * 20,  # 20 mins to reindex.
         'hard': 60 * 120,  # 120 mins hard limit.
     },
+    'mkt.webapps.tasks.dump_all_user_installs': {
+        'soft': 60 * 60 * 3,  # 3 hours to dump every user, resume after.
+        'hard': 60 * 60 * 4,
+    },
 }
 
 # When testing, we always want tasks to raise exceptions. Good for sanity.
@@ -1037,6 +1059,11 @@ CELERY_EAGER_PROPAGATES_EXCEPTIONS = True
 # a separate, shorter timeout for validation tasks.
 CELERYD_TASK_SOFT_TIME_LIMIT = 60 * 2
 
+# Tasks (and ids merged into a single task) a request can queue with the
+# post_request_task decorator before they get sent early, when no transaction
+# is open.
+POST_REQUEST_TASK_QUEUE_MAX = 1000
+
 ## Fixture Magic
 CUSTOM_DUMPS = {
     'addon': {  # ./manage.py custom_dump addon id
@@ -1193,6 +1220,11 @@ MAX_PERSONA_UPLOAD_SIZE = 300 * 1024
 MAX_REVIEW_ATTACHMENT_UPLOAD_SIZE = 5 * 1024 * 1024
 MAX_WEBAPP_UPLOAD_SIZE = 2 * 1024 * 1024
 
+# How many hosted app manifests update_manifests fetches at once, and at most
+# how many of them from the same host.
+MANIFEST_FETCH_CONCURRENCY = 10
+MANIFEST_FETCH_PER_HOST = 2
+
 # RECAPTCHA - copy all three statements to settings_local.py
 RECAPTCHA_PUBLIC_KEY = ''
 RECAPTCHA_PRIVATE_KEY = ''
@@ -1229,6 +1261,8 @@ UNLINK_SITE_STATS = True
 # Set to True if we're allowed to use X-SENDFILE.
 XSENDFILE = True
 XSENDFILE_HEADER = 'X-SENDFILE'
+# How many bytes to read at a time when we serve files ourselves.
+SENDFILE_CHUNK_SIZE = 64 * 1024
 
 MOBILE_COOKIE = 'mamo'
 
@@ -1459,6 +1493,10 @@ API_THROTTLE = True
 # Cache timeout on the /search/featured API.
 CACHE_SEARCH_FEATURED_API_TIMEOUT = 60 * 60  # 1 hour.
 
+# Cache timeout on the anonymous feed API responses. They are invalidated when
+# the feed changes, this bounds how stale they get otherwise.
+CACHE_FEED_API_TIMEOUT = 60 * 5  # 5 min.
+
 # Whitelist IP addresses of the allowed clients that can post email
 # through the API.
 WHITELISTED_CLIENTS_EMAIL_API = []
@@ -1495,6 +1533,8 @@ IARC_SUBMISSION_ENDPOINT = ''
 IARC_PRIVACY_URL = 'https://www.globalratings.com/IARCPRODClient/privacypolicy.aspx'
 IARC_TOS_URL = 'https://www.globalratings.com/IARCPRODClient/termsofuse.aspx'
 IARC_ALLOW_CERT_REUSE = False
+# Maximum number of concurrent Get_App_Info calls when refreshing ratings.
+IARC_CONCURRENCY = 8
 
 # The payment providers supported.
 PAYMENT_PROVIDERS = ['bango']
@@ -127,14 +127,23 @@ class MarketplaceView(object):
 
     - A implementation of paginate_queryset() that goes with our custom
       pagination handler. It does tastypie-like offset pagination instead of
-      the default page mechanism.
+      the default page mechanism. Views setting `cursor_paginator_class` also
+      paginate with cursors when the `cursor` parameter is present.
     """
+    cursor_paginator_class = None
+
     def handle_exception(self, exc):
         exc._request = self.request._request
         exc._klass = self.__class__
         return super(MarketplaceView, self).handle_exception(exc)
 
     def paginate_queryset(self, queryset, page_size=None):
+        cursor = self.request.QUERY_PARAMS.get('cursor')
+        if cursor is not None and self.cursor_paginator_class:
+            paginator = self.cursor_paginator_class(
+                queryset, page_size or self.get_paginate_by())
+            return paginator.page(cursor)
+
         page_query_param = self.request.QUERY_PARAMS.get(self.page_kwarg)
         offset_query_param = self.request.QUERY_PARAMS.get('offset')
 
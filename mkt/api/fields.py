@@ -188,19 +188,41 @@ class ESTranslationSerializerField(TranslationSerializerField):
         if target_name is None:
             target_name = source_name
         target_key = '%s%s' % (target_name, cls.suffix)
+        setattr(obj, target_key, cls.get_translations(data, source_name))
+
+    @classmethod
+    def get_translations(cls, data, source_name):
+        """
+        Return a dict with all translations of `source_name` found in `data`,
+        like {'en-US': 'mytranslation'}.
+        """
         source_key = '%s%s' % (source_name, cls.suffix)
-        setattr(obj, target_key, dict((v.get('lang', ''), v.get('string', ''))
-                                      for v in data.get(source_key, {}) or {}))
+        return dict((v.get('lang', ''), v.get('string', ''))
+                    for v in data.get(source_key, {}) or {})
 
     def fetch_all_translations(self, obj, source, field):
         return field or None
 
     def fetch_single_translation(self, obj, source, field):
         translations = self.fetch_all_translations(obj, source, field) or {}
+        return self.pick_translation(translations, obj.default_locale)
+
+    def pick_translation(self, translations, default_locale):
         return (translations.get(self.requested_language) or
-                translations.get(obj.default_locale) or
+                translations.get(default_locale) or
                 translations.get(settings.LANGUAGE_CODE) or None)
 
+    def es_field_to_native(self, data, source_name):
+        """
+        Like field_to_native(), but reading the translations of `source_name`
+        straight from the ES `data` instead of an object.
+        """
+        translations = self.get_translations(data, source_name)
+        if self.requested_language:
+            return self.pick_translation(translations,
+                                         data.get('default_locale'))
+        return translations or None
+
     def field_to_native(self, obj, field_name):
         if field_name:
             field_name = '%s%s' % (field_name, self.suffix)
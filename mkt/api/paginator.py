@@ -1,10 +1,16 @@
+import base64
+import datetime
+import json
+import operator
 import urlparse
 
 from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
 from django.http import QueryDict
 from django.utils.http import urlencode
 
+from elasticutils.contrib.django import F
 from rest_framework import pagination, serializers
+from rest_framework.exceptions import ParseError
 
 
 class ESPaginator(Paginator):
@@ -56,6 +62,134 @@ class ESPaginator(Paginator):
         return page
 
 
+def _cursor_value(value):
+    # Dates come back from ES as datetimes, send them back the way ES
+    # formats them.
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError('%r is not JSON serializable' % value)
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, default=_cursor_value))
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(str(cursor)))
+    except (TypeError, ValueError):
+        values = None
+    if not isinstance(values, list):
+        raise ParseError('Invalid cursor.')
+    return values
+
+
+def _missing(field):
+    """Returns an F matching the documents without a value for `field`."""
+    f = F()
+    f.filters = [{'missing': {'field': field}}]
+    return f
+
+
+def after_cursor(sort, values):
+    """
+    Returns an F matching the documents sorted after the one whose values for
+    the fields of `sort` are `values`.
+
+    Documents without a value for a field are sorted last by ES, whatever the
+    order.
+    """
+    conditions = []
+    same = F()
+    for field, value in zip(sort, values):
+        name = field.lstrip('-')
+        if value is None:
+            same &= _missing(name)
+            continue
+        lookup = '%s__%s' % (name, 'lt' if field.startswith('-') else 'gt')
+        conditions.append(same & (F(**{lookup: value}) | _missing(name)))
+        same &= F(**{name: value})
+    return reduce(operator.or_, conditions)
+
+
+class CursorPage(object):
+    """
+    A page of results from `ESCursorPaginator`, which only knows about the
+    cursor of the next one.
+    """
+    def __init__(self, object_list, paginator, next_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return False
+
+
+class ESCursorPaginator(object):
+    """
+    Keyset pagination for search results.
+
+    Instead of an offset, which makes ES collect and sort every result before
+    it on each shard, pages start from a cursor holding the sort values of the
+    last result of the previous page. The sort is made deterministic by adding
+    `id` to it, and the results after the cursor are selected with range
+    filters.
+
+    The search has to be sorted on fields, not by relevance. The `count` is
+    the number of results after the cursor.
+    """
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.count = 0
+
+    def get_sort(self):
+        sort = []
+        for action, value in self.object_list.steps:
+            if action == 'order_by':
+                sort = list(value)
+        if not sort or any(f.lstrip('-') == '_score' for f in sort):
+            raise ParseError('Results sorted by relevance can not be '
+                             'paginated with a cursor.')
+        return sort + ['id']
+
+    def page(self, cursor=None):
+        sort = self.get_sort()
+        qs = self.object_list.order_by(*sort)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(sort):
+                raise ParseError('Invalid cursor.')
+            qs = qs.filter(after_cursor(sort, values))
+
+        # Fetch one more result to know if there is a next page.
+        qs = qs[:self.per_page + 1]
+        results = list(qs)
+        self.count = qs._results_cache.count
+
+        next_cursor = None
+        if len(results) > self.per_page:
+            results = results[:self.per_page]
+            last = results[-1]
+            next_cursor = encode_cursor(
+                [last.get(f.lstrip('-')) if isinstance(last, dict)
+                 else getattr(last, f.lstrip('-'), None) for f in sort])
+        return CursorPage(results, self, next_cursor)
+
+
 class MetaSerializer(serializers.Serializer):
     """
     Serializer for the 'meta' dict holding pagination info that allows to stay
@@ -68,9 +202,11 @@ class MetaSerializer(serializers.Serializer):
     offset = serializers.SerializerMethodField('get_offset')
     limit = serializers.SerializerMethodField('get_limit')
 
-    def replace_query_params(self, url, params):
+    def replace_query_params(self, url, params, remove=()):
         (scheme, netloc, path, query, fragment) = urlparse.urlsplit(url)
         query_dict = QueryDict(query).dict()
+        for param in remove:
+            query_dict.pop(param, None)
         query_dict.update(params)
         query = urlencode(query_dict)
         return urlparse.urlunsplit((scheme, netloc, path, query, fragment))
@@ -83,9 +219,19 @@ class MetaSerializer(serializers.Serializer):
         return self.replace_query_params(url, {'offset': number * per_page,
                                                'limit': per_page})
 
+    def get_cursor_link_for_page(self, page):
+        request = self.context.get('request')
+        url = request and request.get_full_path() or ''
+        return self.replace_query_params(
+            url, {'cursor': page.next_cursor,
+                  'limit': page.paginator.per_page},
+            remove=('offset', 'page'))
+
     def get_next(self, page):
         if not page.has_next():
             return None
+        if isinstance(page, CursorPage):
+            return self.get_cursor_link_for_page(page)
         return self.get_offset_link_for_page(page, page.next_page_number())
 
     def get_previous(self, page):
@@ -97,6 +243,8 @@ class MetaSerializer(serializers.Serializer):
         return page.paginator.count
 
     def get_offset(self, page):
+        if isinstance(page, CursorPage):
+            return None
         index = page.start_index()
         if index > 0:
             # start_index() is 1-based, and we want a 0-based offset, so we
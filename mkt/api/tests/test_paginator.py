@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from urlparse import urlparse
 
 from django.core.paginator import Paginator
@@ -5,12 +6,15 @@ from django.http import QueryDict
 
 import mock
 from elasticutils.contrib.django import S
-from nose.tools import eq_
+from nose.tools import eq_, raises
+from rest_framework.exceptions import ParseError
 from test_utils import RequestFactory
 
 from amo.tests import TestCase
 
-from mkt.api.paginator import MetaSerializer, ESPaginator
+from mkt.api.paginator import (CursorPage, decode_cursor, encode_cursor,
+                               ESCursorPaginator, ESPaginator,
+                               MetaSerializer)
 from mkt.webapps.models import WebappIndexer
 
 
@@ -23,6 +27,51 @@ class TestSearchPaginator(TestCase):
         eq_(_mock.call_count, 1)
 
 
+class TestCursorPaginator(TestCase):
+
+    def test_cursor(self):
+        values = [10, u'2014-01-01T00:00:00', None, 3]
+        eq_(decode_cursor(encode_cursor(values)), values)
+
+    @raises(ParseError)
+    def test_invalid_cursor(self):
+        decode_cursor('nope')
+
+    def test_sort(self):
+        paginator = ESCursorPaginator(
+            S(WebappIndexer).order_by('name_sort').order_by('-created'), 5)
+        eq_(paginator.get_sort(), ['-created', 'id'])
+
+    @raises(ParseError)
+    def test_no_sort(self):
+        ESCursorPaginator(S(WebappIndexer), 5).get_sort()
+
+    def test_cursor_dates(self):
+        values = [datetime(2014, 1, 1, 12, 30), date(2014, 1, 2), 3]
+        eq_(decode_cursor(encode_cursor(values)),
+            [u'2014-01-01T12:30:00', u'2014-01-02', 3])
+
+    @mock.patch('pyelasticsearch.client.ElasticSearch.send_request')
+    def test_page(self, send_request):
+        send_request.return_value = {'took': 1, 'hits': {'total': 3, 'hits': [
+            {'_id': str(pk), 'fields': {
+                'id': pk, 'created': '2014-01-0%sT00:00:00' % (4 - pk)}}
+            for pk in (1, 2, 3)]}}
+        paginator = ESCursorPaginator(
+            S(WebappIndexer).values_dict('id', 'created').order_by('-created'),
+            2)
+        page = paginator.page()
+        eq_([r['id'] for r in page], [1, 2])
+        # The created dates are datetimes in the results.
+        eq_(decode_cursor(page.next_cursor), [u'2014-01-02T00:00:00', 2])
+        eq_(paginator.count, 3)
+
+    @raises(ParseError)
+    def test_wrong_cursor_length(self):
+        paginator = ESCursorPaginator(S(WebappIndexer).order_by('-created'), 5)
+        paginator.page(encode_cursor([1]))
+
+
 class TestMetaSerializer(TestCase):
     def setUp(self):
         self.url = '/api/whatever'
@@ -131,3 +180,20 @@ class TestMetaSerializer(TestCase):
         eq_(next.path, '/api/whatever/')
         eq_(QueryDict(next.query),
             QueryDict('limit=2&offset=4&extra=&superfluous=yes'))
+
+    def test_cursor_page(self):
+        self.url = '/api/whatever/?limit=2&offset=4&sort=created'
+        self.request = RequestFactory().get(self.url)
+        paginator = ESCursorPaginator(S(WebappIndexer), 2)
+        paginator.count = 5
+        page = CursorPage(['a', 'b'], paginator, next_cursor='abc')
+        serialized = self.get_serialized_data(page)
+        eq_(serialized['offset'], None)
+        eq_(serialized['total_count'], 5)
+        eq_(serialized['limit'], 2)
+        eq_(serialized['previous'], None)
+
+        next = urlparse(serialized['next'])
+        eq_(next.path, '/api/whatever/')
+        eq_(QueryDict(next.query),
+            QueryDict('limit=2&cursor=abc&sort=created'))
@@ -16,8 +16,8 @@ from mkt.developers.urls import dev_api_patterns, payments_api_patterns
 from mkt.features.views import AppFeaturesList
 from mkt.receipts.urls import receipt_api_patterns
 from mkt.reviewers.urls import api_patterns as reviewer_api_patterns
-from mkt.search.views import (FeaturedSearchView, RocketbarView, SearchView,
-                            SuggestionsView)
+from mkt.search.views import (FeaturedSearchView, RecommendationsView,
+                              RocketbarView, SearchView, SuggestionsView)
 from mkt.stats.urls import stats_api_patterns, txn_api_patterns
 from mkt.submit.views import PreviewViewSet, StatusViewSet, ValidationViewSet
 from mkt.webapps.views import AppViewSet, PrivacyPolicyViewSet
@@ -60,6 +60,8 @@ urlpatterns = patterns('',
     url('', include('mkt.darjeeling.urls')),
     url(r'^apps/', include(apps.urls)),
     url(r'^apps/app/', include(subapps.urls)),
+    url(r'^apps/app/(?P<pk>\d+)/recommendations/$',
+        RecommendationsView.as_view(), name='app-recommendations'),
     url(r'^apps/search/featured/', FeaturedSearchView.as_view(),
         name='featured-search-api'),
     url(r'^apps/search/suggest/', SuggestionsView.as_view(),
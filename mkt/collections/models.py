@@ -1,7 +1,7 @@
 import os
 
 from django.conf import settings
-from django.db import models
+from django.db import connection, models
 
 import amo.models
 import mkt.carriers
@@ -9,7 +9,7 @@ import mkt.regions
 from addons.models import Addon, Category, clean_slug
 from amo.decorators import use_master
 from amo.models import SlugField
-from amo.utils import to_language
+from amo.utils import cache_ns_key, to_language
 from mkt.webapps.models import Webapp
 from mkt.webapps.tasks import index_webapps
 from translations.fields import PurifiedField, save_signal
@@ -132,12 +132,77 @@ class Collection(amo.models.ModelBase):
         collection is not included in the ditionary.
         """
         existing_pks = self.apps().no_cache().values_list('pk', flat=True)
-        if set(existing_pks) != set(new_order):
+        if (set(existing_pks) != set(new_order) or
+                len(set(new_order)) != len(new_order)):
             raise ValueError('Not all apps included')
-        for order, pk in enumerate(new_order):
-            CollectionMembership.objects.get(collection=self,
-                                             app_id=pk).update(order=order)
-        index_webapps.delay(new_order)
+        self._set_order(new_order)
+        self._memberships_changed(new_order)
+
+    def set_apps(self, new_apps):
+        """
+        Passed a list of app IDs, e.g.
+
+        [18, 24, 9]
+
+        will make those apps, in that order, the only apps in the collection:
+        memberships of apps not in the list are removed and the missing ones
+        are created, with a single reindex for the whole edit. A ValueError
+        will be raised if an app is listed more than once.
+        """
+        if len(set(new_apps)) != len(new_apps):
+            raise ValueError('Duplicate apps')
+        qs = CollectionMembership.objects.no_cache().filter(collection=self)
+        existing_pks = set(qs.values_list('app_id', flat=True))
+        removed_pks = list(existing_pks.difference(new_apps))
+        if removed_pks:
+            qs.filter(app__in=removed_pks).delete()
+        CollectionMembership.objects.bulk_create([
+            CollectionMembership(collection=self, app_id=pk, order=order)
+            for order, pk in enumerate(new_apps) if pk not in existing_pks])
+        self._set_order([pk for pk in new_apps if pk in existing_pks],
+                        new_apps)
+        self._memberships_changed(list(new_apps) + removed_pks)
+
+    def _set_order(self, pks, new_order=None):
+        """
+        Sets the order of the memberships of the apps in `pks` to their
+        position in `new_order` (defaults to `pks`) in a single UPDATE.
+        """
+        if not pks:
+            return
+        if new_order is None:
+            new_order = pks
+        positions = dict((pk, order) for order, pk in enumerate(new_order))
+        params = []
+        for pk in pks:
+            params.extend([pk, positions[pk]])
+        params.append(self.pk)
+        params.extend(pks)
+        # The ORM can't build a CASE expression, hence the raw SQL.
+        qn = connection.ops.quote_name
+        cursor = connection.cursor()
+        cursor.execute('''
+            UPDATE %s SET %s = CASE %s %s END
+            WHERE %s = %%s AND %s IN (%s)
+        ''' % (qn(CollectionMembership._meta.db_table), qn('order'),
+               qn('app_id'), ' '.join(['WHEN %s THEN %s'] * len(pks)),
+               qn('collection_id'), qn('app_id'),
+               ', '.join(['%s'] * len(pks))), params)
+
+    def _memberships_changed(self, app_pks):
+        """
+        Invalidates the cached memberships of this collection and reindexes
+        the apps in `app_pks`, once per bulk edit.
+        """
+        # Bulk queries bypass django-cache-machine, help it like in add_app.
+        CollectionMembership.objects.invalidate(
+            *CollectionMembership.objects.no_cache().filter(collection=self))
+        # Nor do they send the signals invalidating the cached feed responses.
+        # Bump its namespace here rather than importing mkt.feed, which
+        # imports this module.
+        cache_ns_key('feed', increment=True)
+        if app_pks:
+            index_webapps.delay(app_pks)
 
     def has_curator(self, userprofile):
         """
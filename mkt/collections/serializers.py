@@ -18,13 +18,14 @@ import mkt
 from addons.models import Category
 from mkt.api.fields import (SlugChoiceField, SlugModelChoiceField,
                             TranslationSerializerField)
-from mkt.features.utils import get_feature_profile
-from mkt.search.serializers import SimpleESAppSerializer
+from mkt.features.utils import (filter_by_profile, filter_by_profile_es,
+                                get_feature_profile)
+from mkt.search.serializers import SimpleFastESAppSerializer
 from mkt.webapps.serializers import SimpleAppSerializer
 from mkt.webapps.models import Webapp
 from users.models import UserProfile
 
-from .models import Collection
+from .models import Collection, CollectionMembership
 from .constants import COLLECTIONS_TYPE_FEATURED, COLLECTIONS_TYPE_OPERATOR
 
 
@@ -38,7 +39,7 @@ class CollectionMembershipField(serializers.RelatedField):
     want to use this elsewhere.
     """
     app_serializer_classes = {
-        'es': SimpleESAppSerializer,
+        'es': SimpleFastESAppSerializer,
         'normal': SimpleAppSerializer,
     }
 
@@ -78,18 +79,49 @@ class CollectionMembershipField(serializers.RelatedField):
         if self.context.get('use-es-for-apps') and self.context.get('view'):
             return self.field_to_native_es(obj, request)
 
-        qs = get_component(obj, self.source)
+        if hasattr(obj, 'prefetched_apps'):
+            return self.to_native(obj.prefetched_apps)
 
-        # Filter apps based on device and feature profiles.
+        qs = self.filter_apps(get_component(obj, self.source), request)
+        return self.to_native(qs.transform(Webapp.api_transformer))
+
+    def filter_apps(self, qs, request):
+        """Filter apps based on device and feature profiles."""
         device = self._get_device(request)
         profile = get_feature_profile(request)
         if device and device != amo.DEVICE_DESKTOP:
             qs = qs.filter(addondevicetype__device_type=device.id)
         if profile:
-            qs = qs.filter(**profile.to_kwargs(
-                prefix='_current_version__features__has_'))
+            qs = filter_by_profile(qs, profile)
+        return qs
 
-        return self.to_native(qs)
+    def prefetch(self, collections):
+        """
+        Fetches the public apps of all the `collections` at once, in a fixed
+        number of queries, and attaches them in order as `prefetched_apps`,
+        which `field_to_native` then serializes instead of querying the apps
+        of each collection.
+        """
+        collections = [c for c in collections if c is not None]
+        if not collections:
+            return
+        memberships = list(CollectionMembership.objects
+                           .filter(collection__in=[c.pk for c in collections])
+                           .order_by('order')
+                           .values_list('collection', 'app'))
+        qs = Webapp.objects.filter(
+            pk__in=set(app for _, app in memberships),
+            disabled_by_user=False, status=amo.STATUS_PUBLIC)
+        qs = self.filter_apps(qs, self.context['request'])
+        apps = dict((app.pk, app) for app in
+                    qs.transform(Webapp.api_transformer))
+
+        by_collection = dict((c.pk, []) for c in collections)
+        for collection, app in memberships:
+            if app in apps:
+                by_collection[collection].append(apps[app])
+        for collection in collections:
+            collection.prefetched_apps = by_collection[collection.pk]
 
     def field_to_native_es(self, obj, request):
         """
@@ -109,9 +141,10 @@ class CollectionMembershipField(serializers.RelatedField):
         filters = {'collection.id': obj.pk}
         if device and device != amo.DEVICE_DESKTOP:
             filters['device'] = device.id
+        qs = qs.filter(**filters)
         if profile:
-            filters.update(**profile.to_kwargs(prefix='features.has_'))
-        qs = qs.filter(**filters).order_by({
+            qs = filter_by_profile_es(qs, profile)
+        qs = qs.order_by({
             'collection.order': {
                 'order': 'asc',
                 'nested_filter': {
@@ -120,6 +120,44 @@ class TestCollection(amo.tests.TestCase):
             reordered_pks)
         mocked_index_webapps.assert_called_with(reordered_pks)
 
+    @patch('mkt.collections.models.index_webapps.delay')
+    def test_apps_reorder_duplicates(self, mocked_index_webapps):
+        self._generate_apps()
+        self._add_apps()
+        with self.assertRaises(ValueError):
+            self.collection.reorder([a.pk for a in self.apps] +
+                                    [self.apps[0].pk])
+        eq_(list(self.collection.apps()), self.apps)
+
+    @patch('mkt.collections.models.index_webapps.delay')
+    def test_set_apps(self, mocked_index_webapps):
+        self._generate_apps()
+        self.collection.add_app(self.apps[0])
+        self.collection.add_app(self.apps[1])
+        new_apps = [self.apps[3].pk, self.apps[1].pk, self.apps[2].pk]
+        self.collection.set_apps(new_apps)
+        eq_(list(self.collection.apps().values_list('pk', flat=True)),
+            new_apps)
+        eq_(list(CollectionMembership.objects.values_list('order', flat=True)),
+            [0, 1, 2])
+        # A single reindex, including the removed app.
+        mocked_index_webapps.assert_called_with(new_apps + [self.apps[0].pk])
+
+    @patch('mkt.collections.models.index_webapps.delay')
+    def test_set_apps_empty(self, mocked_index_webapps):
+        self._generate_apps()
+        self._add_apps()
+        self.collection.set_apps([])
+        eq_(list(self.collection.apps()), [])
+        eq_(sorted(mocked_index_webapps.call_args[0][0]),
+            sorted(a.pk for a in self.apps))
+
+    def test_set_apps_duplicates(self):
+        self._generate_apps()
+        with self.assertRaises(ValueError):
+            self.collection.set_apps([self.apps[0].pk, self.apps[0].pk])
+        eq_(list(self.collection.apps()), [])
+
     def test_app_deleted(self):
         collection = self.collection
         app = amo.tests.app_factory()
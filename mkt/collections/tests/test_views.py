@@ -1108,6 +1108,70 @@ class TestCollectionViewSetReorderApps(CollectionViewSetChangeAppsMixin):
                             [a.pk for a in self.collection.apps()])
 
 
+class TestCollectionViewSetSetApps(CollectionViewSetChangeAppsMixin):
+    """
+    Tests the `set_apps` action on CollectionViewSet.
+    """
+    def set_apps(self, client, apps, collection_id=None):
+        url = self.collection_url('set-apps',
+                                  collection_id or self.collection.pk)
+        res = client.post(url, json.dumps(apps))
+        data = json.loads(res.content)
+        return res, data
+
+    def test_set_apps_anon(self):
+        res, data = self.set_apps(self.anon, [])
+        eq_(res.status_code, 403)
+        eq_(PermissionDenied.default_detail, data['detail'])
+
+    def test_set_apps_no_perms(self):
+        res, data = self.set_apps(self.client, [])
+        eq_(res.status_code, 403)
+        eq_(PermissionDenied.default_detail, data['detail'])
+
+    def test_set_apps_has_perms(self):
+        self.make_publisher()
+        self.create_apps(number=3)
+        self.add_apps_to_collection(self.apps[0], self.apps[1])
+        new_apps = [self.apps[2].pk, self.apps[0].pk]
+        res, data = self.set_apps(self.client, new_apps)
+        eq_(res.status_code, 200)
+        eq_([int(app['id']) for app in data['apps']], new_apps)
+        eq_(list(self.collection.apps().values_list('pk', flat=True)),
+            new_apps)
+
+    def test_set_apps_curator(self):
+        self.make_curator()
+        self.create_apps(number=2)
+        new_apps = [self.apps[1].pk, self.apps[0].pk]
+        res, data = self.set_apps(self.client, new_apps,
+                                  collection_id=self.collection.slug)
+        eq_(res.status_code, 200)
+        eq_([int(app['id']) for app in data['apps']], new_apps)
+
+    def test_set_apps_not_list(self):
+        self.make_publisher()
+        res, data = self.set_apps(self.client, {'app': 1})
+        eq_(res.status_code, 400)
+        eq_(data['detail'], CollectionViewSet.exceptions['apps_not_list'])
+
+    def test_set_apps_duplicates(self):
+        self.make_publisher()
+        self.create_apps(number=1)
+        res, data = self.set_apps(self.client,
+                                  [self.apps[0].pk, self.apps[0].pk])
+        eq_(res.status_code, 400)
+        eq_(data['detail'], CollectionViewSet.exceptions['apps_duplicate'])
+
+    def test_set_apps_doesnt_exist(self):
+        self.make_publisher()
+        self.create_apps(number=1)
+        res, data = self.set_apps(self.client, [self.apps[0].pk, 999999])
+        eq_(res.status_code, 400)
+        eq_(data['detail'], CollectionViewSet.exceptions['apps_dont_exist'])
+        eq_(list(self.collection.apps()), [])
+
+
 class TestCollectionViewSetEditCollection(BaseCollectionViewSetTest):
     """
     Tests the handling of PATCH requests to a single collection on
@@ -51,6 +51,9 @@ class CollectionViewSet(CORSMixin, SlugOrIdMixin, MarketplaceView,
         'not_in': '`app` not in collection.',
         'already_in': '`app` already exists in collection.',
         'app_mismatch': 'All apps in this collection must be included.',
+        'apps_not_list': '`apps` must be a list of app IDs.',
+        'apps_duplicate': '`apps` must not contain the same app twice.',
+        'apps_dont_exist': 'Some of the `apps` do not exist.',
     }
 
     def filter_queryset(self, queryset):
@@ -146,8 +149,7 @@ class CollectionViewSet(CORSMixin, SlugOrIdMixin, MarketplaceView,
             return result
 
         # And now, add apps from the original collection.
-        for app in collection.apps():
-            self.object.add_app(app)
+        self.object.set_apps([app.pk for app in collection.apps()])
 
         # Re-Serialize to include apps.
         return self.return_updated(status.HTTP_201_CREATED,
@@ -203,6 +205,24 @@ class CollectionViewSet(CORSMixin, SlugOrIdMixin, MarketplaceView,
             }, status=status.HTTP_400_BAD_REQUEST, exception=True)
         return self.return_updated(status.HTTP_200_OK)
 
+    @action()
+    def set_apps(self, request, *args, **kwargs):
+        """
+        Replace the apps of the specified collection with the ordered list of
+        app IDs passed, in a single edit.
+        """
+        collection = self.get_object()
+        new_apps = request.DATA
+        if (not isinstance(new_apps, list) or
+                not all(isinstance(pk, (int, long)) for pk in new_apps)):
+            raise ParseError(detail=self.exceptions['apps_not_list'])
+        if len(set(new_apps)) != len(new_apps):
+            raise ParseError(detail=self.exceptions['apps_duplicate'])
+        if Webapp.objects.filter(pk__in=new_apps).count() != len(new_apps):
+            raise ParseError(detail=self.exceptions['apps_dont_exist'])
+        collection.set_apps(new_apps)
+        return self.return_updated(status.HTTP_200_OK)
+
     def serialized_curators(self, no_cache=False):
         queryset = self.get_object().curators.all()
         if no_cache:
@@ -390,6 +390,13 @@ class FeatureProfile(OrderedDict):
         """
         return [k for k, v in self.iteritems() if v]
 
+    def to_unsupported_list(self):
+        """
+        Returns a list of the features this profile does not support, which
+        apps must not require.
+        """
+        return [k for k, v in self.iteritems() if not v]
+
     def to_kwargs(self, prefix=''):
         """
         Returns a dict representing the false values of this profile.
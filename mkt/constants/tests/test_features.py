@@ -61,3 +61,9 @@ class TestFeatureProfile(amo.tests.TestCase):
     def test_to_kwargs(self):
         self._test_kwargs('')
         self._test_kwargs('prefix_')
+
+    def test_to_unsupported_list(self):
+        profile = FeatureProfile.from_int(self.features)
+        unsupported = profile.to_unsupported_list()
+        eq_(len(unsupported), len(APP_FEATURES) - len(self.truths))
+        ok_(not set(unsupported) & set(self.truths))
@@ -125,6 +125,17 @@ class TestPackagedManifest(amo.tests.TestCase):
         eq_(res.content, '')
         eq_(res.status_code, 304)
 
+    @mock.patch('mkt.webapps.models.Webapp.get_cached_manifest')
+    def test_conditional_get_etag_cached(self, _mock):
+        _mock.return_value = self._mocked_json()
+        etag = self.get_digest_from_manifest()
+        eq_(self.client.get(self.url).status_code, 200)
+        _mock.reset_mock()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH='%s' % etag)
+        eq_(res.status_code, 304)
+        # Neither the ETag nor the body needed the manifest.
+        assert not _mock.called
+
     def test_app_pending(self):
         self.app.update(status=amo.STATUS_PENDING)
         res = self.client.get(self.url)
@@ -1,5 +1,3 @@
-import hashlib
-
 from django import http
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.http import etag
@@ -28,27 +26,16 @@ def manifest(request, uuid):
     """
     addon = get_object_or_404(Webapp, guid=uuid, is_packaged=True)
     is_avail = addon.status in [amo.STATUS_PUBLIC, amo.STATUS_BLOCKED]
-    package_etag = hashlib.sha256()
 
     if not addon.is_packaged or addon.disabled_by_user or not is_avail:
         raise http.Http404
 
-    else:
-        manifest_content = addon.get_cached_manifest()
-        package_etag.update(manifest_content)
-
-        if addon.is_packaged:
-            # Update the hash with the content of the package itself.
-            package_file = addon.get_latest_file()
-            if package_file:
-                package_etag.update(package_file.hash)
-
-    manifest_etag = package_etag.hexdigest()
+    manifest_etag = addon.get_manifest_etag()
 
     @etag(lambda r, a: manifest_etag)
     def _inner_view(request, addon):
         response = http.HttpResponse(
-            manifest_content,
+            addon.get_cached_manifest(),
             content_type='application/x-web-app-manifest+json; charset=utf-8')
         return response
 
@@ -82,6 +82,9 @@ def process_iarc_changes(date=None):
     resp = client.Get_Rating_Changes(XMLString=xml)
     data = lib.iarc.utils.IARC_XML_Parser().parse_string(resp)
 
+    # Match each change to its app first so all the certificates can be
+    # re-fetched in a single batch.
+    changes = []
     for row in data.get('rows', []):
         iarc_id = row.get('submission_id')
         if not iarc_id:
@@ -95,10 +98,20 @@ def process_iarc_changes(date=None):
                       '%s' % iarc_id)
             continue
 
-        try:
-            # Fetch and save all IARC info.
-            refresh_iarc_ratings([app.id])
+        changes.append((app, row))
+
+    if not changes:
+        return
+
+    # Fetch and save all IARC info.
+    refreshed = refresh_iarc_ratings(list(set(app.id for app, row in changes)))
 
+    for app, row in changes:
+        if app.id not in refreshed:
+            # The ratings weren't stored, don't report them as changed.
+            continue
+
+        try:
             # Flag for rereview if it changed to adult.
             ratings_body = row.get('rating_system')
             rating = RATINGS_MAPPING[ratings_body].get(row['new_rating'])
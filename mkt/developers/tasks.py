@@ -11,10 +11,13 @@ import traceback
 import urlparse
 import uuid
 import zipfile
+from collections import defaultdict
 from datetime import date
+from multiprocessing.pool import ThreadPool
 
 from django import forms
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage as storage
 from django.utils.http import urlencode
 
@@ -27,16 +30,18 @@ from PIL import Image
 from tower import ugettext as _
 
 import amo
-from addons.models import Addon
+from addons.models import Addon, AddonUser
 from amo.decorators import set_modified_on, write
 from amo.helpers import absolutify
-from amo.utils import remove_icons, resize_image, send_mail_jinja, strip_bom
+from amo.utils import (open_image, remove_icons, save_resized_image,
+                        send_mail_jinja, strip_bom)
 from files.models import FileUpload, File, FileValidation
 from files.utils import SafeUnzip
 
 from mkt.constants import APP_PREVIEW_SIZES
-from mkt.webapps.models import AddonExcludedRegion, Webapp
-from mkt.webapps.utils import iarc_get_app_info
+from mkt.webapps.models import (AddonExcludedRegion, clear_excluded_in_cache,
+                                Webapp)
+from mkt.webapps.utils import iarc_get_app_info_many
 
 
 log = logging.getLogger('z.mkt.developers.task')
@@ -137,11 +142,14 @@ def resize_icon(src, dst, sizes, locally=False, **kw):
     """Resizes addon icons."""
     log.info('[1@None] Resizing icon: %s' % dst)
     try:
+        # Decode the source once for all the sizes.
+        im = open_image(src, locally=locally)
+        size_dsts = []
         for s in sizes:
             size_dst = '%s-%s.png' % (dst, s)
-            resize_image(src, size_dst, (s, s),
-                         remove_src=False, locally=locally)
-            pngcrush_image.delay(size_dst, **kw)
+            save_resized_image(im, size_dst, (s, s), locally=locally)
+            size_dsts.append(size_dst)
+        pngcrush_images.delay(size_dsts, **kw)
 
         if locally:
             with open(src) as fd:
@@ -158,35 +166,84 @@ def resize_icon(src, dst, sizes, locally=False, **kw):
         log.error("Error saving addon icon: %s; %s" % (e, dst))
 
 
+def _crushed_key(path):
+    with open(path, 'rb') as fd:
+        return 'pngcrush:%s' % hashlib.md5(fd.read()).hexdigest()
+
+
+def _pngcrush(src):
+    """
+    Runs src through Pngcrush, unless it's already the output of Pngcrush.
+    Returns whether it worked.
+    """
+    key = _crushed_key(src)
+    if cache.get(key):
+        log.info('Image already optimized: %s' % src)
+        return True
+
+    # pngcrush -ow has some issues, use a temporary file and do the final
+    # renaming ourselves.
+    suffix = '.opti.png'
+    tmp_path = '%s%s' % (os.path.splitext(src)[0], suffix)
+    cmd = [settings.PNGCRUSH_BIN, '-q', '-rem', 'alla', '-brute',
+           '-reduce', '-e', suffix, src]
+    sp = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = sp.communicate()
+
+    if sp.returncode != 0:
+        log.error('Error optimizing image: %s; %s' % (src, stderr.strip()))
+        return False
+
+    shutil.move(tmp_path, src)
+    # Remember the result, so that crushing it again is skipped.
+    cache.set(_crushed_key(src), 1, None)
+    log.info('Image optimization completed for: %s' % src)
+    return True
+
+
 @task
 @set_modified_on
 def pngcrush_image(src, **kw):
     """Optimizes a PNG image by running it through Pngcrush."""
     log.info('[1@None] Optimizing image: %s' % src)
     try:
-        # pngcrush -ow has some issues, use a temporary file and do the final
-        # renaming ourselves.
-        suffix = '.opti.png'
-        tmp_path = '%s%s' % (os.path.splitext(src)[0], suffix)
-        cmd = [settings.PNGCRUSH_BIN, '-q', '-rem', 'alla', '-brute',
-               '-reduce', '-e', suffix, src]
-        sp = subprocess.Popen(cmd, stdin=subprocess.PIPE,
-                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, stderr = sp.communicate()
-
-        if sp.returncode != 0:
-            log.error('Error optimizing image: %s; %s' % (src,
-                                                               stderr.strip()))
+        if not _pngcrush(src):
             pngcrush_image.retry(args=[src], kwargs=kw, max_retries=3)
             return False
-
-        shutil.move(tmp_path, src)
-        log.info('Image optimization completed for: %s' % src)
         return True
     except Exception, e:
         log.error('Error optimizing image: %s; %s' % (src, e))
 
 
+@task
+@set_modified_on
+def pngcrush_images(srcs, **kw):
+    """
+    Optimizes several PNG images, running at most `PNGCRUSH_CONCURRENCY`
+    Pngcrush processes at once.
+    """
+    log.info('[%s@None] Optimizing images: %s' % (len(srcs), srcs))
+    pool = ThreadPool(min(settings.PNGCRUSH_CONCURRENCY, len(srcs)) or 1)
+    try:
+        results = pool.map(_safe_pngcrush, srcs)
+    finally:
+        pool.close()
+    failed = [src for src, ok in zip(srcs, results) if not ok]
+    if failed:
+        pngcrush_images.retry(args=[failed], kwargs=kw, max_retries=3)
+        return False
+    return True
+
+
+def _safe_pngcrush(src):
+    try:
+        return _pngcrush(src)
+    except Exception, e:
+        log.error('Error optimizing image: %s; %s' % (src, e))
+        return False
+
+
 @task
 @set_modified_on
 def resize_preview(src, instance, **kw):
@@ -197,8 +254,9 @@ def resize_preview(src, instance, **kw):
     try:
         thumbnail_size = APP_PREVIEW_SIZES[0][:2]
         image_size = APP_PREVIEW_SIZES[1][:2]
-        with storage.open(src, 'rb') as fp:
-            size = Image.open(fp).size
+        # Decode the source once for both sizes.
+        im = open_image(src)
+        size = im.size
         if size[0] > size[1]:
             # If the image is wider than tall, then reverse the wanted size
             # to keep the original aspect ratio while still resizing to
@@ -207,13 +265,10 @@ def resize_preview(src, instance, **kw):
             image_size = image_size[::-1]
 
         if kw.get('generate_thumbnail', True):
-            sizes['thumbnail'] = resize_image(src, thumb_dst,
-                                              thumbnail_size,
-                                              remove_src=False)
+            sizes['thumbnail'] = save_resized_image(im, thumb_dst,
+                                                    thumbnail_size)
         if kw.get('generate_image', True):
-            sizes['image'] = resize_image(src, full_dst,
-                                          image_size,
-                                          remove_src=False)
+            sizes['image'] = save_resized_image(im, full_dst, image_size)
         instance.sizes = sizes
         instance.save()
         log.info('Preview resized to: %s' % thumb_dst)
@@ -245,10 +300,15 @@ def get_preview_sizes(ids, **kw):
                           % (addon.pk, err))
 
 
-def _fetch_content(url):
+def _fetch_content(url, headers=None):
     with statsd.timer('developers.tasks.fetch_content'):
         try:
-            res = requests.get(url, timeout=30, stream=True)
+            res = requests.get(url, timeout=30, stream=True, headers=headers)
+
+            if res.status_code == 304 and headers:
+                # The request was conditional and nothing changed.
+                statsd.incr('developers.tasks.fetch_content.not_modified')
+                return res
 
             if not 200 <= res.status_code < 300:
                 statsd.incr('developers.tasks.fetch_content.error')
@@ -375,7 +435,15 @@ def failed_validation(*messages, **kwargs):
                        'prelim': True})
 
 
-def _fetch_manifest(url, upload=None):
+def _fetch_manifest(url, upload=None, validators=None):
+    """
+    Fetches the manifest at `url`.
+
+    `validators` can hold the `ETag` and `Last-Modified` headers of a previous
+    response to make the request conditional, None is returned if the
+    manifest didn't change since. The dict is updated with the headers of the
+    new response.
+    """
     def fail(message, upload=None):
         if upload is None:
             # If `upload` is None, that means we're using one of @washort's old
@@ -383,14 +451,30 @@ def _fetch_manifest(url, upload=None):
             raise Exception(message)
         upload.update(validation=failed_validation(message, upload=upload))
 
+    headers = {}
+    if validators:
+        if validators.get('ETag'):
+            headers['If-None-Match'] = validators['ETag']
+        if validators.get('Last-Modified'):
+            headers['If-Modified-Since'] = validators['Last-Modified']
+
     try:
-        response = _fetch_content(url)
+        response = _fetch_content(url, headers=headers or None)
     except Exception, e:
         log.error('Failed to fetch manifest from %r: %s' % (url, e))
         fail(_('No manifest was found at that URL. Check the address and try '
                'again.'), upload=upload)
         return
 
+    if response.status_code == 304:
+        return
+
+    if validators is not None:
+        validators.clear()
+        for header in ('ETag', 'Last-Modified'):
+            if response.headers.get(header):
+                validators[header] = response.headers[header]
+
     ct = response.headers.get('content-type', '')
     if not ct.startswith('application/x-web-app-manifest+json'):
         fail(_('Manifests must be served with the HTTP header '
@@ -492,19 +576,22 @@ def region_email(ids, regions, **kw):
     log.info('[%s@%s] Emailing devs about new region(s): %s.' %
              (len(ids), region_email.rate_limit, region_names))
 
-    for id_ in ids:
-        log.info('[Webapp:%s] Emailing devs about new region(s): %s.' %
-                (id_, region_names))
+    if len(regions) == 1:
+        subject = _(
+            u'{region} region added to the Firefox Marketplace').format(
+                region=regions[0])
+    else:
+        subject = _(u'New regions added to the Firefox Marketplace')
 
-        product = Webapp.objects.get(id=id_)
-        to = set(product.authors.values_list('email', flat=True))
+    # Look up the authors of every app at once.
+    authors = defaultdict(set)
+    for addon_id, email in (AddonUser.objects.filter(addon__in=ids)
+                            .values_list('addon', 'user__email')):
+        authors[addon_id].add(email)
 
-        if len(regions) == 1:
-            subject = _(
-                u'{region} region added to the Firefox Marketplace').format(
-                    region=regions[0])
-        else:
-            subject = _(u'New regions added to the Firefox Marketplace')
+    for product in Webapp.objects.filter(id__in=ids):
+        log.info('[Webapp:%s] Emailing devs about new region(s): %s.' %
+                (product.id, region_names))
 
         dev_url = absolutify(product.get_dev_url('edit'),
                              settings.SITE_URL) + '#details'
@@ -513,7 +600,7 @@ def region_email(ids, regions, **kw):
                    'dev_url': dev_url}
         send_mail_jinja('%s: %s' % (product.name, subject),
                         'developers/emails/new_regions_%s.ltxt' % suffix,
-                        context, recipient_list=to,
+                        context, recipient_list=authors[product.id],
                         perm_setting='app_regions')
 
 
@@ -525,13 +612,9 @@ def region_exclude(ids, regions, **kw):
     log.info('[%s@%s] Excluding new region(s): %s.' %
              (len(ids), region_exclude.rate_limit, region_names))
 
-    for id_ in ids:
-        log.info('[Webapp:%s] Excluding region(s): %s.' %
-                 (id_, region_names))
-        for region in regions:
-            # Already excluded? Swag!
-            AddonExcludedRegion.objects.get_or_create(addon_id=id_,
-                                                      region=region.id)
+    # Already excluded? Swag! Existing exclusions are ignored.
+    AddonExcludedRegion.exclude_many(ids, [region.id for region in regions])
+    clear_excluded_in_cache()
 
 
 @task
@@ -548,14 +631,25 @@ def save_test_plan(f, filename, addon):
 def refresh_iarc_ratings(ids, **kw):
     """
     Refresh old or corrupt IARC ratings by re-fetching the certificate.
-    """
-    for app in Webapp.objects.filter(id__in=ids):
-        data = iarc_get_app_info(app)
 
-        if data.get('rows'):
-            row = data['rows'][0]
+    The certificates are fetched concurrently, then applied one app at a time.
+    A failure only skips the app it happened on. Returns the ids of the apps
+    that were refreshed.
+    """
+    refreshed = set()
+    apps = Webapp.objects.filter(id__in=ids).select_related('iarc_info')
+    for app, data in iarc_get_app_info_many(apps):
+        if not data or not data.get('rows'):
+            continue
+        row = data['rows'][0]
 
+        try:
             # We found a rating, so store the id and code for future use.
             app.set_descriptors(row.get('descriptors', []))
             app.set_interactives(row.get('interactives', []))
             app.set_content_ratings(row.get('ratings', {}))
+        except Exception, e:
+            log.error('IARC refresh failed for app:%s: %s' % (app.pk, e))
+            continue
+        refreshed.add(app.pk)
+    return refreshed
@@ -10,7 +10,9 @@ import mkt
 import mkt.constants
 from mkt.developers.cron import (_flag_rereview_adult, exclude_new_region,
                                  process_iarc_changes, send_new_region_emails)
-from mkt.webapps.models import IARCInfo, RatingDescriptors, RatingInteractives
+from mkt.developers.tasks import refresh_iarc_ratings
+from mkt.webapps.models import (IARCInfo, RatingDescriptors,
+                                RatingInteractives, Webapp)
 
 
 class TestSendNewRegionEmails(amo.tests.WebappTestCase):
@@ -125,6 +127,39 @@ class TestIARCChangesCron(amo.tests.TestCase):
             'has_users_interact'
         ])
 
+    @mock.patch('mkt.webapps.models.Webapp.set_content_ratings')
+    def test_processing_refresh_failed(self, set_content_ratings):
+        set_content_ratings.side_effect = Exception('Bad row')
+        amo.set_user(amo.tests.user_factory())
+        app = amo.tests.app_factory()
+        IARCInfo.objects.create(addon=app, submission_id=52,
+                                security_code='FZ32CU8')
+
+        process_iarc_changes()
+        assert set_content_ratings.called
+        # The change wasn't stored, so it isn't logged.
+        assert not ActivityLog.objects.filter(
+            action=amo.LOG.CONTENT_RATING_CHANGED.id).exists()
+
+    def test_refresh_failure_skips_one_app(self):
+        apps = [amo.tests.app_factory(), amo.tests.app_factory()]
+        for app in apps:
+            IARCInfo.objects.create(addon=app, submission_id=52,
+                                    security_code='FZ32CU8')
+        set_descriptors = Webapp.set_descriptors
+
+        def fail_first(app, data):
+            if app.pk == apps[0].pk:
+                raise Exception('Bad row')
+            return set_descriptors(app, data)
+
+        with mock.patch.object(Webapp, 'set_descriptors', autospec=True,
+                               side_effect=fail_first):
+            eq_(refresh_iarc_ratings([app.pk for app in apps]),
+                set([apps[1].pk]))
+        assert not apps[0].content_ratings.exists()
+        assert apps[1].content_ratings.exists()
+
     def test_rereview_flag_adult(self):
         amo.set_user(amo.tests.user_factory())
         app = amo.tests.app_factory()
@@ -30,7 +30,8 @@ import mkt
 from mkt.developers import tasks
 from mkt.site.fixtures import fixture
 from mkt.submit.tests.test_views import BaseWebAppTest
-from mkt.webapps.models import AddonExcludedRegion as AER, Webapp
+from mkt.webapps.models import (AddonExcludedRegion as AER, get_excluded_in,
+                                Webapp)
 
 
 def test_resize_icon_shrink():
@@ -134,6 +135,30 @@ class TestPngcrushImage(amo.tests.TestCase):
         eq_(ImageChops.difference(crushed_image, orig_image).getbbox(), None)
         os.remove(src_crushed.name)
 
+    @mock.patch('mkt.developers.tasks.shutil')
+    @mock.patch('mkt.developers.tasks.subprocess')
+    def test_pngcrush_image_already_optimized(self, subprocess, shutil):
+        subprocess.Popen.return_value.communicate.return_value = ('', '')
+        subprocess.Popen.return_value.returncode = 0
+        eq_(tasks.pngcrush_image(self.src.name), True)
+        eq_(subprocess.Popen.call_count, 1)
+        # The content didn't change since it was crushed, skip it.
+        eq_(tasks.pngcrush_image(self.src.name), True)
+        eq_(subprocess.Popen.call_count, 1)
+
+    def test_pngcrush_images(self):
+        srcs = []
+        for i in range(3):
+            src = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+            shutil.copyfile(self.src.name, src.name)
+            srcs.append(src.name)
+
+        eq_(tasks.pngcrush_images(srcs), True)
+        orig_size = os.path.getsize(self.src.name)
+        for src in srcs:
+            assert os.path.getsize(src) < orig_size
+            os.remove(src)
+
 
 class TestValidator(amo.tests.TestCase):
 
@@ -574,6 +599,14 @@ class TestRegionEmail(amo.tests.WebappTestCase):
         assert ' added a few new ' in msg.body
         assert ': Brazil, United Kingdom, and United States.' in msg.body
 
+    def test_email_for_several_apps(self):
+        app = amo.tests.app_factory()
+        app.addonuser_set.create(
+            user=amo.tests.user_factory(username='other'))
+        tasks.region_email([self.app.id, app.id, 404], [mkt.regions.BR])
+        eq_(sorted(msg.to[0] for msg in mail.outbox),
+            ['other@mozilla.com', 'steamcube@mozilla.com'])
+
 
 class TestRegionExclude(amo.tests.WebappTestCase):
 
@@ -599,3 +632,16 @@ class TestRegionExclude(amo.tests.WebappTestCase):
         excluded = sorted(AER.objects.filter(addon=self.app)
                           .values_list('region', flat=True))
         eq_(excluded, sorted([mkt.regions.US.id, mkt.regions.UK.id]))
+
+    def test_exclude_already_excluded(self):
+        AER.objects.create(addon=self.app, region=mkt.regions.UK.id)
+        app = amo.tests.app_factory()
+        tasks.region_exclude([self.app.id, app.id],
+                             [mkt.regions.US, mkt.regions.UK])
+        eq_(AER.objects.filter(addon=self.app).count(), 2)
+        eq_(AER.objects.filter(addon=app).count(), 2)
+
+    def test_exclude_clears_excluded_in(self):
+        eq_(get_excluded_in(mkt.regions.UK.id), set())
+        tasks.region_exclude([self.app.id], [mkt.regions.UK])
+        eq_(get_excluded_in(mkt.regions.UK.id), set([self.app.id]))
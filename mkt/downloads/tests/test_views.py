@@ -1,3 +1,5 @@
+import os
+
 import mock
 from nose import SkipTest
 from nose.tools import eq_
@@ -6,6 +8,7 @@ from django.conf import settings
 
 import amo
 from amo.urlresolvers import reverse
+from amo.utils import file_etag
 from lib.crypto import packaged
 from lib.crypto.tests import mock_sign
 from mkt.submit.tests.test_views import BasePackagedAppTest
@@ -28,6 +31,42 @@ class TestDownload(BasePackagedAppTest):
         eq_(res.status_code, 200)
         assert settings.XSENDFILE_HEADER in res
 
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_signing_in_progress(self, sign):
+        os.remove(self.file.signed_file_path)
+        sign.side_effect = packaged.SigningInProgress
+        res = self.client.get(self.url)
+        eq_(res.status_code, 503)
+        eq_(res['Retry-After'], str(settings.SIGNED_APPS_LOCK_WAIT))
+
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_not_modified(self, sign):
+        etag = file_etag(self.file.signed_file_path)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH='"%s"' % etag)
+        eq_(res.status_code, 304)
+        assert not sign.called
+
+    def test_resigned_range(self):
+        path = self.file.signed_file_path
+        old_etag = file_etag(path)
+        # Re-signing rewrites the signed file, the hash of the unsigned one
+        # stays the same.
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        with self.settings(XSENDFILE=False):
+            res = self.client.get(self.url, HTTP_RANGE='bytes=10-',
+                                  HTTP_IF_RANGE='"%s"' % old_etag)
+            eq_(res.status_code, 200)
+            res = self.client.get(self.url, HTTP_RANGE='bytes=10-',
+                                  HTTP_IF_RANGE='"%s"' % file_etag(path))
+            eq_(res.status_code, 206)
+
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_not_modified_not_owner(self, sign):
+        self.file.update(status=amo.STATUS_PENDING, hash='sha256:abc')
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH='"abc"')
+        eq_(res.status_code, 404)
+
     def test_disabled(self):
         self.app.update(status=amo.STATUS_DISABLED)
         eq_(self.client.get(self.url).status_code, 404)
@@ -1,12 +1,15 @@
 from django import http
+from django.conf import settings
+from django.core.files.storage import default_storage as storage
 from django.shortcuts import get_object_or_404
 
 import commonware.log
 
 import amo
 from access import acl
-from amo.utils import HttpResponseSendFile
+from amo.utils import file_etag, HttpResponseSendFile
 from files.models import File
+from lib.crypto.packaged import SigningInProgress
 from mkt.webapps.models import Webapp
 
 log = commonware.log.getLogger('z.downloads')
@@ -23,16 +26,31 @@ def download_file(request, file_id, type=None):
             raise http.Http404()
 
     # We treat blocked files like public files so users get the update.
-    if file.status in [amo.STATUS_PUBLIC, amo.STATUS_BLOCKED]:
-        path = webapp.sign_if_packaged(file.version_id)
-
-    else:
+    is_public = file.status in [amo.STATUS_PUBLIC, amo.STATUS_BLOCKED]
+    if not is_public:
         # This is someone asking for an unsigned packaged app.
         if not acl.check_addon_ownership(request, webapp, dev=True):
             raise http.Http404()
 
+    if is_public:
+        # Serve the signed package. Re-signing rewrites it without changing
+        # the hash of the unsigned file, so its ETag comes from the signed
+        # file itself: a resumed download (If-Range) of the old signature
+        # gets the whole new file rather than a range of it.
+        path = file.signed_file_path
+        if not storage.exists(path):
+            try:
+                path = webapp.sign_if_packaged(file.version_id)
+            except SigningInProgress:
+                # Don't hold the request, the package will be ready soon.
+                response = http.HttpResponse(status=503)
+                response['Retry-After'] = settings.SIGNED_APPS_LOCK_WAIT
+                return response
+        etag = file_etag(path)
+    else:
         path = file.file_path
+        etag = file.hash.split(':')[-1]
 
     log.info('Downloading package: %s from %s' % (webapp.id, path))
     return HttpResponseSendFile(request, path, content_type='application/zip',
-                                etag=file.hash.split(':')[-1])
+                                etag=etag)
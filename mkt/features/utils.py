@@ -1,3 +1,5 @@
+from elasticutils import F
+
 from mkt.constants.features import FeatureProfile
 
 
@@ -11,3 +13,22 @@ def get_feature_profile(request):
             except ValueError:
                 pass
     return profile
+
+
+def filter_by_profile_es(qs, profile):
+    """
+    Excludes the apps requiring a feature that `profile` doesn't support from
+    a search on the `WebappIndexer`, with a single filter.
+    """
+    unsupported = profile.to_unsupported_list()
+    if not unsupported:
+        return qs
+    return qs.filter(~F(required_features__in=unsupported))
+
+
+def filter_by_profile(qs, profile, prefix='_current_version__features__has_'):
+    """
+    The database counterpart of `filter_by_profile_es`, for querysets of
+    apps. Pass another `prefix` to go through other relations.
+    """
+    return qs.filter(**profile.to_kwargs(prefix=prefix))
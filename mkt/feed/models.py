@@ -3,16 +3,18 @@ import os
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 
 import amo.models
 from amo.models import SlugField
-from addons.models import Category, Preview
+from amo.utils import cache_ns_key
+from addons.models import Addon, Category, Preview
 from translations.fields import PurifiedField, save_signal
 
 import mkt.carriers
 import mkt.regions
 from mkt.collections.fields import ColorField
-from mkt.collections.models import Collection
+from mkt.collections.models import Collection, CollectionMembership
 from mkt.constants.feed import FEEDAPP_TYPES
 from mkt.ratings.validators import validate_rating
 from mkt.webapps.models import Webapp
@@ -42,6 +44,16 @@ class FeedApp(amo.models.ModelBase):
     class Meta:
         db_table = 'mkt_feed_app'
 
+    @staticmethod
+    def transformer(feedapps):
+        """
+        Attaches the apps and previews of `feedapps` in a fixed number of
+        queries, instead of one per feed app.
+        """
+        attach_related(feedapps, 'app',
+                       Webapp.objects.transform(Webapp.api_transformer))
+        attach_related(feedapps, 'preview', Preview.objects)
+
     def clean(self):
         """
         Require `pullquote_text` if `pullquote_rating` or
@@ -78,7 +90,92 @@ class FeedItem(amo.models.ModelBase):
     class Meta:
         db_table = 'mkt_feed_item'
 
+    @staticmethod
+    def transformer(items):
+        """
+        Attaches the categories, collections (and their categories) and feed
+        apps of `items`, along with their translations, in a fixed number of
+        queries.
+        """
+        attach_related(items, 'category', Category.objects)
+        attach_related(items, 'collection', Collection.objects)
+        attach_related([item.collection for item in items
+                        if item.collection_id], 'category', Category.objects)
+        attach_related(items, 'app',
+                       FeedApp.objects.transform(FeedApp.transformer))
+
+
+def attach_related(objs, field, queryset):
+    """
+    Fetches the objects `objs` point to through their `field` foreign key with
+    a single query on `queryset`, and caches them on `objs`.
+    """
+    attname = '%s_id' % field
+    pks = set(getattr(obj, attname) for obj in objs) - set([None])
+    if not pks:
+        return
+    related = dict((r.pk, r) for r in queryset.filter(pk__in=pks))
+    for obj in objs:
+        if getattr(obj, attname) in related:
+            setattr(obj, field, related[getattr(obj, attname)])
+
+
+def feed_cache_key(*parts):
+    """
+    Returns a cache key for a feed response, in a namespace that is bumped
+    every time something the feed is made of changes.
+    """
+    return '%s:%s' % (cache_ns_key('feed'), ':'.join(map(unicode, parts)))
+
+
+def invalidate_feed_cache(*args, **kwargs):
+    """Invalidates all the cached feed responses."""
+    cache_ns_key('feed', increment=True)
+
+
+def invalidate_feed_cache_for_app(sender, instance, **kwargs):
+    """
+    Invalidates the cached feed responses when an app that is in the feed,
+    as a feed app or in a collection of the feed, is saved or deleted.
+
+    The saves of the other apps, like the ones of the crons updating all of
+    them, keep the feed cached until CACHE_FEED_API_TIMEOUT.
+    """
+    if FeedItem.objects.no_cache().filter(
+            Q(app__app=instance.pk) |
+            Q(collection__collectionmembership__app=instance.pk)).exists():
+        invalidate_feed_cache()
+
 
 # Save translations when saving a Feedapp instance.
 models.signals.pre_save.connect(save_signal, sender=FeedApp,
                                 dispatch_uid='feedapp_translations')
+
+# Invalidate cached feed responses when the feed or its content changes.
+models.signals.post_save.connect(invalidate_feed_cache, sender=FeedApp,
+                                 dispatch_uid='feedapp_save_feed_cache')
+models.signals.post_delete.connect(invalidate_feed_cache, sender=FeedApp,
+                                   dispatch_uid='feedapp_delete_feed_cache')
+models.signals.post_save.connect(invalidate_feed_cache, sender=FeedItem,
+                                 dispatch_uid='feeditem_save_feed_cache')
+models.signals.post_delete.connect(invalidate_feed_cache, sender=FeedItem,
+                                   dispatch_uid='feeditem_delete_feed_cache')
+models.signals.post_save.connect(invalidate_feed_cache, sender=Collection,
+                                 dispatch_uid='collection_save_feed_cache')
+models.signals.post_delete.connect(invalidate_feed_cache, sender=Collection,
+                                   dispatch_uid='collection_delete_feed_cache')
+models.signals.post_save.connect(invalidate_feed_cache,
+                                 sender=CollectionMembership,
+                                 dispatch_uid='membership_save_feed_cache')
+models.signals.post_delete.connect(invalidate_feed_cache,
+                                   sender=CollectionMembership,
+                                   dispatch_uid='membership_delete_feed_cache')
+models.signals.post_save.connect(invalidate_feed_cache_for_app, sender=Addon,
+                                 dispatch_uid='addon_save_feed_cache')
+models.signals.post_delete.connect(invalidate_feed_cache_for_app, sender=Addon,
+                                   dispatch_uid='addon_delete_feed_cache')
+models.signals.post_save.connect(invalidate_feed_cache_for_app, sender=Webapp,
+                                 dispatch_uid='webapp_save_feed_cache')
+models.signals.post_delete.connect(invalidate_feed_cache_for_app,
+                                   sender=Webapp,
+                                   dispatch_uid='webapp_delete_feed_cache')
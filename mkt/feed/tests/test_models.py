@@ -1,12 +1,13 @@
-from nose.tools import ok_
+from nose.tools import eq_, ok_
 
 from django.core.exceptions import ValidationError
 
 import amo.tests
-from mkt.feed.models import FeedApp
+from addons.models import Addon
+from mkt.feed.models import FeedApp, FeedItem, feed_cache_key
 from mkt.webapps.models import Webapp
 
-from .test_views import FeedAppMixin
+from .test_views import CollectionMixin, FeedAppMixin
 
 
 class TestFeedApp(FeedAppMixin, amo.tests.TestCase):
@@ -50,3 +51,67 @@ class TestFeedApp(FeedAppMixin, amo.tests.TestCase):
         self.feedapp_data['pullquote_rating'] = 6
         with self.assertRaises(ValidationError):
             self.test_create()
+
+
+class TestFeedAppTransformer(FeedAppMixin, amo.tests.TestCase):
+
+    def test_transformer(self):
+        self.create_feedapps(n=2)
+        feedapps = list(FeedApp.objects.no_cache()
+                        .transform(FeedApp.transformer))
+        with self.assertNumQueries(0):
+            for feedapp in feedapps:
+                eq_(feedapp.app.pk, self.feedapp_data['app'])
+
+
+class TestFeedItem(CollectionMixin, FeedAppMixin, amo.tests.TestCase):
+
+    def test_transformer(self):
+        feedapp = self.create_feedapps(n=1)[0]
+        FeedItem.objects.create(collection=self.collection)
+        FeedItem.objects.create(app=feedapp)
+        items = list(FeedItem.objects.no_cache().order_by('id')
+                     .transform(FeedItem.transformer))
+        with self.assertNumQueries(0):
+            eq_(unicode(items[0].collection.name),
+                self.collection_data['name']['en-US'])
+            eq_(items[1].app.pk, feedapp.pk)
+            eq_(items[1].app.app.pk, self.feedapp_data['app'])
+
+    def test_cache_invalidation(self):
+        key = feed_cache_key('test')
+        eq_(feed_cache_key('test'), key)
+        item = FeedItem.objects.create(collection=self.collection)
+        ok_(feed_cache_key('test') != key)
+        key = feed_cache_key('test')
+        item.delete()
+        ok_(feed_cache_key('test') != key)
+        key = feed_cache_key('test')
+        self.collection.add_app(Webapp.objects.get(pk=337141))
+        ok_(feed_cache_key('test') != key)
+
+    def test_cache_invalidation_apps(self):
+        app = Webapp.objects.get(pk=337141)
+        # The collection of the app isn't in the feed yet.
+        self.collection.add_app(app)
+        key = feed_cache_key('test')
+        app.save()
+        eq_(feed_cache_key('test'), key)
+        FeedItem.objects.create(collection=self.collection)
+        key = feed_cache_key('test')
+        app.save()
+        ok_(feed_cache_key('test') != key)
+        key = feed_cache_key('test')
+        Addon.objects.get(pk=app.pk).save()
+        ok_(feed_cache_key('test') != key)
+
+    def test_cache_invalidation_feedapp(self):
+        feedapp = self.create_feedapps(n=1)[0]
+        app = Webapp.objects.get(pk=feedapp.app_id)
+        key = feed_cache_key('test')
+        app.save()
+        eq_(feed_cache_key('test'), key)
+        FeedItem.objects.create(app=feedapp)
+        key = feed_cache_key('test')
+        app.save()
+        ok_(feed_cache_key('test') != key)
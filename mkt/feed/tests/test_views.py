@@ -3,11 +3,16 @@ import json
 
 from nose.tools import eq_, ok_
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+import amo
 import mkt.carriers
 import mkt.regions
 from addons.models import Preview
+from amo.tests import app_factory
 from mkt.api.tests.test_oauth import RestOAuth
 from mkt.collections.constants import COLLECTIONS_TYPE_BASIC
 from mkt.collections.models import Collection
@@ -107,6 +112,58 @@ class TestFeedItemViewSetList(CollectionMixin, BaseTestFeedItemViewSet):
         eq_(data['meta']['total_count'], 1)
         eq_(data['objects'][0]['id'], self.item.id)
 
+    def test_list_anonymous_cached(self):
+        self.list(self.anon)
+        # Bypass the signals that would invalidate the feed cache, only
+        # invalidate the cached queries.
+        FeedItem.objects.filter(pk=self.item.pk).update(
+            region=mkt.regions.US.id)
+        FeedItem.objects.invalidate(self.item)
+        res, data = self.list(self.anon)
+        eq_(res.status_code, 200)
+        eq_(data['objects'][0]['region'], None)
+        # Authenticated users don't get cached responses.
+        res, data = self.list(self.client)
+        eq_(data['objects'][0]['region'], mkt.regions.US.slug)
+
+    def test_list_anonymous_invalidated(self):
+        self.list(self.anon)
+        FeedItem.objects.create(collection=self.collection)
+        res, data = self.list(self.anon)
+        eq_(res.status_code, 200)
+        eq_(data['meta']['total_count'], 2)
+
+    def test_list_anonymous_invalidated_apps(self):
+        app = app_factory()
+        self.list(self.anon)
+        # Bulk edits of the memberships don't send any signal.
+        self.collection.set_apps([app.pk])
+        res, data = self.list(self.anon)
+        eq_([a['id'] for a in data['objects'][0]['collection']['apps']],
+            [app.pk])
+        app.update(status=amo.STATUS_PENDING)
+        res, data = self.list(self.anon)
+        eq_(data['objects'][0]['collection']['apps'], [])
+
+    def test_list_queries(self):
+        self.collection.set_apps([app_factory().pk])
+        self.list(self.anon)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.list(self.anon)
+        for i in xrange(2):
+            collection = Collection.objects.create(**dict(
+                self.collection_data, slug='collection-%s' % i))
+            collection.set_apps([app_factory().pk, app_factory().pk])
+            FeedItem.objects.create(collection=collection)
+        cache.clear()
+        # Not a query more for the new collections and their apps.
+        with self.assertNumQueries(len(queries)):
+            res, data = self.list(self.anon)
+        eq_(data['meta']['total_count'], 3)
+        eq_(sorted(len(item['collection']['apps'])
+                   for item in data['objects']), [1, 2, 2])
+
 
 class TestFeedItemViewSetCreate(CollectionMixin, BaseTestFeedItemViewSet):
     """
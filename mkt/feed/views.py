@@ -1,34 +1,84 @@
-from rest_framework import viewsets
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.encoding import smart_str
+
+from rest_framework import status, viewsets
+from rest_framework.response import Response
 
 from mkt.api.authentication import (RestAnonymousAuthentication,
                                     RestOAuthAuthentication,
                                     RestSharedSecretAuthentication)
 from mkt.api.authorization import AllowReadOnly, AnyOf, GroupPermission
 from mkt.api.base import CORSMixin
+from mkt.carriers import get_carrier
+from mkt.collections.serializers import CollectionMembershipField
 from mkt.collections.views import CollectionImageViewSet
+from mkt.regions import get_region
 
-from .models import FeedApp, FeedItem
+from .models import FeedApp, FeedItem, feed_cache_key
 from .serializers import FeedAppSerializer, FeedItemSerializer
 
 
-class FeedItemViewSet(CORSMixin, viewsets.ModelViewSet):
+class CachedFeedMixin(object):
+    """
+    Caches the list responses served to anonymous users, keyed on the region,
+    carrier and language of the request. The whole cache is invalidated when
+    feed items, feed apps or collections change.
+
+    Responses to authenticated users include per-user data and are never
+    cached.
+    """
+
+    def get_cache_key(self, request):
+        url = hashlib.md5(smart_str(request.build_absolute_uri()))
+        return feed_cache_key(self.__class__.__name__, get_region().slug,
+                              get_carrier() or '', translation.get_language(),
+                              url.hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated():
+            return super(CachedFeedMixin, self).list(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super(CachedFeedMixin, self).list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.CACHE_FEED_API_TIMEOUT)
+        return response
+
+
+class FeedItemViewSet(CORSMixin, CachedFeedMixin, viewsets.ModelViewSet):
     authentication_classes = [RestOAuthAuthentication,
                               RestSharedSecretAuthentication,
                               RestAnonymousAuthentication]
     permission_classes = [AnyOf(AllowReadOnly,
                                 GroupPermission('Feed', 'Curate'))]
-    queryset = FeedItem.objects.all()
+    queryset = FeedItem.objects.transform(FeedItem.transformer)
     cors_allowed_methods = ('get', 'post')
     serializer_class = FeedItemSerializer
 
+    def get_pagination_serializer(self, page):
+        # Fetch the apps of all the collections of the page at once rather
+        # than collection by collection.
+        field = CollectionMembershipField(many=True)
+        field.context = self.get_serializer_context()
+        field.prefetch([item.collection for item in page.object_list
+                        if item.collection_id])
+        return super(FeedItemViewSet, self).get_pagination_serializer(page)
 
-class FeedAppViewSet(CORSMixin, viewsets.ModelViewSet):
+
+class FeedAppViewSet(CORSMixin, CachedFeedMixin, viewsets.ModelViewSet):
     authentication_classes = [RestOAuthAuthentication,
                               RestSharedSecretAuthentication,
                               RestAnonymousAuthentication]
     permission_classes = [AnyOf(AllowReadOnly,
                                 GroupPermission('Feed', 'Curate'))]
-    queryset = FeedApp.objects.all()
+    queryset = FeedApp.objects.transform(FeedApp.transformer)
     cors_allowed_methods = ('get', 'post')
     serializer_class = FeedAppSerializer
 
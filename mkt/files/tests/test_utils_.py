@@ -4,7 +4,7 @@ from nose.tools import eq_
 from django import forms
 
 import amo.tests
-from files.utils import WebAppParser
+from files.utils import inspect_package, WebAppParser
 
 
 class TestWebAppParser(amo.tests.TestCase):
@@ -101,3 +101,28 @@ class TestWebAppParser(amo.tests.TestCase):
         eq_(parsed_results['name'].get('en-US'), 'Blah')
         eq_(parsed_results['name'].get('de'), None)
         eq_(parsed_results['default_locale'], 'en-US')
+
+
+class TestInspectPackage(amo.tests.TestCase):
+
+    def setUp(self):
+        self.package = self.packaged_app_path('mozball.zip')
+
+    def test_inspect(self):
+        info = inspect_package(self.package)
+        assert info['hash'].startswith('sha256:')
+        assert 'name' in WebAppParser.decode_manifest(info['manifest'])
+
+    def test_no_manifest(self):
+        path = self.packaged_app_path('no-manifest-at-root.zip')
+        eq_(inspect_package(path)['manifest'], None)
+        with self.assertRaises(forms.ValidationError):
+            WebAppParser().get_json_data(path)
+
+    def test_cached_by_hash(self):
+        info = inspect_package(self.package)
+        with mock.patch('files.utils.SafeUnzip') as SafeUnzip:
+            eq_(inspect_package(self.package, info['hash']), info)
+            eq_(WebAppParser().get_json_data(self.package, info['hash']),
+                WebAppParser.decode_manifest(info['manifest']))
+        assert not SafeUnzip.called
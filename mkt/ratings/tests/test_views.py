@@ -620,21 +620,54 @@ class TestRatingResourcePagination(RestOAuth, amo.tests.AMOPaths):
         eq_(data['meta']['next'], None)
 
     def test_total_count(self):
-        self.app.update(total_reviews=10)
         res = self.client.get(self.url)
         data = json.loads(res.content)
-
-        # We know we have no results, total_reviews isn't used.
         eq_(data['meta']['total_count'], 0)
 
         Review.objects.create(addon=self.app, user=self.user,
                       version=self.app.current_version,
                       body=u'I häte this app',
                       rating=0)
+        # The denormalized total_reviews of the app isn't used.
         self.app.update(total_reviews=10)
         res = self.client.get(self.url)
         data = json.loads(res.content)
-        eq_(data['meta']['total_count'], 10)
+        eq_(data['meta']['total_count'], 1)
+
+    def test_total_count_filtered(self):
+        other_app = amo.tests.app_factory()
+        for app, user in ((self.app, self.user), (self.app, self.user2),
+                          (other_app, self.user)):
+            Review.objects.create(addon=app, user=user, body=u'Blurp.',
+                                  rating=3)
+        # Only the latest review of a user counts in total_reviews, but the
+        # list includes all of them.
+        Review.objects.create(addon=self.app, user=self.user, body=u'Again.',
+                              rating=4)
+
+        for params, count in (({'app': self.app.pk}, 3),
+                              ({'user': self.user.pk}, 3),
+                              ({'app': self.app.pk, 'user': self.user.pk}, 2),
+                              ({'app': other_app.pk}, 1)):
+            res = self.client.get(self.url, params)
+            data = json.loads(res.content)
+            eq_(data['meta']['total_count'], count)
+            eq_(len(data['objects']), count)
+
+    def test_total_count_adjusted(self):
+        review = Review.objects.create(addon=self.app, user=self.user,
+                                       body=u'Blurp.', rating=3)
+        res = self.client.get(self.url, {'app': self.app.pk})
+        eq_(json.loads(res.content)['meta']['total_count'], 1)
+
+        Review.objects.create(addon=self.app, user=self.user2,
+                              body=u'Blurp.', rating=3)
+        res = self.client.get(self.url, {'app': self.app.pk})
+        eq_(json.loads(res.content)['meta']['total_count'], 2)
+
+        review.delete()
+        res = self.client.get(self.url, {'app': self.app.pk})
+        eq_(json.loads(res.content)['meta']['total_count'], 1)
 
 
 class TestReviewFlagResource(RestOAuth, amo.tests.AMOPaths):
@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.core.paginator import Paginator
 from django.http import Http404
 
@@ -12,7 +14,7 @@ from rest_framework.viewsets import GenericViewSet, ModelViewSet
 import amo
 from access.acl import check_addon_ownership
 from lib.metrics import record_action
-from reviews.models import Review, ReviewFlag
+from reviews.models import Review, ReviewCount, ReviewFlag
 
 from mkt.api.authentication import (RestAnonymousAuthentication,
                                     RestOAuthAuthentication,
@@ -29,15 +31,19 @@ log = commonware.log.getLogger('z.api')
 
 
 class RatingPaginator(Paginator):
-    # FIXME: This is only right when ?app= filtering is applied, if no
-    # filtering or if ?user= filtering is done, it's completely wrong.
-    @property
-    def count(self):
-        try:
-            r = self.object_list[0]
-        except IndexError:
-            return 0
-        return r.addon.total_reviews
+    """
+    Paginator taking its count from the `rating_count` callable the view
+    attaches to the filtered queryset, to avoid COUNT(*) queries over the
+    reviews table.
+    """
+    def _get_count(self):
+        if self._count is None:
+            get_count = getattr(self.object_list, 'rating_count', None)
+            if get_count is None:
+                return super(RatingPaginator, self)._get_count()
+            self._count = get_count()
+        return self._count
+    count = property(_get_count)
 
 
 class RatingViewSet(CORSMixin, MarketplaceView, ModelViewSet):
@@ -79,8 +85,21 @@ class RatingViewSet(CORSMixin, MarketplaceView, ModelViewSet):
 
         if filters:
             queryset = queryset.filter(**filters)
+        queryset.rating_count = partial(self.get_rating_count, queryset,
+                                        **filters)
         return queryset
 
+    def get_rating_count(self, queryset, addon=None, user=None):
+        """
+        Returns the number of ratings in `queryset`, filtered on `addon` and
+        `user`, without a COUNT(*) query when possible.
+        """
+        if addon is not None and user is not None:
+            # Only a handful of ratings, that's a cheap query.
+            return queryset.no_cache().count()
+        return ReviewCount.get(queryset,
+                               addon=getattr(addon, 'pk', None), user=user)
+
     def get_user(self, ident):
         pk = ident
         if pk == 'mine':
@@ -7,6 +7,7 @@ from lib.geoip import GeoIP
 
 import mkt
 from mkt.regions.utils import parse_region
+from mkt.site.middleware import update_user_later
 
 log = commonware.log.getLogger('mkt.regions')
 
@@ -51,8 +52,7 @@ class RegionMiddleware(object):
         # Update the region on the user object if it changed.
         amo_user = getattr(request, 'amo_user', None)
         if amo_user and amo_user.region != user_region.slug:
-            amo_user.region = user_region.slug
-            amo_user.save()
+            update_user_later(request, region=user_region.slug)
 
         # Persist the region on the request / local thread.
         request.REGION = user_region
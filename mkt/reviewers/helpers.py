@@ -75,7 +75,7 @@ def queue_tabnav(context):
     """
     request = context['request']
     counts = context['queue_counts']
-    apps_reviewing = AppsReviewing(request).get_apps()
+    apps_reviewing = AppsReviewing(request).get_app_ids()
 
     # Apps.
     if acl.action_allowed(request, 'Apps', 'Review'):
@@ -1,7 +1,15 @@
 # -*- coding: utf8 -*-
+import time
+
+from django.core.cache import cache
+
+import mock
+from nose.tools import eq_
+
 import amo.tests
 
-from mkt.reviewers.utils import create_sort_link
+from mkt.reviewers.utils import (AppsReviewing, create_sort_link,
+                                 get_reviewers_viewing, review_viewing_key)
 
 
 class TestCreateSortLink(amo.tests.TestCase):
@@ -43,3 +51,37 @@ class TestCreateSortLink(amo.tests.TestCase):
         assert 'sort=name' in link
         assert 'order=asc' in link
         assert 'text_query=Feliz+A%C3%B1o' in link
+
+
+class TestAppsReviewing(amo.tests.TestCase):
+
+    def setUp(self):
+        self.request = mock.Mock()
+        self.request.amo_user.id = 42
+
+    def test_get_reviewers_viewing(self):
+        cache.set(review_viewing_key(1), 42, 60)
+        cache.set(review_viewing_key(2), 43, 60)
+        eq_(get_reviewers_viewing([1, 2, 3]), {1: 42, 2: 43})
+
+    def test_add(self):
+        reviewing = AppsReviewing(self.request)
+        for app_id in (1, 2):
+            cache.set(review_viewing_key(app_id), 42, 60)
+            reviewing.add(app_id)
+        eq_(reviewing.get_app_ids(), [1, 2])
+
+        # Someone else took over.
+        cache.set(review_viewing_key(2), 43, 60)
+        eq_(reviewing.get_app_ids(), [1])
+
+    @mock.patch('mkt.reviewers.utils.cache')
+    def test_cache_calls(self, cache_mock):
+        now = time.time()
+        cache_mock.get.return_value = {1: now + 60, 2: now + 60, 3: now - 1}
+        cache_mock.get_many.return_value = {review_viewing_key(1): 42,
+                                            review_viewing_key(2): 43}
+        eq_(AppsReviewing(self.request).get_app_ids(), [1])
+        eq_(cache_mock.get.call_count, 1)
+        eq_(sorted(cache_mock.get_many.call_args[0][0]),
+            [review_viewing_key(1), review_viewing_key(2)])
@@ -1152,7 +1152,8 @@ class TestReviewTransaction(AttachmentManagementMixin, amo.tests.MockEsMixin,
             reverse('reviewers.apps.review', args=[self.app.app_slug]), data)
         eq_(resp.status_code, 302)
 
-        eq_(self.get_app().status, amo.STATUS_PENDING)
+        # Signing happens in a task, its failure doesn't undo the approval.
+        eq_(self.get_app().status, amo.STATUS_PUBLIC)
 
 
 class TestReviewApp(AppReviewerTest, AccessMixin, AttachmentManagementMixin,
@@ -1503,13 +1504,23 @@ class TestReviewApp(AppReviewerTest, AccessMixin, AttachmentManagementMixin,
         eq_(sign_mock.call_args[0][0], self.get_app().current_version.pk)
 
     @mock.patch('lib.crypto.packaged.sign')
-    def test_require_sig_for_public(self, sign):
+    def test_public_sign_failure(self, sign):
         sign.side_effect = packaged.SigningError
         self.get_app().update(is_packaged=True)
         data = {'action': 'public', 'comments': 'something'}
         data.update(self._attachment_management_form(num=0))
         self.client.post(self.url, data)
-        eq_(self.get_app().status, amo.STATUS_PENDING)
+        # Downloads sign the package on demand if the task failed.
+        eq_(self.get_app().status, amo.STATUS_PUBLIC)
+
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_public_sign_in_progress(self, sign):
+        sign.side_effect = packaged.SigningInProgress
+        self.get_app().update(is_packaged=True)
+        data = {'action': 'public', 'comments': 'something'}
+        data.update(self._attachment_management_form(num=0))
+        self.client.post(self.url, data)
+        eq_(self.get_app().status, amo.STATUS_PUBLIC)
 
     @mock.patch('mkt.webapps.models.Webapp.set_iarc_storefront_data')
     def test_pending_to_public_no_mozilla_contact(self, storefront_mock):
@@ -2746,6 +2757,14 @@ class TestGetSigned(BasePackagedAppTest, amo.tests.TestCase):
         eq_(res.status_code, 200)
         sign_mock.assert_called_with(self.version.pk, reviewer=True)
 
+    @mock.patch('lib.crypto.packaged.sign')
+    def test_reviewer_sign_in_progress(self, sign_mock):
+        sign_mock.side_effect = packaged.SigningInProgress
+        self.setup_files()
+        res = self.client.get(self.url)
+        eq_(res.status_code, 503)
+        eq_(res['Retry-After'], str(settings.SIGNED_APPS_LOCK_WAIT))
+
     @mock.patch.object(packaged, 'sign', mock_sign)
     def test_reviewer(self):
         if not settings.XSENDFILE:
@@ -3187,6 +3206,18 @@ class TestAppsReviewing(AppReviewerTest, AccessMixin):
         res = self.client.get(self.url)
         eq_(len(res.context['apps']), 2)
 
+    def test_queue_viewing(self):
+        self.client.login(username='admin@mozilla.com', password='password')
+        self._view_app(self.apps[0].id)
+        admin = UserProfile.objects.get(email='admin@mozilla.com')
+
+        self.login_as_editor()
+        self._view_app(self.apps[1].id)
+        res = self.client.post(reverse('editors.queue_viewing'), {
+            'addon_ids': ','.join(str(app.id) for app in self.apps)})
+        eq_(json.loads(res.content),
+            {str(self.apps[0].id): admin.display_name})
+
 
 @override_settings(REVIEWER_ATTACHMENTS_PATH=ATTACHMENTS_DIR)
 class TestAttachmentDownload(amo.tests.TestCase):
@@ -1,4 +1,5 @@
 import json
+import time
 import urllib
 from datetime import datetime
 
@@ -22,6 +23,7 @@ from files.models import File
 from mkt.comm.utils import create_comm_note
 from mkt.constants import comm
 from mkt.constants.features import FeatureProfile
+from mkt.features.utils import filter_by_profile
 from mkt.site.helpers import product_as_dict
 from mkt.webapps.models import Webapp
 
@@ -228,7 +230,8 @@ class ReviewApp(ReviewBase):
             # Failsafe.
             return
 
-        self.addon.sign_if_packaged(self.version.pk)
+        # Sign in a task, the package isn't served until it's public anyway.
+        self.addon.presign_if_packaged(self.version.pk)
         self.set_files(amo.STATUS_PUBLIC_WAITING, self.version.files.all())
         if self.addon.status != amo.STATUS_PUBLIC:
             self.set_addon(status=amo.STATUS_PUBLIC_WAITING,
@@ -247,7 +250,8 @@ class ReviewApp(ReviewBase):
             # Failsafe.
             return
 
-        self.addon.sign_if_packaged(self.version.pk)
+        # Sign in a task, downloads sign on demand if it isn't done yet.
+        self.addon.presign_if_packaged(self.version.pk)
         # Save files first, because set_addon checks to make sure there
         # is at least one public file or it won't make the addon public.
         self.set_files(amo.STATUS_PUBLIC, self.version.files.all())
@@ -589,11 +593,27 @@ def create_sort_link(pretty_name, sort_field, get_params, sort, order):
                                         url_class, pretty_name)
 
 
+def review_viewing_key(addon_id):
+    """Cache key holding the id of the reviewer viewing `addon_id`."""
+    return '%s:review_viewing:%s' % (settings.CACHE_PREFIX, addon_id)
+
+
+def get_reviewers_viewing(addon_ids):
+    """
+    Returns a dict mapping the ids of the apps in `addon_ids` that are being
+    reviewed to the id of their reviewer, in a single cache call.
+    """
+    keys = dict((review_viewing_key(id), id) for id in addon_ids)
+    return dict((keys[key], user_id) for key, user_id
+                in cache.get_many(keys.keys()).items() if user_id)
+
+
 class AppsReviewing(object):
     """
     Class to manage the list of apps a reviewer is currently reviewing.
 
-    Data is stored in memcache.
+    Data is stored in memcache: for each reviewer, a dict mapping the ids of
+    the apps they opened to the time the viewing expires.
     """
 
     def __init__(self, request):
@@ -601,35 +621,42 @@ class AppsReviewing(object):
         self.user_id = request.amo_user.id
         self.key = '%s:myapps:%s' % (settings.CACHE_PREFIX, self.user_id)
 
-    def get_apps(self):
-        ids = []
-        my_apps = cache.get(self.key)
-        if my_apps:
-            for id in my_apps.split(','):
-                valid = cache.get(
-                    '%s:review_viewing:%s' % (settings.CACHE_PREFIX, id))
-                if valid and valid == self.user_id:
-                    ids.append(id)
+    def _get_viewing(self):
+        """Returns the apps this reviewer opened and didn't expire yet."""
+        viewing = cache.get(self.key)
+        if not isinstance(viewing, dict):
+            return {}
+        now = time.time()
+        return dict((id, expires) for id, expires in viewing.items()
+                    if expires > now)
+
+    def get_app_ids(self):
+        """Returns the ids of the apps this reviewer is still viewing."""
+        viewing = get_reviewers_viewing(self._get_viewing())
+        return sorted(id for id, user_id in viewing.items()
+                      if user_id == self.user_id)
 
+    def get_apps(self):
         apps = []
-        for app in Webapp.objects.filter(id__in=ids):
-            apps.append({
-                'app': app,
-                'app_attrs': json.dumps(
-                    product_as_dict(self.request, app, False, 'reviewer'),
-                    cls=JSONEncoder),
-            })
+        ids = self.get_app_ids()
+        if ids:
+            for app in Webapp.objects.filter(id__in=ids):
+                apps.append({
+                    'app': app,
+                    'app_attrs': json.dumps(
+                        product_as_dict(self.request, app, False,
+                                        'reviewer'),
+                        cls=JSONEncoder),
+                })
         return apps
 
     def add(self, addon_id):
-        my_apps = cache.get(self.key)
-        if my_apps:
-            apps = my_apps.split(',')
-        else:
-            apps = []
-        apps.append(addon_id)
-        cache.set(self.key, ','.join(map(str, set(apps))),
-                  amo.EDITOR_VIEWING_INTERVAL * 2)
+        # Like the review_viewing keys, keep the app for twice as long as the
+        # ping interval.
+        interval = amo.EDITOR_VIEWING_INTERVAL * 2
+        viewing = self._get_viewing()
+        viewing[int(addon_id)] = time.time() + interval
+        cache.set(self.key, viewing, interval)
 
 
 def device_queue_search(request):
@@ -642,11 +669,8 @@ def device_queue_search(request):
         'status': amo.STATUS_PENDING,
         'disabled_by_user': False,
     }
+    qs = Webapp.objects.filter(**filters)
     sig = request.GET.get('pro')
     if sig:
-        profile = FeatureProfile.from_signature(sig)
-        filters.update(dict(
-            **profile.to_kwargs(prefix='_current_version__features__has_')
-        ))
-    return Webapp.version_and_file_transformer(
-        Webapp.objects.filter(**filters))
+        qs = filter_by_profile(qs, FeatureProfile.from_signature(sig))
+    return Webapp.version_and_file_transformer(qs)
@@ -47,7 +47,7 @@ from editors.models import (EditorSubscription, EscalationQueue, RereviewQueue,
                             ReviewerScore)
 from editors.views import reviewer_required
 from files.models import File
-from lib.crypto.packaged import SigningError
+from lib.crypto.packaged import SigningError, SigningInProgress
 from reviews.forms import ReviewFlagFormSet
 from reviews.models import Review, ReviewFlag
 from reviews.views import translate_review
@@ -70,7 +70,7 @@ from mkt.reviewers.utils import (AppsReviewing, clean_sort_param,
                                  device_queue_search)
 from mkt.search.views import SearchView
 from mkt.search.utils import S
-from mkt.webapps.models import Webapp, WebappIndexer
+from mkt.webapps.models import get_manifests, Webapp, WebappIndexer
 
 from mkt.comm.forms import CommAttachmentFormSet
 
@@ -471,6 +471,12 @@ def _queue(request, apps, tab, pager_processor=None, date_sort='created',
     per_page = request.GET.get('per_page', QUEUE_PER_PAGE)
     pager = paginate(request, apps, per_page)
 
+    # Load the manifests needed to tell which apps are privileged at once.
+    get_manifests(a.app.latest_version.all_files[0]
+                  for a in pager.object_list
+                  if a.app.is_packaged and a.app.latest_version and
+                  a.app.latest_version.all_files)
+
     ctx = {
         'addons': pager.object_list,
         'pager': pager,
@@ -901,7 +907,12 @@ def app_abuse(request, addon):
 def get_signed_packaged(request, addon, version_id):
     version = get_object_or_404(addon.versions, pk=version_id)
     file = version.all_files[0]
-    path = addon.sign_if_packaged(version.pk, reviewer=True)
+    try:
+        path = addon.sign_if_packaged(version.pk, reviewer=True)
+    except SigningInProgress:
+        response = http.HttpResponse(status=503)
+        response['Retry-After'] = settings.SIGNED_APPS_LOCK_WAIT
+        return response
     if not path:
         raise http.Http404
     log.info('Returning signed package addon: %s, version: %s, path: %s' %
@@ -1,6 +1,8 @@
+from collections import namedtuple
 from datetime import datetime
 
 from django.conf import settings
+from django.utils.datastructures import SortedDict
 
 from rest_framework import serializers
 
@@ -8,17 +10,20 @@ import amo
 from addons.models import Category, Preview
 from amo.helpers import absolutify
 from amo.urlresolvers import reverse
+from amo.utils import no_translation
 from constants.applications import DEVICE_TYPES
 from versions.models import Version
 
 import mkt
-from mkt.api.fields import ESTranslationSerializerField
+from mkt.api.fields import (ESTranslationSerializerField, LargeTextField,
+                            ReverseChoiceField)
 from mkt.submit.serializers import SimplePreviewSerializer
-from mkt.webapps.models import Geodata, Webapp
+from mkt.webapps.models import AddonExcludedRegion, Geodata, Webapp
 from mkt.webapps.utils import (dehydrate_content_rating,
                                dehydrate_descriptors,
                                dehydrate_interactives)
-from mkt.webapps.serializers import AppSerializer, SimpleAppSerializer
+from mkt.webapps.serializers import (AppSerializer, RegionSerializer,
+                                     SimpleAppSerializer)
 
 
 class ESAppSerializer(AppSerializer):
@@ -190,6 +195,299 @@ class SimpleESAppSerializer(ESAppSerializer):
         pass
 
 
+def _app_fields(meta):
+    """The fields an ES app serializer using `meta` outputs, in order."""
+    exclude = getattr(meta, 'exclude', None) or []
+    return [f for f in meta.fields if f not in exclude and f != 'upsold']
+
+
+# What the hyperlinked fields need to reverse their URL.
+_Hit = namedtuple('_Hit', 'pk')
+
+# Generic conversion DRF applies to CharField, SerializerMethodField etc.
+_native = serializers.Field().to_native
+
+
+class FastESAppSerializer(serializers.Serializer):
+    """
+    Produces the same output as ESAppSerializer, but directly from the ES
+    `_source` instead of building a fake Webapp (and its versions, previews,
+    categories...) for every hit.
+
+    Only premium apps (for the price) and requests from a logged in user (for
+    the user info) still hit the database, exactly like ESAppSerializer.
+    """
+    app_fields = _app_fields(ESAppSerializer.Meta)
+
+    # Fields we reuse to convert values the same way ESAppSerializer does.
+    banner_message = ESTranslationSerializerField()
+    created = serializers.DateField()
+    description = ESTranslationSerializerField()
+    homepage = ESTranslationSerializerField()
+    name = ESTranslationSerializerField()
+    premium_type = ReverseChoiceField(choices_dict=amo.ADDON_PREMIUM_API)
+    privacy_policy = LargeTextField(view_name='app-privacy-policy-detail',
+                                    read_only=True)
+    release_notes = ESTranslationSerializerField()
+    resource_uri = serializers.HyperlinkedIdentityField(view_name='app-detail')
+    reviewed = serializers.DateField()
+    support_email = ESTranslationSerializerField()
+    support_url = ESTranslationSerializerField()
+
+    def __init__(self, *args, **kwargs):
+        super(FastESAppSerializer, self).__init__(*args, **kwargs)
+        self._fields_initialized = False
+        self._regions = {}
+
+    @property
+    def data(self):
+        if self._data is None:
+            if self.many:
+                self._data = [self.to_native(item) for item in self.object]
+            else:
+                self._data = self.to_native(self.object)
+        return self._data
+
+    def field_to_native(self, obj, field_name):
+        # Like ESAppSerializer, iterate on the page without calling .all().
+        return [self.to_native(item) for item in obj.object_list]
+
+    @amo.cached_property
+    def app_serializer(self):
+        # Used for the few fields that need a real Webapp and the database.
+        return AppSerializer(context=self.context)
+
+    def to_native(self, obj):
+        if not self._fields_initialized:
+            for field_name, field in self.fields.items():
+                field.initialize(parent=self, field_name=field_name)
+            self._fields_initialized = True
+
+        data = obj._source
+        self._app = None
+        ret = SortedDict()
+        for field_name in self.app_fields:
+            ret[field_name] = getattr(self, 'get_%s' % field_name)(data)
+        return ret
+
+    def get_app(self, data):
+        """A bare Webapp for the current hit, built only when needed."""
+        if self._app is None:
+            self._app = Webapp(id=data['id'], type=amo.ADDON_WEBAPP,
+                               premium_type=data.get('premium_type'))
+        return self._app
+
+    def is_premium(self, data):
+        return data.get('premium_type') in amo.ADDON_PREMIUMS
+
+    def get_translation(self, data, field_name, source_name=None):
+        return self.fields[field_name].es_field_to_native(
+            data, source_name or field_name)
+
+    def get_absolute_url(self, data):
+        return _native(absolutify(reverse('detail', args=[data['app_slug']])))
+
+    def get_app_type(self, data):
+        return _native(amo.ADDON_WEBAPP_TYPES[data['app_type']])
+
+    def get_author(self, data):
+        return _native(data['author'])
+
+    def get_banner_message(self, data):
+        return self.get_translation(data, 'banner_message')
+
+    def get_banner_regions(self, data):
+        # ESAppSerializer never exposed the banner regions stored in ES.
+        return []
+
+    def get_categories(self, data):
+        return list(data['category'])
+
+    def get_content_ratings(self, data):
+        body = (mkt.regions.REGION_TO_RATINGS_BODY().get(
+            self.context['request'].REGION.slug, 'generic'))
+        return _native({
+            'body': body,
+            'rating': dehydrate_content_rating(
+                (data.get('content_ratings') or {}).get(body)) or None,
+            'descriptors': dehydrate_descriptors(
+                data.get('content_descriptors', {})).get(body, []),
+            'interactives': dehydrate_interactives(
+                data.get('interactive_elements', [])),
+        })
+
+    def get_created(self, data):
+        return self.fields['created'].to_native(data.get('created'))
+
+    def get_current_version(self, data):
+        return _native(data['current_version'])
+
+    def get_default_locale(self, data):
+        return _native(data.get('default_locale'))
+
+    def get_description(self, data):
+        return self.get_translation(data, 'description')
+
+    def get_device_types(self, data):
+        with no_translation():
+            device_types = [DEVICE_TYPES[d].api_name for d in data['device']]
+        return _native(device_types)
+
+    def get_homepage(self, data):
+        return self.get_translation(data, 'homepage')
+
+    def get_icons(self, data):
+        # Same as Addon.get_icon_url() for an app with an uploaded png icon.
+        suffix = data.get('icon_hash') or 'never'
+        return _native(dict(
+            (size, Webapp.get_uploaded_icon_url(data['id'], size, suffix))
+            for size in (16, 48, 64, 128)))
+
+    def get_id(self, data):
+        return _native(data['id'])
+
+    def get_is_offline(self, data):
+        return _native(data.get('is_offline'))
+
+    def get_is_packaged(self, data):
+        return data['app_type'] != amo.ADDON_WEBAPP_HOSTED
+
+    def get_manifest_url(self, data):
+        return _native(data.get('manifest_url'))
+
+    def get_name(self, data):
+        return self.get_translation(data, 'name')
+
+    def get_payment_account(self, data):
+        if not self.is_premium(data):
+            return None
+        return _native(
+            self.app_serializer.get_payment_account(self.get_app(data)))
+
+    def get_payment_required(self, data):
+        if not self.is_premium(data):
+            return False
+        return _native(
+            self.app_serializer.get_payment_required(self.get_app(data)))
+
+    def get_premium_type(self, data):
+        return self.fields['premium_type'].to_native(data.get('premium_type'))
+
+    def get_preview_url(self, preview, url_template):
+        return Preview.get_image_url(url_template, preview['id'],
+                                     preview['modified'], preview['filetype'])
+
+    def get_previews(self, data):
+        return [SortedDict([
+            ('image_url', _native(
+                self.get_preview_url(p, settings.PREVIEW_FULL_URL))),
+            ('thumbnail_url', _native(
+                self.get_preview_url(p, settings.PREVIEW_THUMBNAIL_URL))),
+        ]) for p in data['previews']]
+
+    def get_price(self, data):
+        if not self.is_premium(data):
+            return None
+        return _native(self.app_serializer.get_price(self.get_app(data)))
+
+    def get_price_locale(self, data):
+        if not self.is_premium(data):
+            return None
+        return _native(
+            self.app_serializer.get_price_locale(self.get_app(data)))
+
+    def get_privacy_policy(self, data):
+        return self.fields['privacy_policy'].to_native(_Hit(data['id']))
+
+    def get_public_stats(self, data):
+        return _native(data['has_public_stats'])
+
+    def get_ratings(self, data):
+        return _native(data.get('ratings', {}))
+
+    def get_region(self, region_id):
+        # The serialized regions only depend on the request, reuse them.
+        if region_id not in self._regions:
+            self._regions[region_id] = RegionSerializer().to_native(
+                mkt.regions.REGIONS_CHOICES_ID_DICT[region_id])
+        return self._regions[region_id]
+
+    def get_regions(self, data):
+        excluded = data['region_exclusions']
+        region_ids = sorted(set(mkt.regions.ALL_REGION_IDS) -
+                            set(excluded or []))
+        if not region_ids:
+            # Webapp.get_regions() looks the exclusions up again in that case.
+            excluded = AddonExcludedRegion.objects.filter(
+                addon=data['id']).values_list('region', flat=True)
+            region_ids = sorted(set(mkt.regions.ALL_REGION_IDS) -
+                                set(excluded))
+        regions = [mkt.regions.REGIONS_CHOICES_ID_DICT[region_id]
+                   for region_id in region_ids]
+        return [self.get_region(region.id)
+                for region in sorted(regions, key=lambda x: x.slug)]
+
+    def get_release_notes(self, data):
+        return self.get_translation(data, 'release_notes')
+
+    def get_resource_uri(self, data):
+        return self.fields['resource_uri'].field_to_native(_Hit(data['id']),
+                                                           'resource_uri')
+
+    def get_reviewed(self, data):
+        return self.fields['reviewed'].to_native(data.get('reviewed'))
+
+    def get_slug(self, data):
+        return _native(data['app_slug'])
+
+    def get_status(self, data):
+        return _native(data.get('status'))
+
+    def get_support_email(self, data):
+        return self.get_translation(data, 'support_email')
+
+    def get_support_url(self, data):
+        return self.get_translation(data, 'support_url')
+
+    def get_supported_locales(self, data):
+        locs = data['supported_locales']
+        if locs:
+            locs = locs.split(',') if isinstance(locs, basestring) else locs
+        return _native(locs or [])
+
+    def get_tags(self, data):
+        return _native(data['tags'])
+
+    def get_upsell(self, data):
+        upsell = data.get('upsell', False)
+        if upsell:
+            region_id = self.context['request'].REGION.id
+            exclusions = upsell.get('region_exclusions')
+            if exclusions is not None and region_id not in exclusions:
+                upsell = dict(upsell, resource_uri=reverse('app-detail',
+                    kwargs={'pk': upsell['id']}))
+            else:
+                upsell = False
+        return _native(upsell)
+
+    def get_user(self, data):
+        if getattr(self.context.get('request'), 'amo_user', None):
+            return _native(
+                self.app_serializer.get_user_info(self.get_app(data)))
+
+    def get_versions(self, data):
+        return _native(dict((v['version'], v['resource_uri'])
+                            for v in data['versions']))
+
+    def get_weekly_downloads(self, data):
+        if data['has_public_stats']:
+            return _native(data.get('weekly_downloads'))
+
+
+class SimpleFastESAppSerializer(FastESAppSerializer):
+    app_fields = _app_fields(SimpleESAppSerializer.Meta)
+
+
 class SuggestionsESAppSerializer(ESAppSerializer):
     icon = serializers.SerializerMethodField('get_icon')
 
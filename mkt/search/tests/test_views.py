@@ -13,7 +13,8 @@ from nose.tools import eq_, ok_
 import amo
 import mkt
 from access.middleware import ACLMiddleware
-from addons.models import AddonCategory, AddonDeviceType, AddonUpsell, Category
+from addons.models import (AddonCategory, AddonDeviceType,
+                           AddonRecommendation, AddonUpsell, Category)
 from amo.helpers import absolutify
 from amo.tests import app_factory, ESTestCase, TestCase, user_factory
 from amo.urlresolvers import reverse
@@ -683,6 +684,46 @@ class TestApi(RestOAuth, ESTestCase):
         eq_(data['meta']['offset'], 2)
         eq_(data['meta']['next'], None)
 
+    def test_cursor_pagination(self):
+        Webapp.objects.get(pk=337141).delete()
+        app1 = app_factory(name='test app test1')
+        app2 = app_factory(name='test app test2')
+        app3 = app_factory(name='test app test3')
+        # The last two are tied, and sorted by id.
+        app1.update(created=self.days_ago(1))
+        created = self.days_ago(2)
+        app2.update(created=created)
+        app3.update(created=created)
+        self.refresh('webapp')
+
+        res = self.client.get(self.url, data={'limit': '2', 'sort': 'created',
+                                              'cursor': ''})
+        eq_(res.status_code, 200)
+        data = json.loads(res.content)
+        eq_([int(o['id']) for o in data['objects']], [app1.id, app2.id])
+        eq_(data['meta']['offset'], None)
+        eq_(data['meta']['previous'], None)
+
+        next = urlparse(data['meta']['next'])
+        eq_(next.path, self.url)
+        params = QueryDict(next.query).dict()
+        eq_(sorted(params.keys()), ['cursor', 'limit', 'sort'])
+
+        res = self.client.get(self.url, params)
+        eq_(res.status_code, 200)
+        data = json.loads(res.content)
+        eq_([int(o['id']) for o in data['objects']], [app3.id])
+        eq_(data['meta']['next'], None)
+
+    def test_cursor_pagination_relevance(self):
+        res = self.client.get(self.url, data={'q': 'something', 'cursor': ''})
+        eq_(res.status_code, 400)
+
+    def test_cursor_pagination_invalid(self):
+        res = self.client.get(self.url, data={'sort': 'created',
+                                              'cursor': 'nope'})
+        eq_(res.status_code, 400)
+
     def test_content_ratings_reindex(self):
         self.webapp.set_content_ratings({
             mkt.ratingsbodies.GENERIC: mkt.ratingsbodies.GENERIC_18
@@ -1068,6 +1109,49 @@ class TestSuggestionsApi(ESTestCase):
         eq_(parsed[1], [unicode(self.app2.name)])
 
 
+class TestRecommendationsApi(ESTestCase):
+
+    def setUp(self):
+        self.app = app_factory()
+        self.others = [app_factory() for i in range(2)]
+        for score, other in zip([0.5, 0.25], self.others):
+            AddonRecommendation.objects.create(addon=self.app,
+                                               other_addon=other, score=score)
+        for app in [self.app] + self.others:
+            app.save()
+        self.refresh('webapp')
+        self.url = reverse('app-recommendations', args=[self.app.pk])
+        self.client = RestOAuthClient(None)
+
+    def tearDown(self):
+        ids = [app.id for app in [self.app] + self.others]
+        Webapp.objects.filter(id__in=ids).delete()
+        unindex_webapps(ids)
+
+    def test_recommendations(self):
+        res = self.client.get(self.url)
+        eq_(res.status_code, 200)
+        eq_([app['id'] for app in json.loads(res.content)['objects']],
+            [other.id for other in self.others])
+
+    def test_not_public_excluded(self):
+        self.others[0].update(status=amo.STATUS_PENDING)
+        self.refresh('webapp')
+        res = self.client.get(self.url)
+        eq_([app['id'] for app in json.loads(res.content)['objects']],
+            [self.others[1].id])
+
+    def test_no_recommendations(self):
+        res = self.client.get(
+            reverse('app-recommendations', args=[self.others[0].pk]))
+        eq_(res.status_code, 200)
+        eq_(json.loads(res.content)['objects'], [])
+
+    def test_404(self):
+        res = self.client.get(reverse('app-recommendations', args=[999999]))
+        eq_(res.status_code, 404)
+
+
 class TestRocketbarApi(ESTestCase):
     fixtures = fixture('user_2519', 'webapp_337141')
 
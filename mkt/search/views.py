@@ -1,7 +1,7 @@
 from __future__ import absolute_import
 import json
 
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -14,17 +14,18 @@ from search.views import _get_locale_analyzer
 from mkt.api.authentication import (RestSharedSecretAuthentication,
                                     RestOAuthAuthentication)
 from mkt.api.base import CORSMixin, form_errors, MarketplaceView
-from mkt.api.paginator import ESPaginator
+from mkt.api.paginator import ESCursorPaginator, ESPaginator
 from mkt.collections.constants import (COLLECTIONS_TYPE_BASIC,
                                        COLLECTIONS_TYPE_FEATURED,
                                        COLLECTIONS_TYPE_OPERATOR)
 from mkt.collections.filters import CollectionFilterSetWithFallback
 from mkt.collections.models import Collection
 from mkt.collections.serializers import CollectionSerializer
-from mkt.features.utils import get_feature_profile
+from mkt.features.utils import filter_by_profile_es, get_feature_profile
 from mkt.search.forms import (ApiSearchForm, DEVICE_CHOICES_IDS,
                               TARAKO_CATEGORIES_MAPPING)
-from mkt.search.serializers import (ESAppSerializer, RocketbarESAppSerializer,
+from mkt.search.serializers import (FastESAppSerializer,
+                                    RocketbarESAppSerializer,
                                     SuggestionsESAppSerializer)
 from mkt.search.utils import S
 from mkt.webapps.models import Webapp, WebappIndexer
@@ -184,7 +185,7 @@ def _filter_search(request, qs, query, filters=None, sorting=None,
 
     if profile:
         # Exclude apps that require any features we don't support.
-        qs = qs.filter(**profile.to_kwargs(prefix='features.has_'))
+        qs = filter_by_profile_es(qs, profile)
 
     return qs
 
@@ -194,9 +195,10 @@ class SearchView(CORSMixin, MarketplaceView, GenericAPIView):
     authentication_classes = [RestSharedSecretAuthentication,
                               RestOAuthAuthentication]
     permission_classes = [AllowAny]
-    serializer_class = ESAppSerializer
+    serializer_class = FastESAppSerializer
     form_class = ApiSearchForm
     paginator_class = ESPaginator
+    cursor_paginator_class = ESCursorPaginator
 
     def search(self, request):
         form_data = self.get_search_data(request)
@@ -308,6 +310,40 @@ class SuggestionsView(SearchView):
                             content_type='application/x-suggestions+json')
 
 
+class RecommendationsView(SearchView):
+    """
+    Apps installed by the same users as the app with id `pk`, best first.
+
+    The recommended ids are read from the app's document, see
+    `update_app_recommendations`.
+    """
+    cors_allowed_methods = ['get']
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            doc = (S(WebappIndexer).filter(id=pk)
+                   .values_dict('recommendations')[0])
+        except IndexError:
+            raise Http404
+
+        ids = doc.get('recommendations') or []
+        if not isinstance(ids, list):
+            # ES returns single-valued fields without the list.
+            ids = [ids]
+
+        apps = {}
+        if ids:
+            region = self.get_region_from_request(request)
+            qs = self.get_query(request, region=region).filter(id__in=ids)
+            apps = dict((app['id'], app)
+                        for app in qs[:len(ids)].values_dict())
+        serializer = self.get_serializer(
+            [apps[id_] for id_ in ids if id_ in apps], many=True)
+        return Response({'objects': serializer.data})
+
+
 class RocketbarView(SearchView):
     cors_allowed_methods = ['get']
     authentication_classes = []
@@ -95,6 +95,8 @@ MIDDLEWARE_CLASSES += [
     'mkt.api.middleware.RestOAuthMiddleware',
     'mkt.api.middleware.RestSharedSecretMiddleware',
     'access.middleware.ACLMiddleware',
+    # Before the middlewares changing the user, so it writes after them.
+    'mkt.site.middleware.UserUpdateMiddleware',
     'mkt.site.middleware.LocaleMiddleware',
     'mkt.regions.middleware.RegionMiddleware',
     'mkt.site.middleware.DeviceDetectionMiddleware',
@@ -107,6 +109,14 @@ MIDDLEWARE_CLASSES += [
     'mkt.api.middleware.APIFilterMiddleware',
 ]
 
+# How often, in seconds, the region and language of a user detected by the
+# middlewares can be written, see mkt.site.middleware.UserUpdateMiddleware.
+USER_UPDATE_INTERVAL = 60 * 5
+
+# How many parsed app manifests each process keeps around in memory, see
+# mkt.webapps.models.get_manifests.
+MANIFEST_CACHE_SIZE = 500
+
 TEMPLATE_DIRS += (path('mkt/templates'), path('mkt/zadmin/templates'))
 TEMPLATE_CONTEXT_PROCESSORS = list(TEMPLATE_CONTEXT_PROCESSORS)
 TEMPLATE_CONTEXT_PROCESSORS.remove('amo.context_processors.global_settings')
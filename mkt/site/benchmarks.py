@@ -0,0 +1,289 @@
+"""
+Benchmarks of the hot code paths of the Marketplace.
+
+Each benchmark performs one request (or receipt verification) against a
+catalogue created by `seed_catalogue`, while `measure` records the number of
+database queries, the number of Elasticsearch round trips and the latency.
+
+The `benchmark_api` management command runs them on a synthetic catalogue to
+compare runs, the tests in `mkt.site.tests.test_benchmarks` check that their
+query counts don't grow with the catalogue.
+"""
+import json
+import random
+import time
+import urlparse
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.client import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+import elasticutils
+import pyelasticsearch
+
+import amo
+from access.models import Group, GroupUser
+from lib.post_request_task.task import _send_tasks
+from mkt.collections.constants import COLLECTIONS_TYPE_BASIC
+from mkt.collections.models import Collection
+from mkt.feed.models import FeedItem
+from mkt.receipts.utils import create_receipt
+from mkt.webapps.models import Installed, WebappIndexer
+from reviews.models import Review
+from services import verify
+
+
+BENCHMARK_PASSWORD = 'password'
+
+
+# The catalogue the benchmarks run against, see `seed_catalogue`.
+Catalogue = namedtuple('Catalogue', 'apps users reviewer collection installs')
+
+
+class Benchmark(object):
+    """
+    A hot code path to measure.
+
+    `run` is called with a `Client` and the `Catalogue` and performs a single
+    request. `uses_es` tells whether it needs Elasticsearch, `reviewer`
+    whether it needs a logged in reviewer.
+    """
+
+    def __init__(self, name, run, uses_es=False, reviewer=False):
+        self.name = name
+        self.run = run
+        self.uses_es = uses_es
+        self.reviewer = reviewer
+
+    def __repr__(self):
+        return '<Benchmark: %s>' % self.name
+
+
+def _app_detail(client, catalogue):
+    return client.get(reverse('app-detail',
+                              kwargs={'pk': catalogue.apps[0].pk}))
+
+
+def _search(client, catalogue):
+    return client.get(reverse('search-api'), {'q': 'app'})
+
+
+def _featured(client, catalogue):
+    return client.get(reverse('featured-search-api'))
+
+
+def _feed(client, catalogue):
+    return client.get(reverse('api-v2:feeditems-list'))
+
+
+def _ratings(client, catalogue):
+    return client.get(reverse('ratings-list'),
+                      {'app': catalogue.apps[0].pk})
+
+
+def _reviewer_queue(client, catalogue):
+    return client.get(reverse('reviewers.apps.queue_pending'))
+
+
+# Signing isn't part of the verification, only do it once per install.
+_receipts = {}
+
+
+def _receipt_verify(client, catalogue):
+    installed = catalogue.installs[0]
+    if installed.uuid not in _receipts:
+        _receipts[installed.uuid] = create_receipt(
+            installed.addon, installed.user, installed.uuid)
+    receipt = _receipts[installed.uuid]
+    path = urlparse.urlparse(settings.WEBAPPS_RECEIPT_URL).path
+    check = verify.Verify(receipt, RequestFactory().get(path).META)
+    # Use the Django connection so the queries get counted.
+    check.cursor = connection.cursor()
+    return check.check_full()
+
+
+BENCHMARKS = [
+    Benchmark('app_detail', _app_detail),
+    Benchmark('search', _search, uses_es=True),
+    Benchmark('featured', _featured, uses_es=True),
+    Benchmark('feed', _feed),
+    Benchmark('ratings_list', _ratings),
+    Benchmark('reviewer_queue', _reviewer_queue, reviewer=True),
+    Benchmark('receipt_verify', _receipt_verify),
+]
+
+
+def seed_catalogue(apps=1000, users=100, ratings=5, installs=5,
+                   collections=20, pending=10, seed=0):
+    """
+    Creates a synthetic catalogue of `apps` public apps (and `pending` more
+    waiting for review), rated and installed by `ratings` and `installs` of
+    the `users` users, and `collections` collections of up to 20 apps hung off
+    the feed.
+
+    The same arguments always create the same catalogue, so that runs can be
+    compared. Catalogues with different seeds can be added to the same
+    database.
+    """
+    # Those helpers are only meant for tests and benchmarks, don't import them
+    # with the rest of the module.
+    from amo.tests import app_factory, user_factory
+
+    rand = random.Random(seed)
+    user_list = [user_factory() for i in xrange(users)]
+    reviewer = user_factory()
+    reviewer.set_password(BENCHMARK_PASSWORD)
+    reviewer.save()
+    group, _ = Group.objects.get_or_create(name='Benchmark Reviewers',
+                                           rules='Apps:Review')
+    GroupUser.objects.create(group=group, user=reviewer)
+
+    app_list = [app_factory(name='Benchmark app %s' % i)
+                for i in xrange(apps)]
+    for i in xrange(pending):
+        app_factory(name='Benchmark pending app %s' % i,
+                    status=amo.STATUS_PENDING)
+
+    install_list = []
+    for app in app_list:
+        for user in rand.sample(user_list, min(ratings, users)):
+            Review.objects.create(addon=app, user=user,
+                                  rating=rand.randint(1, 5),
+                                  body='Benchmark review')
+        for user in rand.sample(user_list, min(installs, users)):
+            install_list.append(Installed.objects.create(addon=app,
+                                                         user=user))
+
+    collection_list = []
+    for i in xrange(collections):
+        collection = Collection.objects.create(
+            collection_type=COLLECTIONS_TYPE_BASIC, is_public=True,
+            name='Benchmark collection %s' % i,
+            slug='benchmark-collection-%s-%s' % (seed, i))
+        collection.set_apps([app.pk for app in
+                             rand.sample(app_list, min(20, apps))])
+        FeedItem.objects.create(collection=collection)
+        collection_list.append(collection)
+
+    # Index everything now rather than at the end of a request.
+    _send_tasks()
+    return Catalogue(apps=app_list, users=user_list, reviewer=reviewer,
+                     collection=collection_list[0] if collection_list
+                     else None, installs=install_list)
+
+
+def setup_es_indexes(prefix='benchmark_'):
+    """
+    Points the Elasticsearch indexes to empty `prefix`ed ones, so that
+    benchmarks never touch the real indexes.
+    """
+    es = elasticutils.get_es(timeout=settings.ES_TIMEOUT)
+    for key, index in settings.ES_INDEXES.items():
+        if not index.startswith(prefix):
+            settings.ES_INDEXES[key] = prefix + index
+        try:
+            es.delete_index(settings.ES_INDEXES[key])
+        except pyelasticsearch.ElasticHttpNotFoundError:
+            pass
+    WebappIndexer.setup_mapping()
+
+
+def refresh_es_indexes():
+    """Makes everything indexed so far searchable."""
+    es = elasticutils.get_es(timeout=settings.ES_TIMEOUT)
+    for index in set(settings.ES_INDEXES.values()):
+        es.refresh(index)
+
+
+class _CountESRequests(object):
+    """Counts the Elasticsearch round trips made while it's active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        # Keep the plain function, to put it back as it was.
+        self.original = pyelasticsearch.ElasticSearch.__dict__['send_request']
+        original = self.original
+
+        def send_request(es, *args, **kwargs):
+            self.count += 1
+            return original(es, *args, **kwargs)
+
+        pyelasticsearch.ElasticSearch.send_request = send_request
+        return self
+
+    def __exit__(self, *args):
+        pyelasticsearch.ElasticSearch.send_request = self.original
+
+
+def percentile(values, percent):
+    """Returns the nearest-rank `percent` percentile of `values`."""
+    values = sorted(values)
+    index = max(0, int(round(percent / 100.0 * len(values))) - 1)
+    return values[index]
+
+
+def measure(benchmark, catalogue, repeat=20, client=None):
+    """
+    Runs `benchmark` once to warm it up, once with an empty cache, then
+    `repeat` more times. Returns the query and Elasticsearch round trip counts
+    of the cold run, and the latency percentiles of all the timed runs in
+    milliseconds.
+    """
+    if client is None:
+        client = Client()
+        if benchmark.reviewer:
+            client.login(username=catalogue.reviewer.email,
+                         password=BENCHMARK_PASSWORD)
+
+    # Don't count the signing of the receipt, for instance.
+    benchmark.run(client, catalogue)
+
+    timings = []
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        with _CountESRequests() as es:
+            start = time.time()
+            benchmark.run(client, catalogue)
+            timings.append(time.time() - start)
+
+    for i in xrange(repeat):
+        start = time.time()
+        benchmark.run(client, catalogue)
+        timings.append(time.time() - start)
+
+    return {
+        'queries': len(queries),
+        'es': es.count,
+        'p50': percentile(timings, 50) * 1000,
+        'p90': percentile(timings, 90) * 1000,
+        'p99': percentile(timings, 99) * 1000,
+        'runs': len(timings),
+    }
+
+
+def compare(previous, current):
+    """
+    Returns the lines describing how the `current` results differ from the
+    `previous` ones, as written by `dump_results`.
+    """
+    lines = []
+    for name in sorted(current):
+        if name not in previous:
+            continue
+        for key in ('queries', 'es', 'p50', 'p90', 'p99'):
+            before, after = previous[name][key], current[name][key]
+            if before != after:
+                lines.append('%s %s: %s -> %s (%+.1f)' % (
+                    name, key, round(before, 1), round(after, 1),
+                    after - before))
+    return lines
+
+
+def dump_results(results, fileobj):
+    json.dump(results, fileobj, indent=2, sort_keys=True)
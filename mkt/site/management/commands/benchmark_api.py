@@ -0,0 +1,104 @@
+import json
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (override_settings, setup_test_environment,
+                               teardown_test_environment)
+
+from mkt.site.benchmarks import (BENCHMARKS, compare, dump_results, measure,
+                                 refresh_es_indexes, seed_catalogue,
+                                 setup_es_indexes)
+
+
+class Command(BaseCommand):
+    """
+    Seeds a synthetic catalogue into a fresh test database (and test
+    Elasticsearch indexes) and measures the query counts, Elasticsearch round
+    trips and latency percentiles of the hot endpoints.
+
+    The catalogue only depends on the options, so results of runs with the
+    same options can be compared with --compare.
+    """
+    option_list = BaseCommand.option_list + (
+        make_option('--apps', action='store', type='int', default=1000,
+                    dest='apps', help='Number of apps, default: %default'),
+        make_option('--users', action='store', type='int', default=100,
+                    dest='users', help='Number of users, default: %default'),
+        make_option('--collections', action='store', type='int', default=20,
+                    dest='collections',
+                    help='Number of collections, default: %default'),
+        make_option('--repeat', action='store', type='int', default=20,
+                    dest='repeat',
+                    help='Timed runs per endpoint, default: %default'),
+        make_option('--seed', action='store', type='int', default=0,
+                    dest='seed', help='Random seed, default: %default'),
+        make_option('--only', action='store', type='string', dest='only',
+                    help='Comma separated names of the benchmarks to run.'),
+        make_option('--no-es', action='store_false', dest='es', default=True,
+                    help="Skip the benchmarks that need Elasticsearch."),
+        make_option('--output', action='store', type='string', dest='output',
+                    help='Write the results as JSON to this file.'),
+        make_option('--compare', action='store', type='string',
+                    dest='compare',
+                    help='Compare the results with this previous output.'),
+    )
+
+    def handle(self, *args, **options):
+        benchmarks = BENCHMARKS
+        if options.get('only'):
+            names = options['only'].split(',')
+            benchmarks = [b for b in BENCHMARKS if b.name in names]
+            if len(benchmarks) != len(names):
+                raise CommandError('Unknown benchmarks, pick from: %s' %
+                                   ', '.join(b.name for b in BENCHMARKS))
+        if not options['es']:
+            benchmarks = [b for b in benchmarks if not b.uses_es]
+
+        previous = None
+        if options.get('compare'):
+            with open(options['compare']) as f:
+                previous = json.load(f)
+
+        # Those helpers are only meant for tests and benchmarks, don't import
+        # them with the rest of the module.
+        from amo.tests import start_es_mock, stop_es_mock
+
+        setup_test_environment()
+        old_name = settings.DATABASES['default']['NAME']
+        connection.creation.create_test_db(verbosity=0)
+        try:
+            if options['es']:
+                setup_es_indexes()
+            else:
+                # The apps get indexed as they are created, make sure that
+                # never reaches the real indexes.
+                start_es_mock()
+            print 'Seeding the catalogue...'
+            # Index the apps as they get created.
+            with override_settings(CELERY_ALWAYS_EAGER=True):
+                catalogue = seed_catalogue(apps=options['apps'],
+                                           users=options['users'],
+                                           collections=options['collections'],
+                                           seed=options['seed'])
+            if options['es']:
+                refresh_es_indexes()
+            results = {}
+            for benchmark in benchmarks:
+                results[benchmark.name] = measure(benchmark, catalogue,
+                                                  repeat=options['repeat'])
+                print ('%(name)s: %(queries)s queries, %(es)s ES requests, '
+                       'p50 %(p50).1fms, p90 %(p90).1fms, p99 %(p99).1fms' %
+                       dict(results[benchmark.name], name=benchmark.name))
+        finally:
+            if not options['es']:
+                stop_es_mock()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if previous is not None:
+            print '\n'.join(compare(previous, results) or ['No changes.'])
+        if options.get('output'):
+            with open(options['output'], 'w') as f:
+                dump_results(results, f)
@@ -2,6 +2,7 @@ from types import MethodType
 
 from django import http
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest, SimpleCookie
 from django.utils.cache import (get_max_age, patch_cache_control,
                                 patch_response_headers, patch_vary_headers)
@@ -12,6 +13,7 @@ from django_statsd.clients import statsd
 import amo
 from amo.urlresolvers import lang_from_accept_header, Prefixer
 from amo.utils import urlparams
+from users.models import UserProfile
 
 import mkt
 import mkt.constants
@@ -122,6 +124,43 @@ class RedirectPrefixedURIMiddleware(object):
             return http.HttpResponseRedirect(urlparams(new_path, **new_qs))
 
 
+def update_user_later(request, **fields):
+    """
+    Sets `fields` on `request.amo_user` right away, but only writes them
+    to the database once the response is ready, see `UserUpdateMiddleware`.
+    """
+    for field, value in fields.items():
+        setattr(request.amo_user, field, value)
+    if not hasattr(request, 'USER_UPDATES'):
+        request.USER_UPDATES = {}
+    request.USER_UPDATES.update(fields)
+
+
+class UserUpdateMiddleware(object):
+    """
+    Writes the fields changed with `update_user_later` during the request in
+    a single UPDATE, without saving the whole user.
+
+    Users are written at most once every `USER_UPDATE_INTERVAL` seconds, the
+    changes made in between are dropped: they're seen again and written on a
+    later request.
+    """
+
+    def process_response(self, request, response):
+        fields = getattr(request, 'USER_UPDATES', None)
+        if not fields:
+            return response
+
+        user = request.amo_user
+        key = 'user-update:%s' % user.pk
+        if cache.add(key, 1, settings.USER_UPDATE_INTERVAL):
+            UserProfile.objects.filter(pk=user.pk).update(**fields)
+            UserProfile.objects.invalidate(user)
+        else:
+            statsd.incr('z.users.update.skipped')
+        return response
+
+
 def get_accept_language(request):
     a_l = request.META.get('HTTP_ACCEPT_LANGUAGE', '')
     return lang_from_accept_header(a_l)
@@ -164,8 +203,7 @@ class LocaleMiddleware(object):
             request.LANG_COOKIE = ','.join([lang, ov_lang])
         if (getattr(request, 'amo_user', None)
             and request.amo_user.lang != lang):
-            request.amo_user.lang = lang
-            request.amo_user.save()
+            update_user_later(request, lang=lang)
         request.LANG = lang
         tower.activate(lang)
 
@@ -0,0 +1,98 @@
+from django.conf import settings
+
+import mock
+from nose.tools import eq_
+
+import amo.tests
+from mkt.site.benchmarks import (BENCHMARKS, compare, measure, percentile,
+                                 seed_catalogue)
+from services import utils
+
+
+class QueryScalingMixin(object):
+
+    def setUp(self):
+        super(QueryScalingMixin, self).setUp()
+        self.catalogue = seed_catalogue(apps=3, users=10, ratings=2,
+                                        installs=2, collections=1, pending=2)
+
+    def seed_more(self):
+        """Adds a catalogue twice as big, with more of everything."""
+        return seed_catalogue(apps=6, users=10, ratings=4, installs=2,
+                              collections=2, pending=4, seed=1)
+
+    def check_scaling(self, name):
+        """
+        Checks that `name` makes as many queries and Elasticsearch requests
+        with twice as many apps, ratings, collections and pending apps, which
+        is how N+1 queries get caught.
+        """
+        benchmark = [b for b in BENCHMARKS if b.name == name][0]
+        before = measure(benchmark, self.catalogue, repeat=0)
+        after = measure(benchmark, self.seed_more(), repeat=0)
+        eq_(after['queries'], before['queries'],
+            '%s made %s queries instead of %s on a bigger catalogue.' % (
+                name, after['queries'], before['queries']))
+        eq_(after['es'], before['es'],
+            '%s made %s ES requests instead of %s on a bigger catalogue.' % (
+                name, after['es'], before['es']))
+
+
+class TestQueryScaling(QueryScalingMixin, amo.tests.TestCase):
+
+    def test_app_detail(self):
+        self.check_scaling('app_detail')
+
+    def test_feed(self):
+        self.check_scaling('feed')
+
+    def test_ratings_list(self):
+        self.check_scaling('ratings_list')
+
+    def test_reviewer_queue(self):
+        self.check_scaling('reviewer_queue')
+
+    @mock.patch.object(settings, 'WEBAPPS_RECEIPT_KEY',
+                       amo.tests.AMOPaths.sample_key())
+    @mock.patch.object(settings, 'WEBAPPS_RECEIPT_URL', 'http://foo.com')
+    @mock.patch.object(utils.settings, 'WEBAPPS_RECEIPT_KEY',
+                       amo.tests.AMOPaths.sample_key())
+    @mock.patch.object(utils.settings, 'WEBAPPS_RECEIPT_URL', 'http://foo.com')
+    def test_receipt_verify(self):
+        self.check_scaling('receipt_verify')
+
+
+class TestESQueryScaling(QueryScalingMixin, amo.tests.ESTestCase):
+
+    def setUp(self):
+        super(TestESQueryScaling, self).setUp()
+        self.refresh()
+
+    def seed_more(self):
+        catalogue = super(TestESQueryScaling, self).seed_more()
+        self.refresh()
+        return catalogue
+
+    def test_search(self):
+        self.check_scaling('search')
+
+    def test_featured(self):
+        self.check_scaling('featured')
+
+
+class TestResults(amo.tests.TestCase):
+
+    def test_percentile(self):
+        values = range(1, 101)
+        eq_(percentile(values, 50), 50)
+        eq_(percentile(values, 99), 99)
+        eq_(percentile([3, 1, 2], 50), 2)
+        eq_(percentile([1], 90), 1)
+
+    def test_compare(self):
+        result = {'queries': 10, 'es': 1, 'p50': 5.0, 'p90': 8.0, 'p99': 9.0}
+        eq_(compare({'search': result}, {'search': result}), [])
+        eq_(compare({'search': result},
+                    {'search': dict(result, queries=12)}),
+            ['search queries: 10.0 -> 12.0 (+2.0)'])
+        eq_(compare({}, {'search': result}), [])
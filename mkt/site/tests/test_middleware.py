@@ -253,6 +253,21 @@ class TestLocaleMiddlewarePersistence(amo.tests.TestCase):
         self.client.get('/robots.txt', HTTP_ACCEPT_LANGUAGE='de')
         eq_(UserProfile.objects.get(pk=999).lang, 'de')
 
+    def test_save_lang_rate_limited(self):
+        self.client.login(username='regular@mozilla.com', password='password')
+        self.client.get('/robots.txt', HTTP_ACCEPT_LANGUAGE='de')
+        self.client.get('/robots.txt', HTTP_ACCEPT_LANGUAGE='fr')
+        # The second change is dropped, it'll be written later.
+        eq_(UserProfile.objects.get(pk=999).lang, 'de')
+
+    @mock.patch.object(UserProfile, 'save')
+    def test_save_lang_no_save(self, save):
+        self.client.login(username='regular@mozilla.com', password='password')
+        save.reset_mock()
+        self.client.get('/robots.txt', HTTP_ACCEPT_LANGUAGE='de')
+        eq_(UserProfile.objects.get(pk=999).lang, 'de')
+        assert not save.called
+
 
 class TestVaryMiddleware(amo.tests.TestCase):
 
@@ -4,17 +4,24 @@ import stat
 import time
 
 from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count
 
 import commonware.log
 import cronjobs
-from celery import chord
+import multidb
 
 import amo
+from addons.models import AddonRecommendation
+from amo.decorators import write
 from amo.utils import chunked
+from lib import recommend
+
+from mkt.constants.apps import INSTALL_TYPE_USER
 
 from .models import Installed, Webapp
-from .tasks import (dump_user_installs, update_downloads, update_trending,
-                    zip_users)
+from .tasks import (dump_all_user_installs, index_webapps, update_downloads,
+                    update_trending)
 
 
 log = commonware.log.getLogger('z.cron')
@@ -55,27 +62,11 @@ def update_app_trending():
 
 
 @cronjobs.register
-def dump_user_installs_cron():
+def dump_user_installs_cron(resume=False):
     """
-    Sets up tasks to do user install dumps.
+    Dumps user installs. Pass `resume` to continue an interrupted dump.
     """
-    chunk_size = 100
-    # Get valid users to dump.
-    user_ids = set(Installed.objects.filter(addon__type=amo.ADDON_WEBAPP)
-                   .values_list('user', flat=True))
-
-    # Remove old dump data before running.
-    user_dir = os.path.join(settings.DUMPED_USERS_PATH, 'users')
-    if os.path.exists(user_dir):
-        shutil.rmtree(user_dir)
-
-    grouping = []
-    for chunk in chunked(user_ids, chunk_size):
-        grouping.append(dump_user_installs.subtask(args=[chunk]))
-
-    post = zip_users.subtask(immutable=True)
-    ts = chord(grouping, post)
-    ts.apply_async()
+    dump_all_user_installs.delay(resume=bool(resume))
 
 
 @cronjobs.register
@@ -97,3 +88,87 @@ def update_app_downloads():
     for ids in chunked(all_ids, chunk_size):
         update_downloads.delay(ids, countdown=countdown)
         countdown += seconds_between
+
+
+def _app_install_counts(min_installs=3):
+    """
+    Returns a dict of {app_id: number of users who installed it} for public
+    apps.
+    """
+    counts = (Installed.objects
+              .filter(install_type=INSTALL_TYPE_USER,
+                      addon__status=amo.STATUS_PUBLIC,
+                      addon__disabled_by_user=False)
+              .values('addon').annotate(users=Count('user', distinct=True))
+              # Like the add-on recs, skip apps with too few installs since
+              # we'd be overfitting recommendations to exactly what those
+              # users installed.
+              .filter(users__gt=min_installs))
+    return dict((c['addon'], c['users']) for c in counts)
+
+
+def _app_co_installs(apps, counts):
+    """
+    Returns a dict of {app_id: {other_app_id: number of users who installed
+    both}} for each app of `apps`, counting only the apps in `counts`.
+    """
+    cursor = connections[multidb.get_slave()].cursor()
+    cursor.execute("""
+        SELECT a.addon_id, b.addon_id, COUNT(DISTINCT a.user_id)
+        FROM users_install a
+        INNER JOIN users_install b ON a.user_id=b.user_id
+        WHERE a.addon_id IN %s AND a.install_type=%s AND b.install_type=%s
+        GROUP BY a.addon_id, b.addon_id
+    """, [apps, INSTALL_TYPE_USER, INSTALL_TYPE_USER])
+    common = dict((app, {}) for app in apps)
+    for app, other, users in cursor.fetchall():
+        if other in counts:
+            common[app][other] = users
+    return common
+
+
+@write
+@transaction.commit_on_success
+def _dump_app_recs(sims):
+    """Replace the recommendations of each app in `sims`."""
+    AddonRecommendation.objects.filter(addon__in=sims.keys()).delete()
+    AddonRecommendation.objects.bulk_create([
+        AddonRecommendation(addon_id=app, other_addon_id=other, score=score)
+        for app, others in sims.iteritems() for other, score in others])
+
+
+@cronjobs.register
+def update_app_recommendations():
+    """
+    Build app-to-app recommendations from install co-occurrence.
+
+    Two apps are similar when the same users installed them, scored like the
+    add-on recommendations from collections. The top apps are stored in the
+    addon_recommendations table and indexed with each app.
+
+    Only the install counts of all the apps are kept in memory, the users
+    shared with other apps are counted by the database one chunk of apps at a
+    time.
+    """
+    start = time.time()
+    counts = _app_install_counts()
+    log.info('%.2fs (installs) : %s apps' % (time.time() - start,
+                                             len(counts)))
+
+    # Apps that are no longer public or lost their installs keep no
+    # recommendations.
+    stale = set(AddonRecommendation.objects
+                .filter(addon__type=amo.ADDON_WEBAPP).order_by()
+                .values_list('addon', flat=True).distinct()) - set(counts)
+    for ids in chunked(sorted(stale), 100):
+        _dump_app_recs(dict((app, []) for app in ids))
+        index_webapps.delay(ids)
+
+    by_size = sorted(counts, key=counts.get)
+    for ids in chunked(sorted(counts), 100):
+        common = _app_co_installs(ids, counts)
+        _dump_app_recs(dict(
+            (app, recommend.top_similar(app, common[app], counts, by_size))
+            for app in ids))
+        index_webapps.delay(ids)
+    log.info('%.2fs (recommendations)' % (time.time() - start))
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import copy
 import datetime
 import hashlib
 import json
@@ -14,7 +15,7 @@ from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.files.storage import default_storage as storage
 from django.core.urlresolvers import NoReverseMatch
-from django.db import models
+from django.db import connection, models
 from django.db.models import Max, Min, Q, signals as dbsignals
 from django.dispatch import receiver
 
@@ -29,15 +30,17 @@ import amo
 import amo.models
 from access.acl import action_allowed, check_reviewer
 from addons import query
-from addons.models import (Addon, AddonDeviceType, AddonUpsell,
-                           attach_categories, attach_devices, attach_prices,
-                           attach_tags, attach_translations, Category)
+from addons.models import (Addon, AddonDeviceType, AddonRecommendation,
+                           AddonUpsell, attach_categories, attach_devices,
+                           attach_prices, attach_tags, attach_translations,
+                           Category)
 from addons.signals import version_changed
 from amo.decorators import skip_cache, write
 from amo.helpers import absolutify
 from amo.storage_utils import copy_stored_file
 from amo.urlresolvers import reverse
-from amo.utils import JSONEncoder, smart_path, to_language, urlparams
+from amo.utils import (JSONEncoder, LRUCache, smart_path, to_language,
+                       urlparams)
 from constants.applications import DEVICE_GAIA, DEVICE_TYPES
 from constants.payments import PROVIDER_CHOICES
 from files.models import File, nfd_str, Platform
@@ -220,8 +223,49 @@ class Webapp(Addon):
             apps_dict[adt.addon_id]._device_types.append(
                 DEVICE_TYPES[adt.device_type])
 
-        # FIXME: attach geodata and content ratings. Maybe in a different
-        # transformer that would then be called automatically for the API ?
+    @staticmethod
+    def api_transformer(apps):
+        """
+        Attaches what the API serializers need on top of `transformer`:
+        geodata, content ratings, descriptors, interactive elements, excluded
+        regions, upsells and versions, in a fixed number of queries.
+        """
+        if not apps:
+            return
+        apps_dict = dict((a.id, a) for a in apps)
+
+        # Caching None makes the reverse one-to-one relations raise
+        # DoesNotExist instead of querying again.
+        for model, name in ((Geodata, '_geodata'),
+                            (RatingDescriptors, 'rating_descriptors'),
+                            (RatingInteractives, 'rating_interactives')):
+            related = dict((obj.addon_id, obj) for obj in
+                           model.objects.filter(addon__in=apps_dict))
+            related_object = Addon._meta.get_field_by_name(name)[0]
+            cache_name = related_object.get_cache_name()
+            for app in apps:
+                setattr(app, cache_name, related.get(app.id))
+
+        content_ratings = defaultdict(list)
+        for cr in ContentRating.objects.filter(addon__in=apps_dict):
+            content_ratings[cr.addon_id].append(cr)
+
+        excluded = defaultdict(list)
+        for addon_id, region in (AddonExcludedRegion.objects
+                                 .filter(addon__in=apps_dict)
+                                 .values_list('addon', 'region')):
+            excluded[addon_id].append(region)
+
+        upsells = dict((upsell.free_id, upsell) for upsell in
+                       AddonUpsell.objects.filter(free__in=apps_dict))
+
+        for app in apps:
+            app._content_ratings = content_ratings[app.id]
+            app._excluded_region_ids = excluded[app.id]
+            # `upsell` is a read-only cached property, fill its cache.
+            app.__dict__['upsell'] = upsells.get(app.id)
+
+        Webapp.version_and_file_transformer(apps)
 
     @staticmethod
     def version_and_file_transformer(apps):
@@ -384,18 +428,7 @@ class Webapp(Addon):
         if not file_:
             return
 
-        try:
-            return file_.version.manifest
-        except AppManifest.DoesNotExist:
-            # TODO: Remove this when we're satisified the above is working.
-            log.info('Falling back to loading manifest from file system. '
-                     'Webapp:%s File:%s' % (self.id, file_.id))
-            if file_.status == amo.STATUS_DISABLED:
-                file_path = file_.guarded_file_path
-            else:
-                file_path = file_.file_path
-
-            return WebAppParser().get_json_data(file_path)
+        return get_manifests([file_])[file_.id]
 
     def manifest_updated(self, manifest, upload):
         """The manifest has updated, update the version and file.
@@ -756,6 +789,8 @@ class Webapp(Addon):
             all_ids = mkt.regions.ALL_REGION_IDS
         else:
             all_ids = mkt.regions.REGION_IDS
+        if excluded is None:
+            excluded = getattr(self, '_excluded_region_ids', None)
         if excluded is None:
             excluded = list(self.addonexcludedregion
                                 .values_list('region', flat=True))
@@ -772,8 +807,11 @@ class Webapp(Addon):
 
         Note: free and in-app are not included in this.
         """
-        excluded = set(self.addonexcludedregion
-                           .values_list('region', flat=True))
+        if hasattr(self, '_excluded_region_ids'):
+            excluded = set(self._excluded_region_ids)
+        else:
+            excluded = set(self.addonexcludedregion
+                               .values_list('region', flat=True))
 
         if self.is_premium():
             all_regions = set(mkt.regions.ALL_REGION_IDS)
@@ -931,21 +969,55 @@ class Webapp(Addon):
                 'release_notes': version.releasenotes,
                 'package_path': package_path,
             }
-            for key in ['developer', 'icons', 'locales']:
-                if key in manifest:
-                    data[key] = manifest[key]
+            for field in ['developer', 'icons', 'locales']:
+                if field in manifest:
+                    data[field] = manifest[field]
 
         data = json.dumps(data, cls=JSONEncoder)
 
         cache.set(key, data, None)
+        # The ETag depends on the manifest, have it computed again.
+        cache.delete(self._manifest_etag_key())
 
         return data
 
+    def _manifest_etag_key(self):
+        return 'webapp:{0}:manifest:etag'.format(self.pk)
+
+    def get_manifest_etag(self):
+        """
+        Returns the ETag of the "mini" manifest, which covers the manifest
+        and the hash of the latest package.
+
+        The ETag is cached alongside the manifest, along with the package
+        hash it was computed for, so that it doesn't have to be recomputed
+        on every request.
+        """
+        package_file = self.get_latest_file()
+        package_hash = package_file.hash if package_file else ''
+
+        key = self._manifest_etag_key()
+        cached = cache.get(key)
+        if cached and cached[0] == package_hash:
+            return cached[1]
+
+        manifest_etag = hashlib.sha256()
+        manifest_etag.update(self.get_cached_manifest())
+        manifest_etag.update(package_hash)
+        manifest_etag = manifest_etag.hexdigest()
+        cache.set(key, (package_hash, manifest_etag), None)
+        return manifest_etag
+
     def sign_if_packaged(self, version_pk, reviewer=False):
         if not self.is_packaged:
             return
         return packaged.sign(version_pk, reviewer=reviewer)
 
+    def presign_if_packaged(self, version_pk):
+        """Queue the signing of a version instead of waiting for it."""
+        if self.is_packaged:
+            packaged.sign_eagerly(version_pk)
+
     def assign_uuid(self):
         """Generates a UUID if self.guid is not already set."""
         if not self.guid:
@@ -997,7 +1069,7 @@ class Webapp(Addon):
         f.size = storage.size(f.file_path)
         f.hash = f.generate_hash(f.file_path)
         f.save()
-        mf = WebAppParser().get_json_data(f.file_path)
+        mf = WebAppParser().get_json_data(f.file_path, f.hash)
         AppManifest.objects.create(version=v, manifest=json.dumps(mf))
         self.sign_if_packaged(v.pk)
         self.status = amo.STATUS_BLOCKED
@@ -1136,7 +1208,11 @@ class Webapp(Addon):
               rating classes) to fetch and translate later.
         """
         content_ratings = {}
-        for cr in self.content_ratings.all():
+        if hasattr(self, '_content_ratings'):
+            ratings = self._content_ratings
+        else:
+            ratings = self.content_ratings.all()
+        for cr in ratings:
             body = cr.get_body()
             rating_serialized = {
                 'body': body.id,
@@ -1260,11 +1336,33 @@ class Webapp(Addon):
         log.info('IARC setting content ratings for app:%s:%s' %
                  (self.id, self.app_slug))
 
+        # Look up the existing ratings once, then write them in bulk: one
+        # INSERT for the new bodies and one UPDATE per distinct rating.
+        existing = dict((cr.ratings_body, cr) for cr in
+                        ContentRating.objects.no_cache().filter(addon=self))
+        to_create = []
+        to_update = defaultdict(list)
         for ratings_body, rating in data.items():
-            cr, created = self.content_ratings.safer_get_or_create(
-                ratings_body=ratings_body.id, defaults={'rating': rating.id})
-            if not created:
-                cr.update(rating=rating.id, modified=datetime.datetime.now())
+            if ratings_body.id in existing:
+                to_update[rating.id].append(ratings_body.id)
+            else:
+                to_create.append(ContentRating(
+                    addon=self, ratings_body=ratings_body.id,
+                    rating=rating.id))
+
+        if to_create:
+            ContentRating.objects.bulk_create(to_create)
+        now = datetime.datetime.now()
+        for rating_id, bodies in to_update.items():
+            ContentRating.objects.filter(
+                addon=self, ratings_body__in=bodies).update(
+                    rating=rating_id, modified=now)
+        if existing:
+            ContentRating.objects.invalidate(*existing.values())
+        # Neither bulk_create() nor update() send post_save, do what
+        # update_status_content_ratings() would have done.
+        if self.has_incomplete_status() and self.is_fully_complete():
+            self.update(status=amo.STATUS_PENDING)
 
         log.info('IARC content ratings set for app:%s:%s' %
                  (self.id, self.app_slug))
@@ -1585,12 +1683,6 @@ class WebappIndexer(MappingType, Indexable):
                     'description': {'type': 'string',
                                     'analyzer': 'default_icu'},
                     'device': {'type': 'byte'},
-                    'features': {
-                        'type': 'object',
-                        'properties': dict(
-                            ('has_%s' % f.lower(), {'type': 'boolean'})
-                            for f in APP_FEATURES)
-                    },
                     'has_public_stats': {'type': 'boolean'},
                     'icon_hash': {'type': 'string',
                                   'index': 'not_analyzed'},
@@ -1639,7 +1731,10 @@ class WebappIndexer(MappingType, Indexable):
                             'count': {'type': 'short'},
                         }
                     },
+                    'recommendations': {'type': 'long', 'index': 'no'},
                     'region_exclusions': {'type': 'short'},
+                    'required_features': {'type': 'string',
+                                          'index': 'not_analyzed'},
                     'reviewed': {'format': 'dateOptionalTime', 'type': 'date'},
                     'status': {'type': 'byte'},
                     'supported_locales': {'type': 'string',
@@ -1721,8 +1816,7 @@ class WebappIndexer(MappingType, Indexable):
         latest_version = obj.latest_version
         version = obj.current_version
         geodata = obj.geodata
-        features = (version.features.to_dict()
-                    if version else AppFeatures().to_dict())
+        features = version.features.to_keys() if version else []
         is_escalated = obj.escalationqueue_set.exists()
 
         try:
@@ -1756,7 +1850,6 @@ class WebappIndexer(MappingType, Indexable):
         d['description'] = list(
             set(string for _, string in obj.translations[obj.description_id]))
         d['device'] = getattr(obj, 'device_ids', [])
-        d['features'] = features
         d['has_public_stats'] = obj.public_stats
         d['icon_hash'] = obj.icon_hash
         d['interactive_elements'] = obj.get_interactives_slugs()
@@ -1795,7 +1888,14 @@ class WebappIndexer(MappingType, Indexable):
             'average': obj.average_rating,
             'count': obj.total_reviews,
         }
+        # Apps installed by the same users, best first. See
+        # `update_app_recommendations`.
+        d['recommendations'] = list(
+            AddonRecommendation.objects.filter(addon=obj)
+            .order_by('-score').values_list('other_addon', flat=True))
         d['region_exclusions'] = obj.get_excluded_region_ids()
+        # Strip `has_` to match the keys of `FeatureProfile`.
+        d['required_features'] = [f[4:] for f in features]
         d['reviewed'] = obj.versions.filter(
             deleted=False).aggregate(Min('reviewed')).get('reviewed__min')
         if version:
@@ -2056,6 +2156,26 @@ class AddonExcludedRegion(amo.models.ModelBase):
     def get_region(self):
         return mkt.regions.REGIONS_CHOICES_ID_DICT.get(self.region)
 
+    @classmethod
+    def exclude_many(cls, addon_ids, region_ids):
+        """
+        Exclude all the apps in `addon_ids` from all the regions in
+        `region_ids` in one INSERT IGNORE, existing exclusions are left alone.
+
+        This doesn't send post_save, call `clear_excluded_in_cache` once all
+        the exclusions are written.
+        """
+        now = datetime.datetime.now()
+        rows = [(now, now, addon_id, region_id)
+                for addon_id in addon_ids for region_id in region_ids]
+        if not rows:
+            return
+        cursor = connection.cursor()
+        cursor.executemany("""
+            INSERT IGNORE INTO addons_excluded_regions
+                (created, modified, addon_id, region)
+            VALUES (%s, %s, %s, %s)""", rows)
+
 
 @memoize(prefix='get_excluded_in')
 def get_excluded_in(region_id):
@@ -2086,9 +2206,13 @@ def get_excluded_in(region_id):
           dispatch_uid='clean_memoized_exclusions')
 def clean_memoized_exclusions(sender, **kw):
     if not kw.get('raw'):
-        for k in mkt.regions.ALL_REGION_IDS:
-            cache.delete_many([memoize_key('get_excluded_in', k)
-                               for k in mkt.regions.ALL_REGION_IDS])
+        clear_excluded_in_cache()
+
+
+def clear_excluded_in_cache():
+    """Forget the memoized `get_excluded_in` of every region."""
+    cache.delete_many([memoize_key('get_excluded_in', k)
+                       for k in mkt.regions.ALL_REGION_IDS])
 
 
 class IARCInfo(amo.models.ModelBase):
@@ -2328,6 +2452,70 @@ class AppManifest(amo.models.ModelBase):
         db_table = 'app_manifest'
 
 
+# The manifests most recently parsed by this process, in front of memcached.
+parsed_manifests = LRUCache(settings.MANIFEST_CACHE_SIZE)
+
+
+def _manifest_key(version_id):
+    return 'webapps:manifest:{0}'.format(version_id)
+
+
+def get_manifests(files):
+    """
+    Returns the parsed manifests of the versions of `files`, as a dict keyed by
+    file id. Versions without a stored manifest get an empty dict.
+
+    Manifests are cached along with the hash of the package they come from,
+    so they are parsed again as soon as the package changes. They are looked
+    up in this process first, then in memcached, and the remaining ones are
+    fetched from the database in a single query.
+    """
+    files = [f for f in files if f]
+    parsed = {}
+    missing = {}
+    for file_ in files:
+        key = _manifest_key(file_.version_id)
+        cached = parsed_manifests.get(key)
+        if cached and cached[0] == file_.hash:
+            parsed[file_.version_id] = cached[1]
+        else:
+            missing[key] = file_
+
+    if missing:
+        for key, cached in cache.get_many(missing.keys()).items():
+            if cached[0] == missing[key].hash:
+                parsed_manifests.set(key, cached)
+                parsed[missing.pop(key).version_id] = cached[1]
+
+    if missing:
+        stored = dict(AppManifest.objects.no_cache()
+                      .filter(version__in=[f.version_id
+                                           for f in missing.values()])
+                      .values_list('version', 'manifest'))
+        to_cache = {}
+        for key, file_ in missing.items():
+            manifest = stored.get(file_.version_id)
+            manifest = json.loads(manifest) if manifest else {}
+            to_cache[key] = (file_.hash, manifest)
+            parsed_manifests.set(key, to_cache[key])
+            parsed[file_.version_id] = manifest
+        cache.set_many(to_cache, None)
+
+    # Callers are free to modify what they get, keep the cached ones intact.
+    return dict((f.id, copy.deepcopy(parsed[f.version_id])) for f in files)
+
+
+@receiver(dbsignals.post_save, sender=AppManifest,
+          dispatch_uid='appmanifest.invalidate')
+@receiver(dbsignals.post_delete, sender=AppManifest,
+          dispatch_uid='appmanifest.invalidate.delete')
+def invalidate_manifest(sender, instance, **kw):
+    """Forget the parsed manifest of the version of `instance`."""
+    key = _manifest_key(instance.version_id)
+    parsed_manifests.delete(key)
+    cache.delete(key)
+
+
 class RegionListField(json_field.JSONField):
     def to_python(self, value):
         value = super(RegionListField, self).to_python(value)
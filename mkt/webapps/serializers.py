@@ -221,12 +221,18 @@ class AppSerializer(serializers.ModelSerializer):
             }
 
     def get_versions(self, app):
-        # Disable transforms, we only need two fields: version and pk.
-        # Unfortunately, cache-machine gets in the way so we can't use .only()
-        # (.no_transforms() is ignored, defeating the purpose), and we can't use
-        # .values() / .values_list() because those aren't cached :(
+        # Use the versions attached by Webapp.api_transformer if any.
+        if hasattr(app, 'all_versions'):
+            versions = app.all_versions
+        else:
+            # Disable transforms, we only need two fields: version and pk.
+            # Unfortunately, cache-machine gets in the way so we can't use
+            # .only() (.no_transforms() is ignored, defeating the purpose),
+            # and we can't use .values() / .values_list() because those aren't
+            # cached :(
+            versions = app.versions.all().no_transforms()
         return dict((v.version, reverse('version-detail', kwargs={'pk': v.pk}))
-                    for v in app.versions.all().no_transforms())
+                    for v in versions)
 
     def get_weekly_downloads(self, app):
         if app.public_stats:
@@ -1,14 +1,22 @@
 import datetime
 import hashlib
+import itertools
 import json
 import logging
 import os
 import shutil
 import subprocess
+import sys
+import tarfile
 import time
+import urlparse
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
+from operator import itemgetter
 
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.core.files.storage import default_storage as storage
 from django.template import Context, loader
 
@@ -23,13 +31,12 @@ from test_utils import RequestFactory
 from tower import ugettext as _
 
 import amo
-from addons.models import Addon
 from amo.decorators import use_master, write
 from amo.helpers import absolutify
 from amo.urlresolvers import reverse
 from amo.utils import chunked, days_ago, JSONEncoder, send_mail_jinja
 from editors.models import RereviewQueue
-from files.models import FileUpload
+from files.models import File, FileUpload
 from files.utils import WebAppParser
 from lib.es.utils import get_indices
 from lib.metrics import get_monolith_client
@@ -41,11 +48,14 @@ import mkt
 from mkt.constants.regions import RESTOFWORLD
 from mkt.developers.tasks import (_fetch_manifest, fetch_icon, pngcrush_image,
                                   resize_preview, validator)
-from mkt.webapps.models import AppManifest, Webapp, WebappIndexer
+from mkt.webapps.models import (AppManifest, get_manifests, Installed,
+                                Webapp, WebappIndexer)
 from mkt.webapps.utils import get_locale_properties
 
 
 task_log = logging.getLogger('z.task')
+dump_user_installs_limits = settings.CELERY_TIME_LIMITS[
+    'mkt.webapps.tasks.dump_all_user_installs']
 
 
 def _get_content_hash(content):
@@ -71,8 +81,10 @@ def update_manifests(ids, **kw):
     # we'll need to log in as user.
     amo.set_user(get_task_user())
 
+    fetched = _fetch_manifests(ids, check_hash)
     for id in ids:
-        _update_manifest(id, check_hash, retries)
+        if id in fetched:
+            _update_manifest(id, check_hash, retries, fetched[id])
     if retries:
         try:
             update_manifests.retry(args=(retries.keys(),),
@@ -87,6 +99,85 @@ def update_manifests(ids, **kw):
     return retries
 
 
+def _manifest_validators_key(id):
+    return 'webapp:{0}:manifest:validators'.format(id)
+
+
+def _fetch_app_manifest(id, url, file_hash, check_hash):
+    """
+    Fetches the manifest of the app `id`, returns `(content, exc_info)`.
+
+    Unless `check_hash` is False, the request is conditional on the validators
+    of the previous response, provided its content is the one `file_hash` was
+    computed from. `content` is None when the manifest didn't change.
+    """
+    key = _manifest_validators_key(id)
+    validators = {}
+    if check_hash:
+        cached = cache.get(key)
+        if cached and cached[0] == file_hash:
+            validators = dict(cached[1])
+
+    try:
+        content = _fetch_manifest(url, validators=validators)
+    except Exception:
+        return None, sys.exc_info()
+
+    if content is not None:
+        cache.set(key, (_get_content_hash(content), validators), None)
+    return content, None
+
+
+def _fetch_manifests(ids, check_hash):
+    """
+    Fetches the manifests of the apps `ids` concurrently, returns
+    `{id: (content, exc_info)}` for the apps whose manifest has to be updated.
+
+    At most settings.MANIFEST_FETCH_CONCURRENCY manifests are fetched at once,
+    and no more than settings.MANIFEST_FETCH_PER_HOST from the same host.
+    """
+    urls = dict(Webapp.objects.filter(id__in=ids)
+                              .values_list('id', 'manifest_url'))
+    # The hash of the latest file of each app, ignoring those without files.
+    hashes = {}
+    for id, hash_ in (File.objects.filter(version__addon__in=urls.keys(),
+                                          version__deleted=False)
+                                  .order_by('version__created', 'created')
+                                  .values_list('version__addon', 'hash')):
+        hashes[id] = hash_
+
+    # Apps on the same host are fetched one after the other, in as many
+    # lanes as that host is allowed concurrent requests.
+    hosts = defaultdict(list)
+    for id in hashes:
+        hosts[urlparse.urlparse(urls[id] or '').netloc].append(id)
+    per_host = settings.MANIFEST_FETCH_PER_HOST
+    lanes = [host_ids[i::per_host] for host_ids in hosts.values()
+             for i in range(min(per_host, len(host_ids)))]
+
+    def fetch(lane):
+        return [(id, _fetch_app_manifest(id, urls[id], hashes[id],
+                                         check_hash))
+                for id in lane]
+
+    pool = ThreadPool(min(settings.MANIFEST_FETCH_CONCURRENCY, len(lanes))
+                      or 1)
+    try:
+        results = pool.map(fetch, lanes)
+    finally:
+        pool.close()
+        pool.join()
+
+    fetched = {}
+    for id, (content, exc_info) in (r for lane in results for r in lane):
+        if exc_info is None and (content is None or (
+                check_hash and _get_content_hash(content) == hashes[id])):
+            _log(id, u'Manifest the same')
+            continue
+        fetched[id] = content, exc_info
+    return fetched
+
+
 def notify_developers_of_failure(app, error_message, has_link=False):
     if (app.status not in amo.WEBAPPS_APPROVED_STATUSES or
         RereviewQueue.objects.filter(addon=app).exists()):
@@ -115,7 +206,13 @@ def notify_developers_of_failure(app, error_message, has_link=False):
                             context, recipient_list=to)
 
 
-def _update_manifest(id, check_hash, failed_fetches):
+def _update_manifest(id, check_hash, failed_fetches, fetched=None):
+    """
+    Updates the app `id` from its hosted manifest.
+
+    `fetched` is what `_fetch_app_manifest` returned if the manifest has
+    already been fetched, it's fetched here otherwise.
+    """
     webapp = Webapp.objects.get(pk=id)
     version = webapp.versions.latest()
     file_ = version.files.latest()
@@ -125,12 +222,15 @@ def _update_manifest(id, check_hash, failed_fetches):
         _log(webapp, u'Ignoring, no existing file')
         return
 
-    # Fetch manifest, catching and logging any exception.
-    try:
-        content = _fetch_manifest(webapp.manifest_url)
-    except Exception, e:
+    if fetched is None:
+        fetched = _fetch_app_manifest(id, webapp.manifest_url, file_.hash,
+                                      check_hash)
+    content, exc_info = fetched
+
+    # Log any exception which occurred while fetching the manifest.
+    if exc_info is not None:
         msg = u'Failed to get manifest from %s. Error: %s' % (
-            webapp.manifest_url, e)
+            webapp.manifest_url, exc_info[1])
         failed_fetches[id] = failed_fetches.get(id, 0) + 1
         if failed_fetches[id] == 3:
             # This is our 3rd attempt, let's send the developer(s) an email to
@@ -139,13 +239,17 @@ def _update_manifest(id, check_hash, failed_fetches):
         elif failed_fetches[id] >= 4:
             # This is our 4th attempt, we should already have notified the
             # developer(s). Let's put the app in the re-review queue.
-            _log(webapp, msg, rereview=True, exc_info=True)
+            _log(webapp, msg, rereview=True, exc_info=exc_info)
             if webapp.status in amo.WEBAPPS_APPROVED_STATUSES:
                 RereviewQueue.flag(webapp, amo.LOG.REREVIEW_MANIFEST_CHANGE,
                                    msg)
             del failed_fetches[id]
         else:
-            _log(webapp, msg, rereview=False, exc_info=True)
+            _log(webapp, msg, rereview=False, exc_info=exc_info)
+        return
+
+    if content is None:
+        _log(webapp, u'Manifest not modified')
         return
 
     # Check hash.
@@ -287,7 +391,11 @@ def update_supported_locales(ids, **kw):
     based on the current version.
     """
     for chunk in chunked(ids, 50):
-        for app in Webapp.objects.filter(id__in=chunk):
+        apps = list(Webapp.objects.filter(id__in=chunk))
+        # Load the manifests of the whole chunk at once.
+        get_manifests(app.current_version.all_files[0] for app in apps
+                      if app.current_version and app.current_version.all_files)
+        for app in apps:
             try:
                 if app.update_supported_locales():
                     _log(app, u'Updated supported locales')
@@ -338,14 +446,52 @@ def unindex_webapps(ids, **kw):
                     u'[Webapp:%s] Unindexing app but not found in index' % id_)
 
 
+def app_filepath(id):
+    return os.path.join(settings.DUMPED_APPS_PATH, 'apps', str(id / 1000),
+                        '{0}.json'.format(id))
+
+
+def _dump_timestamp(modified):
+    return int(time.mktime(modified.timetuple()))
+
+
+def _is_dumped(id, modified):
+    """
+    Whether the dump of app `id` on disk is up to date: dump_app() sets the
+    mtime of the file to the `modified` date of the app it dumped.
+    """
+    try:
+        return (int(os.path.getmtime(app_filepath(id))) ==
+                _dump_timestamp(modified))
+    except OSError:
+        return False
+
+
+def _dumped_app_ids():
+    ids = set()
+    app_dir = os.path.join(settings.DUMPED_APPS_PATH, 'apps')
+    for dirpath, dirnames, filenames in os.walk(app_dir):
+        for filename in filenames:
+            name, ext = os.path.splitext(filename)
+            if ext == '.json' and name.isdigit():
+                ids.add(int(name))
+    return ids
+
+
+def _dump_request():
+    req = RequestFactory().get('/')
+    req.user = AnonymousUser()
+    req.REGION = RESTOFWORLD
+    return req
+
+
 @task
 def dump_app(id, **kw):
     from mkt.webapps.serializers import AppSerializer
     # Because @robhudson told me to.
     # Note: not using storage because all these operations should be local.
-    target_dir = os.path.join(settings.DUMPED_APPS_PATH, 'apps',
-                              str(id / 1000))
-    target_file = os.path.join(target_dir, str(id) + '.json')
+    target_file = app_filepath(id)
+    target_dir = os.path.dirname(target_file)
 
     try:
         obj = Webapp.objects.get(pk=id)
@@ -353,16 +499,21 @@ def dump_app(id, **kw):
         task_log.info(u'Webapp does not exist: {0}'.format(id))
         return
 
-    req = RequestFactory().get('/')
-    req.user = AnonymousUser()
-    req.REGION = RESTOFWORLD
+    req = kw.get('request') or _dump_request()
 
     if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
+        try:
+            os.makedirs(target_dir)
+        except OSError:
+            pass  # Catch race condition if directory exists now.
 
     task_log.info('Dumping app {0} to {1}'.format(id, target_file))
     res = AppSerializer(obj, context={'request': req}).data
-    json.dump(res, open(target_file, 'w'), cls=JSONEncoder)
+    with open(target_file, 'w') as f:
+        json.dump(res, f, cls=JSONEncoder)
+    # Remember which version of the app this is, see _is_dumped().
+    timestamp = _dump_timestamp(obj.modified)
+    os.utime(target_file, (timestamp, timestamp))
     return target_file
 
 
@@ -377,8 +528,10 @@ def clean_apps(pks, **kw):
 def dump_apps(ids, **kw):
     task_log.info(u'Dumping apps {0} to {1}. [{2}]'
                   .format(ids[0], ids[-1], len(ids)))
+    # The request only sets up the serializer context, share it.
+    req = _dump_request()
     for id in ids:
-        dump_app(id)
+        dump_app(id, request=req)
 
 
 @task
@@ -393,11 +546,20 @@ def rm_directory(path):
         shutil.rmtree(path)
 
 
-def dump_all_apps_tasks():
-    all_pks = (Webapp.objects.visible()
-                             .values_list('pk', flat=True)
-                             .order_by('pk'))
-    return [dump_apps.si(pks) for pks in chunked(all_pks, 100)]
+def dump_changed_apps_tasks():
+    """
+    Remove the dumps of apps that are not visible anymore and return the
+    tasks dumping the apps that changed since they were last dumped, along
+    with the changed and removed ids.
+    """
+    apps = list(Webapp.objects.visible().values_list('pk', 'modified')
+                                        .order_by('pk'))
+    changed = [pk for pk, modified in apps if not _is_dumped(pk, modified)]
+    removed = sorted(_dumped_app_ids() - set(pk for pk, modified in apps))
+    for pk in removed:
+        os.remove(app_filepath(pk))
+    return ([dump_apps.si(pks) for pks in chunked(changed, 100)],
+            changed, removed)
 
 
 @task
@@ -407,12 +569,33 @@ def export_data(name=None):
     if name is None:
         name = today
     root = settings.DUMPED_APPS_PATH
-    directories = ['apps', 'collections']
-    for directory in directories:
-        rm_directory(os.path.join(root, directory))
-    files = directories + compile_extra_files(date=today)
-    chord(dump_all_apps_tasks() + dump_all_collections_tasks(),
-          compress_export.si(filename=name, files=files)).apply_async()
+    # Apps are dumped incrementally, collections are cheap enough to be
+    # dumped from scratch every time.
+    rm_directory(os.path.join(root, 'collections'))
+    app_tasks, changed, removed = dump_changed_apps_tasks()
+    task_log.info(u'Exporting {0} changed apps, {1} removed.'
+                  .format(len(changed), len(removed)))
+    files = (['apps', 'collections'] +
+             compile_extra_files(date=today) +
+             [write_export_changes(date=today, changed=changed,
+                                   removed=removed)])
+    tasks = app_tasks + dump_all_collections_tasks()
+    if tasks:
+        chord(tasks, compress_export.si(filename=name, files=files)
+              ).apply_async()
+    else:
+        compress_export.delay(filename=name, files=files)
+
+
+def write_export_changes(date, changed, removed):
+    """
+    Write the list of apps dumped and removed by this export, so consumers
+    can sync from the previous one.
+    """
+    filename = 'changes.json'
+    with open(os.path.join(settings.DUMPED_APPS_PATH, filename), 'w') as f:
+        json.dump({'date': date, 'changed': changed, 'removed': removed}, f)
+    return filename
 
 
 def compile_extra_files(date):
@@ -439,27 +622,42 @@ def compress_export(filename, files):
     if not os.path.exists(target_dir):
         os.makedirs(target_dir)
 
-    # Put some .txt files in place.
-    cmd = ['tar', 'czf', target_file, '-C',
-           settings.DUMPED_APPS_PATH] + files
     task_log.info(u'Creating dump {0}'.format(target_file))
-    subprocess.call(cmd)
+    with tarfile.open(target_file, 'w:gz') as tarball:
+        for f in files:
+            path = os.path.join(settings.DUMPED_APPS_PATH, f)
+            if os.path.exists(path):
+                tarball.add(path, arcname=f)
     return target_file
 
 
-@task(ignore_result=False)
-def dump_user_installs(ids, **kw):
-    task_log.info(u'Dumping user installs {0} to {1}. [{2}]'
-                  .format(ids[0], ids[-1], len(ids)))
+def _webapp_installs():
+    """
+    The (user, app id, app slug, install date) of all webapp installs,
+    ordered by user.
+    """
+    return (Installed.objects.filter(addon__type=amo.ADDON_WEBAPP)
+            .exclude(addon__status=amo.STATUS_DELETED)
+            .order_by('user', 'id')
+            .values_list('user', 'addon', 'addon__app_slug', 'created'))
 
-    for user_id in ids:
-        try:
-            user = UserProfile.objects.get(pk=user_id)
-        except UserProfile.DoesNotExist:
+
+def _dump_users(installs):
+    """
+    Write the dump of each user in `installs`, a list of (user id, install
+    rows) as grouped from _webapp_installs(). Makes a single query.
+    """
+    profiles = dict((pk, (region, lang)) for pk, region, lang in
+                    UserProfile.objects.filter(pk__in=[u for u, _ in installs])
+                    .values_list('pk', 'region', 'lang'))
+    zone = pytz.timezone(settings.TIME_ZONE)
+
+    for user_id, rows in installs:
+        if user_id not in profiles:
             task_log.info('User profile does not exist: {0}'.format(user_id))
             continue
 
-        hash = hashlib.sha256('%s%s' % (str(user.id),
+        hash = hashlib.sha256('%s%s' % (str(user_id),
                                         settings.SECRET_KEY)).hexdigest()
         target_dir = os.path.join(settings.DUMPED_USERS_PATH, 'users', hash[0])
         target_file = os.path.join(target_dir, '%s.json' % hash)
@@ -470,32 +668,83 @@ def dump_user_installs(ids, **kw):
             except OSError:
                 pass  # Catch race condition if file exists now.
 
-        # Gather data about user.
-        installed = []
-        zone = pytz.timezone(settings.TIME_ZONE)
-        for install in user.installed_set.filter(addon__type=amo.ADDON_WEBAPP):
-            try:
-                app = install.addon
-            except Addon.DoesNotExist:
-                continue
-
-            installed.append({
-                'id': app.id,
-                'slug': app.app_slug,
-                'installed': pytz.utc.normalize(
-                    zone.localize(install.created)).strftime(
-                        '%Y-%m-%dT%H:%M:%S')
-            })
-
+        region, lang = profiles[user_id]
         data = {
             'user': hash,
-            'region': user.region,
-            'lang': user.lang,
-            'installed_apps': installed,
+            'region': region,
+            'lang': lang,
+            'installed_apps': [{
+                'id': app_id,
+                'slug': app_slug,
+                'installed': pytz.utc.normalize(
+                    zone.localize(created)).strftime('%Y-%m-%dT%H:%M:%S')
+            } for _, app_id, app_slug, created in rows],
         }
 
-        task_log.info('Dumping user {0} to {1}'.format(user.id, target_file))
-        json.dump(data, open(target_file, 'w'), cls=JSONEncoder)
+        task_log.info('Dumping user {0} to {1}'.format(user_id, target_file))
+        with open(target_file, 'w') as f:
+            json.dump(data, f, cls=JSONEncoder)
+
+
+def _group_by_user(installs):
+    return ((user_id, list(rows))
+            for user_id, rows in itertools.groupby(installs,
+                                                   key=itemgetter(0)))
+
+
+@task(ignore_result=False)
+def dump_user_installs(ids, **kw):
+    task_log.info(u'Dumping user installs {0} to {1}. [{2}]'
+                  .format(ids[0], ids[-1], len(ids)))
+    _dump_users(list(_group_by_user(_webapp_installs().filter(user__in=ids))))
+
+
+def _next_dumped_users(last_user_id, size):
+    """The ids of the next `size` users with installs after `last_user_id`."""
+    return list(_webapp_installs().filter(user__gt=last_user_id)
+                .order_by('user').values_list('user', flat=True)
+                .distinct()[:size])
+
+
+# Dumping every user takes a while, so let's increase these limits.
+@task(time_limit=dump_user_installs_limits['hard'],
+      soft_time_limit=dump_user_installs_limits['soft'])
+def dump_all_user_installs(resume=False, **kw):
+    """
+    Dump the installs of all users, a batch of users at a time, ordered by
+    user id.
+
+    The id of the last user written is saved after each batch, pass `resume`
+    to continue an interrupted dump from there instead of starting over.
+    """
+    user_dir = os.path.join(settings.DUMPED_USERS_PATH, 'users')
+    checkpoint = os.path.join(settings.DUMPED_USERS_PATH, 'checkpoint')
+
+    last_user_id = 0
+    if resume and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            last_user_id = int(f.read() or 0)
+    else:
+        # Remove old dump data before running.
+        rm_directory(user_dir)
+    task_log.info(u'Dumping user installs after user {0}.'
+                  .format(last_user_id))
+
+    # Page through the users rather than iterating over one query: MySQLdb
+    # would fetch all the installs in memory anyway.
+    while True:
+        ids = _next_dumped_users(last_user_id,
+                                 settings.DUMPED_USERS_BATCH_SIZE)
+        if not ids:
+            break
+        dump_user_installs(ids)
+        last_user_id = ids[-1]
+        with open(checkpoint, 'w') as f:
+            f.write(str(last_user_id))
+
+    zip_users()
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
 
 
 @task
@@ -586,7 +835,8 @@ def import_manifests(ids, **kw):
                     file_path = file_.guarded_file_path
                 else:
                     file_path = file_.file_path
-                manifest = WebAppParser().get_json_data(file_path)
+                manifest = WebAppParser().get_json_data(file_path,
+                                                        file_.hash)
                 m, c = AppManifest.objects.get_or_create(
                     version=version, manifest=json.dumps(manifest))
                 if c:
@@ -11,13 +11,15 @@ from nose.tools import eq_
 
 import amo
 import amo.tests
-from addons.models import Addon
+from addons.models import Addon, AddonRecommendation
+from stats.models import ClientData
 
 import mkt
 from mkt.site.fixtures import fixture
-from mkt.webapps.cron import (clean_old_signed, update_app_trending,
-                              update_downloads)
-from mkt.webapps.models import Webapp
+from mkt.webapps.cron import (_app_co_installs, _app_install_counts,
+                              clean_old_signed, update_app_recommendations,
+                              update_app_trending, update_downloads)
+from mkt.webapps.models import Installed, Webapp
 from mkt.webapps.tasks import _get_trending
 
 
@@ -202,3 +204,70 @@ class TestUpdateTrending(amo.tests.TestCase):
         client.side_effect = ValueError
         _mock.return_value = client
         eq_(_get_trending(self.app.id), 0.0)
+
+
+class TestUpdateAppRecommendations(amo.tests.TestCase):
+
+    def setUp(self):
+        self.apps = [amo.tests.app_factory() for i in range(3)]
+        self.users = [amo.tests.user_factory() for i in range(6)]
+        # Apps 0 and 1 share 4 users, app 2 has its own.
+        for user in self.users[:4]:
+            self.install(self.apps[0], user)
+            self.install(self.apps[1], user)
+        for user in self.users[2:]:
+            self.install(self.apps[2], user)
+
+    def install(self, app, user):
+        Installed.objects.create(addon=app, user=user)
+
+    def test_install_counts(self):
+        eq_(_app_install_counts(), dict((app.id, 4) for app in self.apps))
+
+    def test_install_counts_distinct_users(self):
+        Installed.objects.create(addon=self.apps[0], user=self.users[0],
+                                 client_data=ClientData.objects.create())
+        eq_(_app_install_counts()[self.apps[0].id], 4)
+
+    def test_install_counts_min_installs(self):
+        Installed.objects.filter(addon=self.apps[2]).delete()
+        self.install(self.apps[2], self.users[0])
+        assert self.apps[2].id not in _app_install_counts()
+
+    def test_install_counts_public_only(self):
+        self.apps[2].update(status=amo.STATUS_PENDING)
+        assert self.apps[2].id not in _app_install_counts()
+
+    def test_co_installs(self):
+        apps = [app.id for app in self.apps]
+        common = _app_co_installs(apps[:2], _app_install_counts())
+        eq_(common, {apps[0]: {apps[0]: 4, apps[1]: 4, apps[2]: 2},
+                     apps[1]: {apps[0]: 4, apps[1]: 4, apps[2]: 2}})
+
+    def test_co_installs_counted_apps_only(self):
+        apps = [app.id for app in self.apps]
+        common = _app_co_installs(apps[:1], {apps[0]: 4})
+        eq_(common, {apps[0]: {apps[0]: 4}})
+
+    @mock.patch('mkt.webapps.cron.index_webapps')
+    def test_recommendations(self, index_webapps):
+        update_app_recommendations()
+        recs = (AddonRecommendation.objects.filter(addon=self.apps[0])
+                .values_list('other_addon', flat=True))
+        eq_(list(recs), [self.apps[1].id, self.apps[2].id])
+        index_webapps.delay.assert_called_with(
+            sorted(app.id for app in self.apps))
+
+    @mock.patch('mkt.webapps.cron.index_webapps')
+    def test_recommendations_replaced(self, index_webapps):
+        update_app_recommendations()
+        update_app_recommendations()
+        eq_(AddonRecommendation.objects.filter(addon=self.apps[0]).count(), 2)
+
+    @mock.patch('mkt.webapps.cron.index_webapps')
+    def test_recommendations_stale(self, index_webapps):
+        update_app_recommendations()
+        self.apps[2].update(status=amo.STATUS_PENDING)
+        update_app_recommendations()
+        eq_(AddonRecommendation.objects.filter(addon=self.apps[2]).count(), 0)
+        index_webapps.delay.assert_any_call([self.apps[2].id])
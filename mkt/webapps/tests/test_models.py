@@ -52,7 +52,8 @@ from mkt.site.tests import DynamicBoolFieldsTestMixin
 from mkt.submit.tests.test_views import BasePackagedAppTest, BaseWebAppTest
 from mkt.webapps.models import (AddonExcludedRegion, AppFeatures, AppManifest,
                                 ContentRating, Geodata, get_excluded_in,
-                                IARCInfo, Installed, RatingDescriptors,
+                                get_manifests, IARCInfo, Installed,
+                                parsed_manifests, RatingDescriptors,
                                 RatingInteractives, Webapp, WebappIndexer)
 
 
@@ -677,6 +678,30 @@ class TestWebapp(amo.tests.TestCase):
         empty_result = Webapp.version_and_file_transformer(empty_query)
         self.assertEqual(empty_result.count(), 0)
 
+    def test_api_transformer(self):
+        rated = app_factory()
+        rated.set_content_ratings({
+            mkt.ratingsbodies.CLASSIND: mkt.ratingsbodies.CLASSIND_18})
+        rated.set_descriptors(['has_classind_drugs'])
+        AddonExcludedRegion.objects.create(addon=rated,
+                                           region=mkt.regions.BR.id)
+        plain = app_factory()
+
+        rated, plain = (Webapp.objects.filter(pk__in=[rated.pk, plain.pk])
+                        .order_by('id').transform(Webapp.api_transformer))
+        with self.assertNumQueries(0):
+            eq_(rated.get_content_ratings_by_body().keys(), ['classind'])
+            eq_(rated.get_descriptors_slugs(), ['CLASSIND_DRUGS'])
+            ok_(mkt.regions.BR.id not in rated.get_region_ids())
+            eq_(rated.get_excluded_region_ids(), [mkt.regions.BR.id])
+            eq_(rated.upsell, None)
+            eq_(plain.get_content_ratings_by_body(), {})
+            eq_(plain.get_descriptors_slugs(), [])
+            eq_(plain.get_interactives_slugs(), [])
+            eq_([v.pk for v in plain.all_versions],
+                [plain.current_version.pk])
+            ok_(plain.geodata)
+
 
 class TestWebappContentRatings(amo.tests.TestCase):
 
@@ -726,6 +751,22 @@ class TestWebappContentRatings(amo.tests.TestCase):
                 rating=expected[1]).exists()
         eq_(app.reload().status, amo.STATUS_PENDING)
 
+    @mock.patch('mkt.webapps.models.Webapp.details_complete')
+    @mock.patch('mkt.webapps.models.Webapp.payments_complete')
+    def test_set_content_ratings_update_only(self, pay_mock, detail_mock):
+        self.create_switch('iarc')
+        detail_mock.return_value = True
+        pay_mock.return_value = True
+        rb = mkt.ratingsbodies
+
+        app = app_factory(status=amo.STATUS_NULL)
+        app.set_content_ratings({rb.PEGI: rb.PEGI_3})
+        app.update(status=amo.STATUS_NULL)
+
+        # Only existing ratings change, the status is still checked.
+        app.set_content_ratings({rb.PEGI: rb.PEGI_12})
+        eq_(app.reload().status, amo.STATUS_PENDING)
+
     def test_app_delete_clears_iarc_data(self):
         self.create_switch('iarc')
         app = app_factory(rated=True)
@@ -1364,6 +1405,59 @@ class TestPackagedManifest(BasePackagedAppTest):
         self.assertTrue(self.app.has_icon_in_manifest())
 
 
+class TestGetManifests(amo.tests.TestCase):
+
+    def setUp(self):
+        self.app = app_factory()
+        self.version = self.app.current_version
+        self.file = self.version.all_files[0]
+        AppManifest.objects.create(version=self.version,
+                                   manifest=json.dumps({'name': 'Swag'}))
+
+    def test_batch(self):
+        other = app_factory()
+        AppManifest.objects.create(version=other.current_version,
+                                   manifest=json.dumps({'name': 'Yolo'}))
+        other_file = other.current_version.all_files[0]
+        with self.assertNumQueries(1):
+            manifests = get_manifests([self.file, other_file])
+        eq_(manifests, {self.file.id: {'name': 'Swag'},
+                        other_file.id: {'name': 'Yolo'}})
+
+    def test_no_manifest(self):
+        self.version.manifest_json.delete()
+        eq_(get_manifests([self.file]), {self.file.id: {}})
+        eq_(self.app.get_manifest_json(self.file), {})
+
+    def test_cached(self):
+        get_manifests([self.file])
+        with self.assertNumQueries(0):
+            eq_(self.app.get_manifest_json(self.file), {'name': 'Swag'})
+
+        # Other processes find it in memcached.
+        parsed_manifests.clear()
+        with self.assertNumQueries(0):
+            eq_(self.app.get_manifest_json(self.file), {'name': 'Swag'})
+
+    def test_cached_copy(self):
+        self.app.get_manifest_json(self.file)['name'] = 'Changed'
+        eq_(self.app.get_manifest_json(self.file), {'name': 'Swag'})
+
+    def test_package_changed(self):
+        get_manifests([self.file])
+        # No signal is sent, but the package hash tells the cache is stale.
+        AppManifest.objects.filter(version=self.version).update(
+            manifest=json.dumps({'name': 'Updated'}))
+        self.file.hash = 'sha256:changed'
+        eq_(self.app.get_manifest_json(self.file), {'name': 'Updated'})
+
+    def test_manifest_saved(self):
+        get_manifests([self.file])
+        self.version.manifest_json.update(
+            manifest=json.dumps({'name': 'Updated'}))
+        eq_(self.app.get_manifest_json(self.file), {'name': 'Updated'})
+
+
 class TestDomainFromURL(unittest.TestCase):
 
     def test_simple(self):
@@ -1687,6 +1781,18 @@ class TestPackagedSigning(amo.tests.WebappTestCase):
         eq_(sign.call_args[0][0], self.app.current_version.pk)
         eq_(sign.call_args[1]['reviewer'], True)
 
+    @mock.patch('lib.crypto.packaged.presign')
+    def test_presign_not_packaged(self, presign):
+        self.app.update(is_packaged=False)
+        self.app.presign_if_packaged(self.app.current_version.pk)
+        assert not presign.delay.called
+
+    @mock.patch('lib.crypto.packaged.presign')
+    def test_presign_packaged(self, presign):
+        self.app.update(is_packaged=True)
+        self.app.presign_if_packaged(self.app.current_version.pk)
+        presign.delay.assert_called_with(self.app.current_version.pk)
+
 
 class TestUpdateStatus(amo.tests.TestCase):
 
@@ -1851,7 +1957,8 @@ class TestWebappIndexer(amo.tests.TestCase):
         mapping = WebappIndexer.get_mapping()
         keys = mapping['webapp']['properties'].keys()
         for k in ('id', 'app_slug', 'category', 'default_locale',
-                  'description', 'device', 'features', 'name', 'status'):
+                  'description', 'device', 'name', 'required_features',
+                  'status'):
             ok_(k in keys, 'Key %s not found in mapping properties' % k)
 
     def _get_doc(self):
@@ -1902,8 +2009,8 @@ class TestWebappIndexer(amo.tests.TestCase):
         self.app.current_version.features.update(
             **dict((k, True) for k in enabled))
         obj, doc = self._get_doc()
-        for k, v in doc['features'].iteritems():
-            eq_(v, k in enabled)
+        self.assertSetEqual(doc['required_features'],
+                            ['apps', 'sms', 'geolocation'])
 
     def test_extract_regions(self):
         self.app.addonexcludedregion.create(region=mkt.regions.BR.id)
@@ -9,6 +9,7 @@ from copy import deepcopy
 from tempfile import mkdtemp
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage as storage
 from django.core import mail
 from django.core.management import call_command
@@ -30,8 +31,8 @@ from versions.models import Version
 
 from mkt.site.fixtures import fixture
 from mkt.webapps.models import Webapp
-from mkt.webapps.tasks import (dump_app, dump_user_installs,
-                               export_data,
+from mkt.webapps.tasks import (dump_all_user_installs, dump_app,
+                               dump_user_installs, export_data,
                                notify_developers_of_failure,
                                pre_generate_apk,
                                PreGenAPKError,
@@ -316,6 +317,49 @@ class TestUpdateManifest(amo.tests.TestCase):
         assert not retry.called
         assert RereviewQueue.objects.filter(addon=self.addon).exists()
 
+    def validators_key(self):
+        return 'webapp:%s:manifest:validators' % self.addon.pk
+
+    def test_validators_stored(self):
+        self.response_mock.headers['ETag'] = '"swag"'
+        self._run()
+        eq_(cache.get(self.validators_key()), (nhash, {'ETag': '"swag"'}))
+
+    @mock.patch('mkt.webapps.tasks._update_manifest')
+    def test_not_modified(self, _update_manifest):
+        cache.set(self.validators_key(),
+                  (ohash, {'ETag': '"swag"', 'Last-Modified': 'yesterday'}))
+        self.response_mock.status_code = 304
+        self._run()
+        eq_(self.req_mock.call_args[1]['headers'],
+            {'If-None-Match': '"swag"', 'If-Modified-Since': 'yesterday'})
+        assert not _update_manifest.called
+
+    def test_not_modified_stale_validators(self):
+        # The validators aren't those of the current file, don't use them.
+        cache.set(self.validators_key(), (nhash, {'ETag': '"swag"'}))
+        self._run()
+        eq_(self.req_mock.call_args[1]['headers'], None)
+
+    def test_not_modified_without_check_hash(self):
+        cache.set(self.validators_key(), (ohash, {'ETag': '"swag"'}))
+        self._run(check_hash=False)
+        eq_(self.req_mock.call_args[1]['headers'], None)
+
+    @mock.patch('mkt.webapps.tasks._update_manifest')
+    def test_fetch_many(self, _update_manifest):
+        other = Addon.objects.create(
+            type=amo.ADDON_WEBAPP, status=amo.STATUS_PUBLIC,
+            manifest_url='http://elsewhere.allizom.org/manifest.webapp')
+        version = Version.objects.create(addon=other)
+        File.objects.create(version=version, hash=ohash,
+                            status=amo.STATUS_PUBLIC)
+        update_manifests(ids=(self.addon.pk, other.pk))
+        eq_(sorted(c[0][0] for c in self.req_mock.call_args_list),
+            [other.manifest_url, self.addon.manifest_url])
+        eq_(sorted(c[0][0] for c in _update_manifest.call_args_list),
+            sorted([self.addon.pk, other.pk]))
+
     @mock.patch('mkt.webapps.models.Webapp.set_iarc_storefront_data')
     def test_manifest_validation_failure(self, _iarc):
         # We are already mocking validator, but this test needs to make sure
@@ -562,6 +606,8 @@ class TestDumpUserInstalls(amo.tests.TestCase):
                                              settings.SECRET_KEY)).hexdigest()
         self.path = os.path.join(settings.DUMPED_USERS_PATH, 'users',
                                  self.hash[0], '%s.json' % self.hash)
+        self.checkpoint = os.path.join(settings.DUMPED_USERS_PATH,
+                                       'checkpoint')
 
     def dump_and_load(self):
         dump_user_installs([self.user.pk])
@@ -591,6 +637,44 @@ class TestDumpUserInstalls(amo.tests.TestCase):
         installed = data['installed_apps'][0]
         eq_(installed['id'], self.app.id)
 
+    def test_dump_queries(self):
+        other = amo.tests.user_factory()
+        self.app.installed.create(user=other)
+        with self.assertNumQueries(2):
+            dump_user_installs([self.user.pk, other.pk])
+
+    @mock.patch('mkt.webapps.tasks.zip_users')
+    def test_dump_all(self, zip_users):
+        dump_all_user_installs()
+        eq_(json.load(open(self.path, 'r'))['user'], self.hash)
+        assert zip_users.called
+        ok_(not os.path.exists(self.checkpoint))
+
+    @mock.patch.object(settings, 'DUMPED_USERS_BATCH_SIZE', 1)
+    @mock.patch('mkt.webapps.tasks.zip_users')
+    def test_dump_all_batches(self, zip_users):
+        other = amo.tests.user_factory()
+        self.app.installed.create(user=other)
+        amo.tests.app_factory().installed.create(user=other)
+        # For each user: its id, its installs and its profile. Then one more
+        # query finds no more users.
+        with self.assertNumQueries(7):
+            dump_all_user_installs()
+        ok_(os.path.exists(self.path))
+
+    @mock.patch('mkt.webapps.tasks.zip_users')
+    def test_resume(self, zip_users):
+        rm_directory(os.path.join(settings.DUMPED_USERS_PATH, 'users'))
+        if not os.path.exists(settings.DUMPED_USERS_PATH):
+            os.makedirs(settings.DUMPED_USERS_PATH)
+        with open(self.checkpoint, 'w') as f:
+            f.write(str(self.user.pk))
+        dump_all_user_installs(resume=True)
+        ok_(not os.path.exists(self.path))
+
+        dump_all_user_installs(resume=True)
+        ok_(os.path.exists(self.path))
+
 
 class TestFixMissingIcons(amo.tests.TestCase):
     fixtures = fixture('webapp_337141')
@@ -720,3 +804,34 @@ class TestExportData(amo.tests.TestCase):
         collection_file = tarball.extractfile(self.collection_path)
         collection_data = json.loads(collection_file.read())
         eq_(collection_data['apps'][0]['filepath'], self.app_path)
+
+    def get_changes(self, tarball):
+        return json.loads(tarball.extractfile('changes.json').read())
+
+    def test_changes(self):
+        changes = self.get_changes(self.create_export('tarball-name'))
+        eq_(changes['changed'], [337141])
+        eq_(changes['removed'], [])
+
+    @mock.patch('mkt.webapps.tasks.dump_app')
+    def test_unchanged_apps_not_dumped(self, dump_app_mock):
+        with self.settings(DUMPED_APPS_PATH=self.export_directory):
+            dump_app(337141)
+        tarball = self.create_export('tarball-name')
+        assert not dump_app_mock.called
+        eq_(self.get_changes(tarball)['changed'], [])
+        assert self.app_path in tarball.getnames()
+
+    def test_modified_apps_dumped(self):
+        self.create_export('first')
+        Webapp.objects.filter(pk=337141).update(
+            modified=datetime.datetime.now() + datetime.timedelta(days=1))
+        eq_(self.get_changes(self.create_export('second'))['changed'],
+            [337141])
+
+    def test_removed_apps(self):
+        self.create_export('first')
+        Webapp.objects.get(pk=337141).update(status=amo.STATUS_DISABLED)
+        tarball = self.create_export('second')
+        eq_(self.get_changes(tarball)['removed'], [337141])
+        assert self.app_path not in tarball.getnames()
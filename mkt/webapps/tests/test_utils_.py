@@ -18,12 +18,15 @@ import mkt
 from mkt.constants import ratingsbodies, regions
 from mkt.developers.models import (AddonPaymentAccount, PaymentAccount,
                                    SolitudeSeller)
-from mkt.search.serializers import ESAppSerializer
+from mkt.api.renderers import SuccinctJSONRenderer
+from mkt.search.serializers import (ESAppSerializer, FastESAppSerializer,
+                                    SimpleESAppSerializer,
+                                    SimpleFastESAppSerializer)
 from mkt.site.fixtures import fixture
-from mkt.webapps.models import Installed, Webapp, WebappIndexer
+from mkt.webapps.models import IARCInfo, Installed, Webapp, WebappIndexer
 from mkt.webapps.serializers import AppSerializer
 from mkt.webapps.utils import (dehydrate_content_rating,
-                               get_supported_locales)
+                               get_supported_locales, iarc_get_app_info_many)
 from users.models import UserProfile
 from versions.models import Version
 
@@ -645,6 +648,48 @@ class TestESAppToDict(amo.tests.ESTestCase):
         eq_(res['author'], '')
 
 
+@mock.patch('versions.models.Version.is_privileged', False)
+class TestFastESAppSerializer(TestESAppToDict):
+    """Run all the ESAppSerializer tests against FastESAppSerializer too."""
+
+    def serialize(self):
+        serializer = FastESAppSerializer(instance=self.get_obj(),
+                                         context={'request': self.request})
+        return serializer.data
+
+    def render(self, serializer_class):
+        serializer = serializer_class(instance=[self.get_obj()], many=True,
+                                      context={'request': self.request})
+        return SuccinctJSONRenderer().render(serializer.data)
+
+    def check_same_output(self):
+        eq_(self.render(FastESAppSerializer), self.render(ESAppSerializer))
+        eq_(self.render(SimpleFastESAppSerializer),
+            self.render(SimpleESAppSerializer))
+
+    def test_same_output(self):
+        self.check_same_output()
+
+    def test_same_output_anonymous(self):
+        self.request.amo_user = None
+        self.check_same_output()
+
+    def test_same_output_with_lang(self):
+        self.request = RequestFactory().get('/?lang=fr')
+        self.request.REGION = mkt.regions.BR
+        self.request.amo_user = self.profile
+        self.check_same_output()
+
+    def test_same_output_premium(self):
+        self.make_premium(self.app)
+        upsell = amo.tests.app_factory()
+        self.make_premium(upsell)
+        self.app._upsell_from.create(premium=upsell)
+        self.app.update(public_stats=True)
+        self.refresh('webapp')
+        self.check_same_output()
+
+
 class TestSupportedLocales(amo.tests.TestCase):
 
     def setUp(self):
@@ -672,3 +717,28 @@ class TestSupportedLocales(amo.tests.TestCase):
     def test_unsupported_locale(self):
         self.manifest.update({'locales': {'xx': {'name': 'xx'}}})
         self.check([])
+
+
+class TestIARCGetAppInfoMany(amo.tests.TestCase):
+
+    def setUp(self):
+        self.apps = [amo.tests.app_factory() for i in range(3)]
+        for i, app in enumerate(self.apps):
+            IARCInfo.objects.create(addon=app, submission_id=i,
+                                    security_code='CODE%s' % i)
+
+    def test_order_and_data(self):
+        res = iarc_get_app_info_many(self.apps, concurrency=2)
+        eq_([app for app, data in res], self.apps)
+        for app, data in res:
+            eq_(data['rows'][0]['submission_id'], 52)
+
+    @mock.patch('lib.iarc.client.MockClient.call')
+    def test_failure_isolated(self, call):
+        call.side_effect = Exception('boom')
+        res = iarc_get_app_info_many(self.apps)
+        eq_([data for app, data in res], [None, None, None])
+
+    def test_no_iarc_info(self):
+        app = amo.tests.app_factory()
+        eq_(iarc_get_app_info_many([app]), [])
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
 
 import commonware.log
 
@@ -95,19 +98,61 @@ def dehydrate_interactives(keys):
     return results
 
 
+def _iarc_app_info_xml(app):
+    iarc = app.iarc_info
+    return lib.iarc.utils.render_xml(
+        'get_app_info.xml',
+        {'submission_id': iarc.submission_id,
+         'security_code': iarc.security_code})
+
+
 def iarc_get_app_info(app):
     client = lib.iarc.client.get_iarc_client('services')
-    iarc = app.iarc_info
-    iarc_id = iarc.submission_id
-    iarc_code = iarc.security_code
 
     # Generate XML.
-    xml = lib.iarc.utils.render_xml(
-        'get_app_info.xml',
-        {'submission_id': iarc_id, 'security_code': iarc_code})
+    xml = _iarc_app_info_xml(app)
 
     # Process that shizzle.
     resp = client.Get_App_Info(XMLString=xml)
 
     # Handle response.
     return lib.iarc.utils.IARC_XML_Parser().parse_string(resp)
+
+
+def iarc_get_app_info_many(apps, concurrency=None):
+    """
+    Fetch IARC app info for many apps at once, using a bounded pool of
+    threads for the SOAP calls.
+
+    Returns a list of `(app, data)` tuples in the same order as `apps`. Apps
+    whose call failed get `None` as data so callers can skip them.
+    """
+    concurrency = concurrency or settings.IARC_CONCURRENCY
+    # Do all the DB work (iarc_info lookups, templates) in this thread, only
+    # the network calls happen in the pool.
+    jobs = []
+    for app in apps:
+        try:
+            jobs.append((app, _iarc_app_info_xml(app)))
+        except Exception, e:
+            log.error('IARC info XML failed for app:%s: %s' % (app.pk, e))
+
+    def fetch(job):
+        app, xml = job
+        try:
+            client = lib.iarc.client.get_iarc_client('services')
+            resp = client.Get_App_Info(XMLString=xml)
+            return app, lib.iarc.utils.IARC_XML_Parser().parse_string(resp)
+        except Exception, e:
+            log.error('IARC Get_App_Info failed for app:%s: %s' % (app.pk, e))
+            return app, None
+
+    if not jobs:
+        return []
+
+    pool = ThreadPool(min(concurrency, len(jobs)))
+    try:
+        return pool.map(fetch, jobs)
+    finally:
+        pool.close()
+        pool.join()
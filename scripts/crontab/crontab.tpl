@@ -35,6 +35,7 @@ HOME=/tmp
 45 9 * * * %(z_cron)s clean_old_signed --settings=settings_local_mkt
 45 10 * * * %(django)s process_addons --task=update_manifests --settings=settings_local_mkt
 45 11 * * * %(django)s export_data --settings=settings_local_mkt
+15 12 * * * %(z_cron)s update_app_recommendations --settings=settings_local_mkt
 # 30 12 * * * %(z_cron)s cleanup_synced_collections
 # 30 13 * * * %(z_cron)s expired_resetcode
 # 30 14 * * * %(z_cron)s category_totals
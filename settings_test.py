@@ -55,6 +55,9 @@ SEND_REAL_EMAIL = True
 # Turn off search engine indexing.
 USE_ELASTIC = False
 
+# Reserve translation ids in the test transaction, so they're rolled back.
+TRANSLATION_ID_BLOCK_SIZE = 1
+
 # Ensure all validation code runs in tests:
 VALIDATE_ADDONS = True
 